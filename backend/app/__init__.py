@@ -0,0 +1,4 @@
+import time
+
+# Read by app.core.startup to report how long importing the app took.
+IMPORT_STARTED = time.perf_counter()
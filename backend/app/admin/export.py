@@ -0,0 +1,108 @@
+"""
+Streaming NDJSON/CSV exports of users and task sessions.
+
+Rows are read through a server-side cursor (``yield_per``) in batches of
+``settings.export_batch_size`` and each batch is serialized and sent before
+the next one is fetched, so memory use is flat however large the table is.
+Every export opens its own session, which lives exactly as long as the
+response stream.
+"""
+
+from __future__ import annotations
+
+from collections.abc import AsyncIterator, Callable
+import csv
+from datetime import datetime
+import io
+import json
+from typing import Any
+
+from sqlalchemy import Select, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import TaskSession, User, UserContribution
+
+MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def users_export_query() -> Select:
+    return (
+        select(
+            User.id,
+            User.email,
+            User.default_wallet_address,
+            User.created_at,
+            User.updated_at,
+            UserContribution.total_contribution,
+            UserContribution.sessions_count,
+        )
+        .outerjoin(UserContribution, UserContribution.user_id == User.id)
+        .order_by(User.id)
+    )
+
+
+def sessions_export_query(since: datetime | None = None, until: datetime | None = None) -> Select:
+    stmt = select(
+        TaskSession.id,
+        TaskSession.user_id,
+        TaskSession.task_id,
+        TaskSession.started_at,
+        TaskSession.completed_at,
+        TaskSession.outcome,
+        TaskSession.contribution,
+    )
+    if since is not None:
+        stmt = stmt.where(TaskSession.started_at >= since)
+    if until is not None:
+        stmt = stmt.where(TaskSession.started_at < until)
+    return stmt.order_by(TaskSession.started_at, TaskSession.id)
+
+
+def _json_default(value: Any) -> str:
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return str(value)
+
+
+def _ndjson(columns: list[str], rows: list[tuple]) -> str:
+    return "".join(
+        json.dumps(dict(zip(columns, row)), default=_json_default, ensure_ascii=False) + "\n"
+        for row in rows
+    )
+
+
+def _csv_writer() -> tuple[io.StringIO, Any]:
+    buffer = io.StringIO()
+    return buffer, csv.writer(buffer, lineterminator="\n")
+
+
+async def stream_export(
+    stmt: Select,
+    fmt: str,
+    session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+) -> AsyncIterator[bytes]:
+    """Yield the export of ``stmt`` in ``fmt`` one fetched batch at a time."""
+    async with session_factory() as db:
+        result = await db.stream(
+            stmt.execution_options(yield_per=settings.export_batch_size)
+        )
+        columns = list(result.keys())
+        if fmt == "csv":
+            buffer, writer = _csv_writer()
+            writer.writerow(columns)
+            yield buffer.getvalue().encode()
+        async for partition in result.partitions():
+            if fmt == "csv":
+                buffer, writer = _csv_writer()
+                writer.writerows(
+                    [value.isoformat() if isinstance(value, datetime) else value for value in row]
+                    for row in partition
+                )
+                yield buffer.getvalue().encode()
+            else:
+                yield _ndjson(columns, partition).encode()
@@ -1,11 +1,22 @@
+from collections.abc import AsyncIterator
+from datetime import datetime
 import logging
+from typing import Literal
 
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.database import get_db
+from app.admin.export import MEDIA_TYPES, sessions_export_query, stream_export, users_export_query
+from app.admin.stats import admin_stats
+from app.auth.dependencies import require_admin
+from app.core.database import get_async_db
+from app.core.responses import FastJSONResponse, trusted_dump
 from app.models import Task, User
-from app.schemas.admin import AdminDatabaseOverviewResponse, UserSummary
+from app.schemas.admin import AdminDatabaseOverviewResponse, AdminStatsResponse, UserSummary
+from app.schemas.task import TaskRead
+from app.tasks.cache import task_catalog
 
 router = APIRouter(prefix="/admin", tags=["admin"])
 logger = logging.getLogger(__name__)
@@ -16,19 +27,24 @@ logger = logging.getLogger(__name__)
     response_model=AdminDatabaseOverviewResponse,
     summary="Fetch first 20 users and tasks for admin dashboard",
 )
-def get_database_overview(db: Session = Depends(get_db)) -> AdminDatabaseOverviewResponse:
+async def get_database_overview(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> Response:
     users = (
-        db.query(User)
-        .order_by(User.created_at.desc())
-        .limit(20)
-        .all()
-    )
+        await db.scalars(
+            select(User)
+            .order_by(User.created_at.desc())
+            .limit(20)
+        )
+    ).all()
     tasks = (
-        db.query(Task)
-        .order_by(Task.id.asc())
-        .limit(20)
-        .all()
-    )
+        await db.scalars(
+            select(Task)
+            .order_by(Task.id.asc())
+            .limit(20)
+        )
+    ).all()
 
     logger.info(
         "Admin database overview requested users=%s tasks=%s",
@@ -36,8 +52,68 @@ def get_database_overview(db: Session = Depends(get_db)) -> AdminDatabaseOvervie
         len(tasks),
     )
 
-    return AdminDatabaseOverviewResponse(
-        users=users,
-        tasks=tasks,
+    # Rows straight from our tables; serialize without re-validating them.
+    return FastJSONResponse(
+        {
+            "users": [trusted_dump(UserSummary, user) for user in users],
+            "tasks": [trusted_dump(TaskRead, task) for task in tasks],
+        },
+        accept_encoding=request.headers.get("accept-encoding"),
+    )
+
+
+@router.get(
+    "/stats",
+    response_model=AdminStatsResponse,
+    summary="Aggregate counts, DAU and per-task success rates",
+    dependencies=[Depends(require_admin)],
+)
+async def get_admin_stats() -> AdminStatsResponse:
+    """Served from a snapshot refreshed in the background; see ``computed_at``."""
+    return await admin_stats.get()
+
+
+@router.get(
+    "/export/users",
+    summary="Stream all users as NDJSON or CSV",
+    dependencies=[Depends(require_admin)],
+)
+def export_users(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+) -> StreamingResponse:
+    return _export_response("users", format, stream_export(users_export_query(), format))
+
+
+@router.get(
+    "/export/sessions",
+    summary="Stream task sessions as NDJSON or CSV",
+    dependencies=[Depends(require_admin)],
+)
+def export_sessions(
+    format: Literal["ndjson", "csv"] = Query("ndjson"),
+    since: datetime | None = Query(None, description="Only sessions started at or after this time."),
+    until: datetime | None = Query(None, description="Only sessions started before this time."),
+) -> StreamingResponse:
+    return _export_response(
+        "sessions", format, stream_export(sessions_export_query(since, until), format)
+    )
+
+
+def _export_response(name: str, fmt: str, body: AsyncIterator[bytes]) -> StreamingResponse:
+    logger.info("Admin export started name=%s format=%s", name, fmt)
+    return StreamingResponse(
+        body,
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="{name}.{fmt}"'},
     )
 
+
+@router.post(
+    "/task-catalog/invalidate",
+    summary="Reload the cached task catalog on next read (this worker)",
+    dependencies=[Depends(require_admin)],
+)
+def invalidate_task_catalog() -> dict[str, int]:
+    version = task_catalog.invalidate()
+    logger.info("Task catalog invalidated version=%s", version)
+    return {"version": version}
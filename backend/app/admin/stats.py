@@ -0,0 +1,158 @@
+"""
+Aggregate statistics for the admin dashboard.
+
+Everything is aggregated in SQL (counts, DAU, per-task session and success
+figures), so the cost does not grow with what the API process has to hold.
+Results are kept as a snapshot that a background task refreshes every
+``refresh_seconds``; requests read the snapshot and never wait on the
+aggregation queries unless no snapshot has been built yet.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from datetime import date, datetime, timedelta, timezone
+import logging
+
+from sqlalchemy import distinct, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.models import ContributionEntry, Task, TaskSession, User
+from app.models.task_session import OUTCOME_FAILURE, OUTCOME_SUCCESS
+from app.schemas.admin import AdminStatsResponse, DailyActiveUsers, TaskStats
+
+logger = logging.getLogger(__name__)
+
+DAU_HISTORY_DAYS = 30
+
+
+def _success_rate(successes: int, failures: int) -> float | None:
+    finished = successes + failures
+    return successes / finished if finished else None
+
+
+async def compute_admin_stats(db: AsyncSession) -> AdminStatsResponse:
+    now = datetime.now(timezone.utc)
+    successes = func.count().filter(TaskSession.outcome == OUTCOME_SUCCESS)
+    failures = func.count().filter(TaskSession.outcome == OUTCOME_FAILURE)
+
+    users = await db.scalar(select(func.count()).select_from(User))
+    tasks = await db.scalar(select(func.count()).select_from(Task))
+    totals = (
+        await db.execute(
+            select(
+                func.count().label("sessions"),
+                successes.label("successes"),
+                failures.label("failures"),
+            ).select_from(TaskSession)
+        )
+    ).one()
+    contribution = await db.scalar(select(func.coalesce(func.sum(ContributionEntry.amount), 0)))
+    dau = await db.scalar(
+        select(func.count(distinct(TaskSession.user_id))).where(
+            TaskSession.started_at >= now - timedelta(days=1)
+        )
+    )
+
+    day = func.date(TaskSession.started_at)
+    daily = await db.execute(
+        select(day.label("day"), func.count(distinct(TaskSession.user_id)).label("users"))
+        .where(TaskSession.started_at >= now - timedelta(days=DAU_HISTORY_DAYS))
+        .group_by(day)
+        .order_by(day)
+    )
+    per_task = await db.execute(
+        select(
+            TaskSession.task_id,
+            func.count().label("sessions"),
+            successes.label("successes"),
+            failures.label("failures"),
+            func.avg(TaskSession.contribution).label("average_contribution"),
+        )
+        .group_by(TaskSession.task_id)
+        .order_by(TaskSession.task_id)
+    )
+
+    return AdminStatsResponse(
+        computed_at=now,
+        users=users or 0,
+        tasks=tasks or 0,
+        sessions=totals.sessions,
+        completed_sessions=totals.successes + totals.failures,
+        success_rate=_success_rate(totals.successes, totals.failures),
+        total_contribution=int(contribution or 0),
+        daily_active_users=dau or 0,
+        daily_active_history=[
+            DailyActiveUsers(day=_as_date(row.day), users=row.users) for row in daily
+        ],
+        per_task=[
+            TaskStats(
+                task_id=row.task_id,
+                sessions=row.sessions,
+                successes=row.successes,
+                success_rate=_success_rate(row.successes, row.failures),
+                average_contribution=(
+                    float(row.average_contribution) if row.average_contribution is not None else None
+                ),
+            )
+            for row in per_task
+        ],
+    )
+
+
+def _as_date(value: date | str) -> date:
+    # SQLite's date() returns text; Postgres returns a date.
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+class AdminStatsCache:
+    def __init__(
+        self,
+        refresh_seconds: float,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+    ) -> None:
+        self.refresh_seconds = refresh_seconds
+        self._session_factory = session_factory
+        self._snapshot: AdminStatsResponse | None = None
+        self._refresh_lock = asyncio.Lock()
+        self._task: asyncio.Task | None = None
+
+    async def get(self) -> AdminStatsResponse:
+        snapshot = self._snapshot
+        if snapshot is None:
+            snapshot = await self.refresh()
+        return snapshot
+
+    async def refresh(self) -> AdminStatsResponse:
+        async with self._refresh_lock:
+            async with self._session_factory() as db:
+                self._snapshot = await compute_admin_stats(db)
+            return self._snapshot
+
+    def start(self) -> None:
+        if self._task is None:
+            self._task = asyncio.create_task(self._run(), name="admin-stats-refresh")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.refresh()
+            except Exception:
+                # Keep serving the last snapshot; try again next interval.
+                logger.exception("Admin stats refresh failed")
+            await asyncio.sleep(self.refresh_seconds)
+
+
+admin_stats = AdminStatsCache(refresh_seconds=settings.admin_stats_refresh_seconds)
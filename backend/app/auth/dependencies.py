@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import uuid
+
+from fastapi import Depends, HTTPException, Request, status
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from app.auth.session_cache import CachedSession, session_auth_cache
+from app.core.config import settings
+from app.core.database import get_async_db
+from app.models import Session as SessionRecord
+from app.models import User
+
+SESSION_COOKIE = "axis_session"
+
+
+def _unauthorized(detail: str) -> HTTPException:
+    return HTTPException(status_code=status.HTTP_401_UNAUTHORIZED, detail=detail)
+
+
+async def get_current_user(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> User:
+    """
+    Resolve the ``axis_session`` cookie to its ``User``.
+
+    An in-process hit stays on the event loop; Redis calls run in the
+    threadpool. Cache hits return a detached ``User`` and never check out a
+    DB connection (the session only connects on first query).
+    """
+    raw_session_id = request.cookies.get(SESSION_COOKIE)
+    if not raw_session_id:
+        raise _unauthorized("Not authenticated")
+    try:
+        session_id = uuid.UUID(raw_session_id)
+    except ValueError as exc:
+        raise _unauthorized("Invalid session") from exc
+
+    cached = session_auth_cache.get_local(str(session_id))
+    if cached is None:
+        cached = await run_in_threadpool(session_auth_cache.get_shared, str(session_id))
+    if cached is not None:
+        return cached.to_user()
+
+    row = (
+        await db.execute(
+            select(SessionRecord, User)
+            .join(User, SessionRecord.user_id == User.id)
+            .where(SessionRecord.id == session_id)
+        )
+    ).first()
+    if row is None:
+        raise _unauthorized("Invalid session")
+    record, user = row
+    if record.revoked_at is not None:
+        raise _unauthorized("Session revoked")
+    expires_at = record.expires_at
+    if expires_at is not None:
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        if expires_at <= datetime.now(timezone.utc):
+            raise _unauthorized("Session expired")
+
+    await run_in_threadpool(session_auth_cache.put, CachedSession.from_rows(record, user))
+    return user
+
+
+async def require_admin(current_user: User = Depends(get_current_user)) -> User:
+    """The current user, if listed in ``ADMIN_USER_IDS``; 403 otherwise."""
+    if current_user.id not in settings.admin_user_ids:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN, detail="Admin access required")
+    return current_user
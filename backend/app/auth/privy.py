@@ -0,0 +1,289 @@
+"""
+Local verification of Privy access tokens.
+
+Privy access tokens are ES256 JWTs signed with the app's verification key.
+Instead of a remote call per login, tokens are checked locally against a
+cached key (refreshed in the background), and the normalized claims of
+recently verified tokens are kept in a bounded LRU/TTL cache keyed by the
+token hash, so repeated exchanges of the same token cost a dict lookup.
+
+The Privy SDK and the JWT stack are imported on first use; together they
+account for a large share of the API's import time.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import Callable
+import hashlib
+import logging
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Optional
+
+from fastapi import HTTPException, status
+
+from app.core.config import settings
+
+if TYPE_CHECKING:
+    from privy import PrivyAPI
+
+PRIVY_ISSUER = "privy.io"
+PRIVY_ALGORITHMS = ["ES256"]
+
+logger = logging.getLogger(__name__)
+
+
+class InvalidPrivyToken(Exception):
+    """Raised when a Privy access token fails signature or claim checks."""
+
+
+@lru_cache
+def get_privy_client() -> PrivyAPI:
+    if not settings.privy_app_id or not settings.privy_client_secret:
+        raise RuntimeError("Privy credentials are not configured on the backend.")
+    from privy import PrivyAPI
+
+    return PrivyAPI(
+        app_id=settings.privy_app_id,
+        app_secret=settings.privy_client_secret,
+    )
+
+
+class VerificationKeyProvider:
+    def get_key(self) -> str:
+        raise NotImplementedError
+
+    def refresh(self) -> None:
+        """Reload the key after a signature failure (e.g. key rotation)."""
+
+
+class StaticKeyProvider(VerificationKeyProvider):
+    """Serve a fixed PEM key: configured out of band, or a test stub."""
+
+    def __init__(self, key: str) -> None:
+        self._key = key
+
+    def get_key(self) -> str:
+        return self._key
+
+
+class PrivyAppKeyProvider(VerificationKeyProvider):
+    """
+    Fetch the app's verification key from the Privy API and keep it cached.
+
+    The first call blocks on the fetch; after ``refresh_seconds`` the cached
+    key keeps being served while a background thread reloads it.
+    """
+
+    MIN_FORCED_REFRESH_INTERVAL = 30.0
+
+    def __init__(
+        self,
+        fetch: Callable[[], str],
+        refresh_seconds: float,
+    ) -> None:
+        self._fetch = fetch
+        self.refresh_seconds = refresh_seconds
+        self._key: str | None = None
+        self._fetched_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+
+    def get_key(self) -> str:
+        key = self._key
+        if key is None:
+            with self._lock:
+                if self._key is None:
+                    self._load()
+                return self._key  # type: ignore[return-value]
+        if time.monotonic() - self._fetched_at > self.refresh_seconds:
+            self._refresh_in_background()
+        return key
+
+    def refresh(self) -> None:
+        if time.monotonic() - self._fetched_at > self.MIN_FORCED_REFRESH_INTERVAL:
+            self._refresh_in_background()
+
+    def _load(self) -> None:
+        self._key = self._fetch()
+        self._fetched_at = time.monotonic()
+
+    def _refresh_in_background(self) -> None:
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+
+        def run() -> None:
+            try:
+                self._load()
+                logger.info("Privy verification key refreshed")
+            except Exception:
+                logger.exception("Privy verification key refresh failed; keeping cached key")
+            finally:
+                self._refreshing = False
+
+        threading.Thread(target=run, name="privy-key-refresh", daemon=True).start()
+
+
+class ClaimsCache:
+    """Bounded LRU of normalized claims with a per-entry expiry."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float) -> None:
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[bytes, tuple[float, dict[str, str]]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key_for(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, key: bytes) -> dict[str, str] | None:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, claims = entry
+            if expires_at <= time.time():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return claims
+
+    def put(self, key: bytes, claims: dict[str, str], token_expires_at: float | None) -> None:
+        expires_at = time.time() + self.ttl_seconds
+        if token_expires_at is not None:
+            expires_at = min(expires_at, token_expires_at)
+        with self._lock:
+            self._entries[key] = (expires_at, claims)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+class PrivyTokenVerifier:
+    def __init__(
+        self,
+        app_id: str,
+        key_provider: VerificationKeyProvider,
+        cache: ClaimsCache,
+    ) -> None:
+        self.app_id = app_id
+        self.key_provider = key_provider
+        self.cache = cache
+
+    def verify(self, token: str) -> dict[str, str]:
+        """Return normalized claims (see ``normalize_privy_claims``) for a valid token."""
+        cache_key = ClaimsCache.key_for(token)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        from jose import ExpiredSignatureError, JWTError, jwt
+        from jose.exceptions import JWTClaimsError
+
+        try:
+            raw_claims = jwt.decode(
+                token,
+                self.key_provider.get_key(),
+                algorithms=PRIVY_ALGORITHMS,
+                audience=self.app_id,
+                issuer=PRIVY_ISSUER,
+            )
+        except JWTError as exc:
+            if not isinstance(exc, (JWTClaimsError, ExpiredSignatureError)):
+                # A bad signature may mean the key was rotated.
+                self.key_provider.refresh()
+            raise InvalidPrivyToken(str(exc)) from exc
+
+        claims = normalize_privy_claims(
+            {
+                "user_id": raw_claims.get("sub"),
+                "session_id": raw_claims.get("sid"),
+                "app_id": raw_claims.get("aud"),
+            }
+        )
+        expires_at = raw_claims.get("exp")
+        self.cache.put(cache_key, claims, float(expires_at) if expires_at is not None else None)
+        return claims
+
+
+def _fetch_app_verification_key() -> str:
+    return get_privy_client().apps.get(settings.privy_app_id).verification_key
+
+
+@lru_cache
+def get_privy_verifier() -> PrivyTokenVerifier:
+    if not settings.privy_app_id:
+        raise RuntimeError("Privy credentials are not configured on the backend.")
+    if settings.privy_verification_key:
+        key_provider: VerificationKeyProvider = StaticKeyProvider(settings.privy_verification_key)
+    else:
+        key_provider = PrivyAppKeyProvider(
+            fetch=_fetch_app_verification_key,
+            refresh_seconds=settings.privy_key_refresh_seconds,
+        )
+    return PrivyTokenVerifier(
+        app_id=settings.privy_app_id,
+        key_provider=key_provider,
+        cache=ClaimsCache(
+            max_entries=settings.privy_claims_cache_size,
+            ttl_seconds=settings.privy_claims_cache_ttl_seconds,
+        ),
+    )
+
+
+def normalize_privy_claims(raw_claims: Any) -> dict[str, str]:
+    """
+    Convert Privy token claims into a dict with the fields we need.
+
+    Claims can arrive as an object with attributes or a plain dict. We
+    defensively support both shapes and surface a clear 500 if required fields
+    are missing.
+    """
+
+    def _extract(source: Any, key: str, fallback: Optional[str] = None) -> Optional[str]:
+        """Attempt to extract attribute or dict key with optional fallback path."""
+        if isinstance(source, dict):
+            if source.get(key) is not None:
+                return source[key]
+            if fallback and fallback in source:
+                nested = source[fallback]
+                if isinstance(nested, dict):
+                    return nested.get("id")
+        else:
+            if hasattr(source, key):
+                value = getattr(source, key)
+                if isinstance(value, (str, int)):
+                    return str(value)
+            if fallback and hasattr(source, fallback):
+                nested = getattr(source, fallback)
+                if hasattr(nested, "id"):
+                    nested_id = getattr(nested, "id")
+                    if isinstance(nested_id, (str, int)):
+                        return str(nested_id)
+        return None
+
+    user_id = _extract(raw_claims, "user_id", fallback="user")
+    session_id = _extract(raw_claims, "session_id", fallback="session")
+    app_id = _extract(raw_claims, "app_id")
+
+    missing = [name for name, value in [("user_id", user_id), ("session_id", session_id), ("app_id", app_id)] if value is None]
+    if missing:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Privy claims missing expected field(s): {', '.join(missing)}",
+        )
+
+    return {
+        "user_id": user_id,
+        "session_id": session_id,
+        "app_id": app_id,
+    }
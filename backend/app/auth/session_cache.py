@@ -0,0 +1,204 @@
+"""
+Two-tier cache for ``axis_session`` cookie lookups.
+
+Tier one is a per-process TTL map, tier two is Redis; the ``sessions`` table
+is only read on a miss in both. Entries never outlive the session's
+``expires_at``. Whenever a flush changes ``revoked_at``/``expires_at`` or
+deletes a session row, the entry is dropped from both tiers after commit.
+Other workers' in-process tiers catch up within ``local_ttl_seconds``.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from datetime import datetime, timezone
+import json
+import logging
+import threading
+import time
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session as OrmSession
+
+from app.core.config import settings
+from app.core.redis import RedisError, get_redis
+from app.models import Session as SessionRecord
+from app.models import User
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "axis:auth-session:"
+MAX_LOCAL_ENTRIES = 50_000
+REDIS_RETRY_SECONDS = 5.0
+
+
+@dataclass(frozen=True)
+class CachedSession:
+    session_id: str
+    expires_at: float | None
+    user_id: str
+    email: str | None
+    default_wallet_address: str | None
+    created_at: float
+    updated_at: float
+
+    @classmethod
+    def from_rows(cls, record: SessionRecord, user: User) -> "CachedSession":
+        return cls(
+            session_id=str(record.id),
+            expires_at=_timestamp(record.expires_at),
+            user_id=user.id,
+            email=user.email,
+            default_wallet_address=user.default_wallet_address,
+            created_at=_timestamp(user.created_at),
+            updated_at=_timestamp(user.updated_at),
+        )
+
+    def to_user(self) -> User:
+        """Build a detached, read-only ``User``; re-fetch it before writing."""
+        return User(
+            id=self.user_id,
+            email=self.email,
+            default_wallet_address=self.default_wallet_address,
+            created_at=datetime.fromtimestamp(self.created_at, timezone.utc),
+            updated_at=datetime.fromtimestamp(self.updated_at, timezone.utc),
+        )
+
+    def ttl(self, ceiling: float) -> float:
+        if self.expires_at is None:
+            return ceiling
+        return min(ceiling, self.expires_at - time.time())
+
+
+class SessionAuthCache:
+    def __init__(self, local_ttl_seconds: float, redis_ttl_seconds: float) -> None:
+        self.local_ttl_seconds = local_ttl_seconds
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self._local: OrderedDict[str, tuple[float, CachedSession]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._redis_down_until = 0.0
+
+    def get(self, session_id: str) -> CachedSession | None:
+        cached = self.get_local(session_id)
+        if cached is None:
+            cached = self.get_shared(session_id)
+        return cached
+
+    def get_local(self, session_id: str) -> CachedSession | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._local.get(session_id)
+            if entry is None:
+                return None
+            if entry[0] > now:
+                return entry[1]
+            del self._local[session_id]
+            return None
+
+    def get_shared(self, session_id: str) -> CachedSession | None:
+        """Look the session up in Redis (a blocking call) and promote hits."""
+        if not self._redis_usable():
+            return None
+        try:
+            raw = get_redis().get(REDIS_KEY_PREFIX + session_id)
+        except RedisError:
+            self._mark_redis_down()
+            return None
+        if raw is None:
+            return None
+        cached = CachedSession(**json.loads(raw))
+        self._put_local(cached)
+        return cached
+
+    def put(self, cached: CachedSession) -> None:
+        redis_ttl = cached.ttl(self.redis_ttl_seconds)
+        if redis_ttl <= 0:
+            return
+        self._put_local(cached)
+        if not self._redis_usable():
+            return
+        try:
+            get_redis().set(
+                REDIS_KEY_PREFIX + cached.session_id,
+                json.dumps(asdict(cached)),
+                ex=max(1, int(redis_ttl)),
+            )
+        except RedisError:
+            self._mark_redis_down()
+
+    def invalidate(self, *session_ids: str) -> None:
+        if not session_ids:
+            return
+        with self._lock:
+            for session_id in session_ids:
+                self._local.pop(session_id, None)
+        try:
+            get_redis().delete(*(REDIS_KEY_PREFIX + session_id for session_id in session_ids))
+        except RedisError:
+            logger.warning("Redis unavailable; session cache entries may outlive revocation")
+
+    def _redis_usable(self) -> bool:
+        return time.monotonic() >= self._redis_down_until
+
+    def _mark_redis_down(self) -> None:
+        # Skip Redis for a while instead of paying a connect timeout per request.
+        self._redis_down_until = time.monotonic() + REDIS_RETRY_SECONDS
+        logger.warning("Redis unavailable for session cache; using in-process tier only")
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._local.clear()
+
+    def _put_local(self, cached: CachedSession) -> None:
+        ttl = cached.ttl(self.local_ttl_seconds)
+        if ttl <= 0:
+            return
+        with self._lock:
+            self._local[cached.session_id] = (time.monotonic() + ttl, cached)
+            self._local.move_to_end(cached.session_id)
+            while len(self._local) > MAX_LOCAL_ENTRIES:
+                self._local.popitem(last=False)
+
+
+session_auth_cache = SessionAuthCache(
+    local_ttl_seconds=settings.auth_cache_local_ttl_seconds,
+    redis_ttl_seconds=settings.auth_cache_redis_ttl_seconds,
+)
+
+
+def _timestamp(value: datetime | None) -> float | None:
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+_PENDING_KEY = "axis_invalidated_sessions"
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _collect_session_changes(db: OrmSession, flush_context: object) -> None:
+    changed: set[str] = db.info.setdefault(_PENDING_KEY, set())
+    for obj in db.deleted:
+        if isinstance(obj, SessionRecord):
+            changed.add(str(obj.id))
+    for obj in db.dirty:
+        if not isinstance(obj, SessionRecord):
+            continue
+        state = inspect(obj)
+        if state.attrs.revoked_at.history.has_changes() or state.attrs.expires_at.history.has_changes():
+            changed.add(str(obj.id))
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _invalidate_after_commit(db: OrmSession) -> None:
+    changed = db.info.pop(_PENDING_KEY, None)
+    if changed:
+        session_auth_cache.invalidate(*changed)
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_pending(db: OrmSession) -> None:
+    db.info.pop(_PENDING_KEY, None)
@@ -1,5 +1,4 @@
 from .config import settings
-from .database import get_db
-
-__all__ = ["settings", "get_db"]
+from .database import get_async_db, get_db
 
+__all__ = ["settings", "get_db", "get_async_db"]
@@ -0,0 +1,252 @@
+"""
+Admission control for the expensive endpoints (login, telemetry upload).
+
+Two mechanisms, both rejecting at once rather than queueing, so overload on
+these routes turns into fast errors instead of latency for everyone else:
+
+- Token buckets per client IP and per user. Each bucket refills at the
+  route class's rate and holds ``rate_limit_burst_seconds`` worth of
+  tokens. Over the limit: 429 with ``Retry-After`` set to when the next
+  token arrives. Buckets live in process by default. With
+  ``RATE_LIMIT_BACKEND=redis`` they live in Redis (one script call per
+  check), so the limit holds across workers. While Redis is unreachable
+  the in-process buckets take over.
+- A cap on in-flight requests per route class. Past it: 503 with
+  ``Retry-After``. The cap is per worker, like the DB pool it protects, so
+  a burst of uploads or logins cannot take every pooled connection (or
+  threadpool thread) the other routes need.
+
+Routes opt in with ``Depends(admit(name))``, which charges the IP bucket and
+holds a concurrency slot for the rest of the request. Per-user buckets are
+charged with ``check_user`` once the user is known.
+"""
+
+from __future__ import annotations
+
+from collections import OrderedDict
+from collections.abc import AsyncIterator, Callable
+from dataclasses import dataclass
+import logging
+import math
+import threading
+import time
+
+from fastapi import HTTPException, Request, status
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.metrics import admission_in_flight, admission_rejections_total
+from app.core.redis import RedisError, get_redis
+
+logger = logging.getLogger(__name__)
+
+REDIS_KEY_PREFIX = "axis:rate:"
+REDIS_RETRY_SECONDS = 5.0
+MAX_LOCAL_BUCKETS = 100_000
+CONCURRENCY_RETRY_AFTER_SECONDS = 1
+
+# Refill, take one token and report the wait for the next one, atomically.
+# The Redis server clock is used so every worker agrees on elapsed time;
+# the wait is returned as a string because Redis truncates Lua numbers.
+_TAKE_SCRIPT = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local clock = redis.call('TIME')
+local now = tonumber(clock[1]) + tonumber(clock[2]) / 1000000
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'stamp')
+local tokens = tonumber(state[1]) or burst
+local stamp = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - stamp) * rate)
+local wait = 0
+if tokens >= 1 then
+    tokens = tokens - 1
+else
+    wait = (1 - tokens) / rate
+end
+redis.call('HSET', KEYS[1], 'tokens', tostring(tokens), 'stamp', tostring(now))
+redis.call('PEXPIRE', KEYS[1], math.ceil(burst / rate * 1000))
+return tostring(wait)
+"""
+
+
+@dataclass(frozen=True)
+class Limit:
+    rate: float  # tokens per second
+    burst: float
+
+    @classmethod
+    def per_minute(cls, requests: float) -> "Limit":
+        rate = requests / 60.0
+        return cls(rate=rate, burst=max(1.0, rate * settings.rate_limit_burst_seconds))
+
+
+class LocalBuckets:
+    """Token buckets in this process, least recently used evicted first."""
+
+    def __init__(self, max_buckets: int = MAX_LOCAL_BUCKETS) -> None:
+        self.max_buckets = max_buckets
+        self._state: OrderedDict[str, tuple[float, float]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def take(self, key: str, limit: Limit) -> float:
+        """Take a token; return 0 on success or the seconds until one is available."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, stamp = self._state.pop(key, (limit.burst, now))
+            tokens = min(limit.burst, tokens + (now - stamp) * limit.rate)
+            if tokens >= 1:
+                tokens -= 1
+                wait = 0.0
+            else:
+                wait = (1 - tokens) / limit.rate
+            self._state[key] = (tokens, now)
+            if len(self._state) > self.max_buckets:
+                self._state.popitem(last=False)
+        return wait
+
+    def clear(self) -> None:
+        with self._lock:
+            self._state.clear()
+
+
+class RedisBuckets:
+    """Token buckets shared by all workers through Redis."""
+
+    def __init__(self, fallback: LocalBuckets) -> None:
+        self.fallback = fallback
+        self._script = None
+        self._down_until = 0.0
+
+    def take(self, key: str, limit: Limit) -> float:
+        if time.monotonic() >= self._down_until:
+            try:
+                if self._script is None:
+                    self._script = get_redis().register_script(_TAKE_SCRIPT)
+                return float(self._script(keys=[REDIS_KEY_PREFIX + key], args=[limit.rate, limit.burst]))
+            except RedisError:
+                self._down_until = time.monotonic() + REDIS_RETRY_SECONDS
+                logger.warning("Redis unavailable for rate limiting; using in-process buckets")
+        return self.fallback.take(key, limit)
+
+    def clear(self) -> None:
+        self.fallback.clear()
+
+
+class ConcurrencyLimit:
+    def __init__(self, name: str, max_in_flight: int) -> None:
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            if self.max_in_flight and self.in_flight >= self.max_in_flight:
+                return False
+            self.in_flight += 1
+            in_flight = self.in_flight
+        admission_in_flight.set((self.name,), in_flight)
+        return True
+
+    def release(self) -> None:
+        with self._lock:
+            self.in_flight -= 1
+            in_flight = self.in_flight
+        admission_in_flight.set((self.name,), in_flight)
+
+
+@dataclass(frozen=True)
+class RouteClass:
+    name: str
+    ip_limit: Limit
+    user_limit: Limit
+    concurrency: ConcurrencyLimit
+
+
+ROUTE_CLASSES = {
+    "login": RouteClass(
+        name="login",
+        ip_limit=Limit.per_minute(settings.login_ip_rate_per_minute),
+        user_limit=Limit.per_minute(settings.login_user_rate_per_minute),
+        concurrency=ConcurrencyLimit("login", settings.login_max_concurrency),
+    ),
+    "telemetry": RouteClass(
+        name="telemetry",
+        ip_limit=Limit.per_minute(settings.telemetry_ip_rate_per_minute),
+        user_limit=Limit.per_minute(settings.telemetry_user_rate_per_minute),
+        concurrency=ConcurrencyLimit("telemetry", settings.telemetry_max_concurrency),
+    ),
+}
+
+
+def _build_buckets() -> LocalBuckets | RedisBuckets:
+    # The memory:// stand-in is per process anyway; local buckets do the same job.
+    if settings.rate_limit_backend == "redis" and not settings.redis_url.startswith("memory://"):
+        return RedisBuckets(LocalBuckets())
+    return LocalBuckets()
+
+
+buckets = _build_buckets()
+
+
+def client_ip(request: Request) -> str:
+    return request.client.host if request.client else "unknown"
+
+
+def _retry_after(seconds: float) -> dict[str, str]:
+    return {"Retry-After": str(max(1, math.ceil(seconds)))}
+
+
+def _charge(route_class: RouteClass, reason: str, key: str, limit: Limit) -> None:
+    wait = buckets.take(f"{route_class.name}:{reason}:{key}", limit)
+    if wait > 0:
+        admission_rejections_total.inc((route_class.name, reason))
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many requests",
+            headers=_retry_after(wait),
+        )
+
+
+async def _charge_async(route_class: RouteClass, reason: str, key: str, limit: Limit) -> None:
+    if isinstance(buckets, RedisBuckets):
+        await run_in_threadpool(_charge, route_class, reason, key, limit)
+    else:
+        _charge(route_class, reason, key, limit)
+
+
+def check_user(name: str, user_id: str) -> None:
+    """Charge the user's bucket for route class ``name``; raises 429 when empty. Blocking."""
+    if settings.rate_limit_enabled:
+        route_class = ROUTE_CLASSES[name]
+        _charge(route_class, "user", user_id, route_class.user_limit)
+
+
+async def check_user_async(name: str, user_id: str) -> None:
+    if settings.rate_limit_enabled:
+        route_class = ROUTE_CLASSES[name]
+        await _charge_async(route_class, "user", user_id, route_class.user_limit)
+
+
+def admit(name: str) -> Callable[[Request], AsyncIterator[None]]:
+    """Dependency: charge the client IP's bucket, then hold a concurrency slot for the request."""
+    route_class = ROUTE_CLASSES[name]
+
+    async def dependency(request: Request) -> AsyncIterator[None]:
+        if not settings.rate_limit_enabled:
+            yield
+            return
+        await _charge_async(route_class, "ip", client_ip(request), route_class.ip_limit)
+        if not route_class.concurrency.try_acquire():
+            admission_rejections_total.inc((route_class.name, "concurrency"))
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail="Server busy, retry shortly",
+                headers=_retry_after(CONCURRENCY_RETRY_AFTER_SECONDS),
+            )
+        try:
+            yield
+        finally:
+            route_class.concurrency.release()
+
+    return dependency
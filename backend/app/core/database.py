@@ -1,15 +1,43 @@
-from collections.abc import Generator
+from collections.abc import AsyncGenerator, Callable, Generator
 
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 
+# Async drivers for URLs whose default driver is sync-only; psycopg 3 serves
+# both, so ``postgresql+psycopg`` URLs are used as-is.
+ASYNC_DRIVERS = {
+    "postgresql": "postgresql+psycopg",
+    "sqlite": "sqlite+aiosqlite",
+}
+
+
+def _pool_options() -> dict[str, object]:
+    if make_url(settings.database_url).get_backend_name() == "sqlite":
+        return {}
+    return {
+        "pool_size": settings.db_pool_size,
+        "max_overflow": settings.db_max_overflow,
+        "pool_timeout": settings.db_pool_timeout_seconds,
+    }
+
+
+def async_database_url(url: str) -> str:
+    parsed = make_url(url)
+    if parsed.drivername in ASYNC_DRIVERS:
+        parsed = parsed.set(drivername=ASYNC_DRIVERS[parsed.drivername])
+    return parsed.render_as_string(hide_password=False)
+
 
 engine = create_engine(
     settings.database_url,
     future=True,
     pool_pre_ping=True,
+    **_pool_options(),
 )
 
 SessionLocal = sessionmaker(
@@ -20,6 +48,19 @@ SessionLocal = sessionmaker(
     expire_on_commit=False,
 )
 
+async_engine = create_async_engine(
+    async_database_url(settings.database_url),
+    pool_pre_ping=True,
+    **_pool_options(),
+)
+
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine,
+    autoflush=False,
+    class_=AsyncSession,
+    expire_on_commit=False,
+)
+
 
 def get_db() -> Generator[Session, None, None]:
     db = SessionLocal()
@@ -28,3 +69,22 @@ def get_db() -> Generator[Session, None, None]:
     finally:
         db.close()
 
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Async counterpart of ``get_db``. Handlers using it run on the event loop
+    instead of the threadpool, so concurrency is bounded by the connection
+    pool rather than by the threadpool size.
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def dialect_insert(db: Session | AsyncSession) -> Callable:
+    """Return the dialect's ``insert`` construct, which supports ON CONFLICT."""
+    name = db.get_bind().dialect.name
+    if name == "postgresql":
+        return postgresql.insert
+    if name == "sqlite":
+        return sqlite.insert
+    raise NotImplementedError(f"Upserts are not supported on {name}")
@@ -1,11 +1,93 @@
+"""
+Logging setup.
+
+With ``settings.log_queue`` (the default) every logger writes to a
+``QueueHandler`` and a single ``QueueListener`` thread does the formatting
+and console/file I/O, so request handlers never block on a slow disk or
+terminal. The calling thread only builds the message, and only for records
+that pass the level check and sampling.
+
+``settings.log_format = "json"`` writes one JSON object per line, including
+any ``extra=`` fields. High-volume per-request messages are logged with
+``extra=SAMPLED`` and kept at ``settings.log_sample_rate``; uvicorn's
+access log is sampled the same way.
+"""
+
 from __future__ import annotations
 
+import atexit
+from datetime import datetime, timezone
+import json
 import logging
 import logging.config
+import logging.handlers
 from pathlib import Path
+import queue
+import random
+from typing import Any
+
+from app.core.config import settings
 
 LOG_DIR = Path(__file__).resolve().parents[2] / "logs"
-LOG_DIR.mkdir(parents=True, exist_ok=True)
+
+# Pass as ``extra=`` to mark a message that may be dropped by sampling.
+SAMPLED: dict[str, Any] = {"sampled": True}
+
+# Attributes every LogRecord has; anything else came in through ``extra=``.
+_RECORD_ATTRS = frozenset(
+    vars(logging.LogRecord("", 0, "", 0, "", (), None)).keys()
+) | {"message", "asctime", "sampled"}
+
+_LOGGER_NAMES = ("app", "uvicorn", "uvicorn.error", "uvicorn.access")
+
+_listener: logging.handlers.QueueListener | None = None
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry: dict[str, Any] = {
+            "time": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS and not key.startswith("_"):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc_info"] = record.exc_text
+        if record.stack_info:
+            entry["stack_info"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, default=str, ensure_ascii=False)
+
+
+class SampleFilter(logging.Filter):
+    """Keep ``rate`` of the records marked with ``SAMPLED`` (or of all, with ``all_records``)."""
+
+    def __init__(self, rate: float = 1.0, all_records: bool = False) -> None:
+        super().__init__()
+        self.rate = rate
+        self.all_records = all_records
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.rate >= 1.0 or not (self.all_records or getattr(record, "sampled", False)):
+            return True
+        return random.random() < self.rate
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Unlike the stdlib version, keep the traceback apart from the message
+        # so the listener's formatter can render it (e.g. as its own JSON field).
+        record = logging.makeLogRecord(record.__dict__)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
 
 
 LOGGING_CONFIG: dict[str, object] = {
@@ -16,17 +98,27 @@ LOGGING_CONFIG: dict[str, object] = {
             "format": "%(asctime)s %(levelname)s [%(name)s] %(message)s",
             "datefmt": "%Y-%m-%d %H:%M:%S",
         },
+        "json": {
+            "()": JsonFormatter,
+        },
+    },
+    "filters": {
+        "sample_all": {
+            "()": SampleFilter,
+            "rate": settings.log_sample_rate,
+            "all_records": True,
+        },
     },
     "handlers": {
         "console": {
             "class": "logging.StreamHandler",
             "level": "INFO",
-            "formatter": "standard",
+            "formatter": "json" if settings.log_format == "json" else "standard",
         },
         "file": {
             "class": "logging.handlers.RotatingFileHandler",
             "level": "INFO",
-            "formatter": "standard",
+            "formatter": "json" if settings.log_format == "json" else "standard",
             "filename": str(LOG_DIR / "backend.log"),
             "maxBytes": 5 * 1024 * 1024,
             "backupCount": 3,
@@ -51,6 +143,7 @@ LOGGING_CONFIG: dict[str, object] = {
         "uvicorn.access": {
             "handlers": ["console", "file"],
             "level": "INFO",
+            "filters": ["sample_all"],
             "propagate": False,
         },
     },
@@ -62,5 +155,42 @@ LOGGING_CONFIG: dict[str, object] = {
 
 
 def configure_logging() -> None:
+    global _listener
+
+    stop_logging()
+    LOG_DIR.mkdir(parents=True, exist_ok=True)
     logging.config.dictConfig(LOGGING_CONFIG)
+    root = logging.getLogger()
+    sample = SampleFilter(settings.log_sample_rate)
+    if not settings.log_queue:
+        for handler in root.handlers:
+            handler.addFilter(sample)
+        return
+
+    # Move the configured handlers behind one queue. Sampling happens before
+    # enqueueing, so dropped records are never formatted or written.
+    handlers = list(root.handlers)
+    log_queue: queue.SimpleQueue[logging.LogRecord] = queue.SimpleQueue()
+    queue_handler = _QueueHandler(log_queue)
+    queue_handler.addFilter(sample)
+    for logger in [root, *(logging.getLogger(name) for name in _LOGGER_NAMES)]:
+        for handler in list(logger.handlers):
+            if handler not in handlers:
+                handlers.append(handler)
+            logger.removeHandler(handler)
+        logger.addHandler(queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+
+
+def stop_logging() -> None:
+    """Flush queued records and stop the listener thread, if one is running."""
+    global _listener
+
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
 
+atexit.register(stop_logging)
@@ -0,0 +1,378 @@
+"""
+Request and database instrumentation, exported in Prometheus text format.
+
+``MetricsMiddleware`` times every request per ``(method, route, status)``,
+where ``route`` is the matched path template, so ids do not explode the
+label set. SQLAlchemy engine events count statements and time spent in the
+database, attributed to the request that ran them through a context
+variable. Per-route histograms of queries per request make N+1 patterns
+stand out. Metrics are per process; with several workers, scrape each or
+aggregate in Prometheus.
+
+With ``slow_request_seconds`` set, requests slower than that are counted and
+the most recent ones are kept with their query stats. A fraction
+(``profile_sample_rate``) of requests also runs under ``cProfile``, one at a
+time, and slow ones keep the profile's top entries. The profile covers the
+event loop thread, so for ``async`` routes it can include work of other
+requests interleaved on the loop.
+"""
+
+from __future__ import annotations
+
+import bisect
+import cProfile
+from collections import deque
+from collections.abc import Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import io
+import logging
+import pstats
+import random
+import threading
+import time
+from typing import Any
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+MAX_SLOW_REQUESTS = 50
+PROFILE_TOP_ENTRIES = 25
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, labels: tuple[str, ...] = (), amount: float = 1.0) -> None:
+        with self._lock:
+            self._values[labels] = self._values.get(labels, 0.0) + amount
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Gauge:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: dict[tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def set(self, labels: tuple[str, ...], value: float) -> None:
+        with self._lock:
+            self._values[labels] = value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        with self._lock:
+            items = sorted(self._values.items())
+        for labels, value in items:
+            lines.append(f"{self.name}{_format_labels(self.labelnames, labels)} {_format_value(value)}")
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        buckets: Sequence[float],
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: per-bucket counts (last slot is +Inf), sum, count.
+        self._series: dict[tuple[str, ...], tuple[list[int], list[float]]] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, labels: tuple[str, ...], value: float) -> None:
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = ([0] * (len(self.buckets) + 1), [0.0])
+                self._series[labels] = series
+            series[0][index] += 1
+            series[1][0] += value
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            items = sorted((labels, (list(counts), total[0])) for labels, (counts, total) in self._series.items())
+        for labels, (counts, total) in items:
+            cumulative = 0
+            for bound, count in zip((*self.buckets, float("inf")), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(
+                    f"{self.name}_bucket{_format_labels(self.labelnames, labels, le)} {cumulative}"
+                )
+            label_text = _format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {_format_value(total)}")
+            lines.append(f"{self.name}_count{label_text} {cumulative}")
+        return lines
+
+
+ROUTE_LABELS = ("method", "route", "status")
+
+request_duration = Histogram(
+    "axis_http_request_duration_seconds",
+    "Request latency by route template.",
+    ROUTE_LABELS,
+    LATENCY_BUCKETS,
+)
+request_queries = Histogram(
+    "axis_http_request_db_queries",
+    "Database statements executed per request.",
+    ROUTE_LABELS,
+    QUERY_COUNT_BUCKETS,
+)
+request_db_seconds = Histogram(
+    "axis_http_request_db_seconds",
+    "Time spent in database statements per request.",
+    ROUTE_LABELS,
+    LATENCY_BUCKETS,
+)
+db_queries_total = Counter(
+    "axis_db_queries_total",
+    "Database statements executed, including outside requests.",
+)
+db_seconds_total = Counter(
+    "axis_db_seconds_total",
+    "Time spent in database statements, including outside requests.",
+)
+slow_requests_total = Counter(
+    "axis_http_slow_requests_total",
+    "Requests slower than the slow-request threshold.",
+    ("method", "route"),
+)
+startup_seconds = Gauge(
+    "axis_startup_seconds",
+    "Cold-start time by phase (import, lifespan, ready).",
+    ("phase",),
+)
+admission_rejections_total = Counter(
+    "axis_admission_rejections_total",
+    "Requests rejected by rate limits (ip, user) or concurrency caps.",
+    ("route_class", "reason"),
+)
+admission_in_flight = Gauge(
+    "axis_admission_in_flight",
+    "Requests currently admitted per route class in this worker.",
+    ("route_class",),
+)
+
+REGISTRY = (
+    request_duration,
+    request_queries,
+    request_db_seconds,
+    db_queries_total,
+    db_seconds_total,
+    slow_requests_total,
+    startup_seconds,
+    admission_rejections_total,
+    admission_in_flight,
+)
+
+
+def render_metrics() -> str:
+    lines: list[str] = []
+    for metric in REGISTRY:
+        lines.extend(metric.render())
+    return "\n".join(lines) + "\n"
+
+
+@dataclass
+class RequestStats:
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+@dataclass
+class SlowRequest:
+    method: str
+    route: str
+    status: int
+    duration: float
+    queries: int
+    db_seconds: float
+    at: float = field(default_factory=time.time)
+    profile: str | None = None
+
+
+_request_stats: ContextVar[RequestStats | None] = ContextVar("axis_request_stats", default=None)
+slow_requests: deque[SlowRequest] = deque(maxlen=MAX_SLOW_REQUESTS)
+_profiler_lock = threading.Lock()
+
+
+@event.listens_for(Engine, "before_cursor_execute")
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    conn.info.setdefault("axis_query_start", []).append(time.perf_counter())
+
+
+@event.listens_for(Engine, "after_cursor_execute")
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany) -> None:
+    starts = conn.info.get("axis_query_start")
+    if not starts:
+        return
+    elapsed = time.perf_counter() - starts.pop()
+    db_queries_total.inc()
+    db_seconds_total.inc(amount=elapsed)
+    stats = _request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_seconds += elapsed
+
+
+class MetricsMiddleware:
+    def __init__(
+        self,
+        app: ASGIApp,
+        slow_request_seconds: float | None = None,
+        profile_sample_rate: float = 0.0,
+    ) -> None:
+        self.app = app
+        self.slow_request_seconds = slow_request_seconds
+        self.profile_sample_rate = profile_sample_rate if slow_request_seconds is not None else 0.0
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        profiler = self._maybe_start_profiler()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            duration = time.perf_counter() - start
+            if profiler is not None:
+                profiler.disable()
+                _profiler_lock.release()
+            _request_stats.reset(token)
+            self._record(scope, status_code, duration, stats, profiler)
+
+    def _maybe_start_profiler(self) -> cProfile.Profile | None:
+        if not self.profile_sample_rate or random.random() >= self.profile_sample_rate:
+            return None
+        if not _profiler_lock.acquire(blocking=False):
+            return None
+        profiler = cProfile.Profile()
+        try:
+            profiler.enable()
+        except ValueError:
+            # Another profiler (e.g. a debugger) is active.
+            _profiler_lock.release()
+            return None
+        return profiler
+
+    def _record(
+        self,
+        scope: Scope,
+        status_code: int,
+        duration: float,
+        stats: RequestStats,
+        profiler: cProfile.Profile | None,
+    ) -> None:
+        template = route_template(scope)
+        labels = (scope["method"], template, str(status_code))
+        request_duration.observe(labels, duration)
+        request_queries.observe(labels, stats.queries)
+        request_db_seconds.observe(labels, stats.db_seconds)
+
+        if self.slow_request_seconds is None or duration < self.slow_request_seconds:
+            return
+        slow_requests_total.inc((scope["method"], template))
+        slow_requests.append(
+            SlowRequest(
+                method=scope["method"],
+                route=template,
+                status=status_code,
+                duration=duration,
+                queries=stats.queries,
+                db_seconds=stats.db_seconds,
+                profile=_summarize(profiler) if profiler is not None else None,
+            )
+        )
+        logger.warning(
+            "Slow request method=%s route=%s status=%s duration=%.3fs queries=%s db=%.3fs",
+            scope["method"],
+            template,
+            status_code,
+            duration,
+            stats.queries,
+            stats.db_seconds,
+        )
+
+
+def route_template(scope: Scope) -> str:
+    """The matched route's path template, including the prefix it was included under."""
+    route = scope.get("route")
+    regex = getattr(route, "path_regex", None)
+    if regex is None:
+        return "unmatched"
+    # Included routers keep their own relative paths, so find the request-path
+    # prefix that the route's pattern leaves over.
+    path = scope["path"]
+    start = 0
+    while start != -1:
+        if regex.match(path[start:]):
+            return path[:start] + route.path
+        start = path.find("/", start + 1)
+    return route.path
+
+
+def _summarize(profiler: cProfile.Profile) -> str:
+    out = io.StringIO()
+    pstats.Stats(profiler, stream=out).sort_stats("cumulative").print_stats(PROFILE_TOP_ENTRIES)
+    return out.getvalue()
+
+
+def slow_request_report() -> list[dict[str, Any]]:
+    return [vars(entry) for entry in reversed(slow_requests)]
+
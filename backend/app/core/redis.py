@@ -0,0 +1,240 @@
+"""
+Redis access with an in-memory stand-in.
+
+Set ``REDIS_URL=memory://`` to run without a Redis server (tests, local
+development); ``InMemoryRedis`` implements the subset of commands the app
+uses, with the same bytes-in/bytes-out semantics. Sorted sets are backed by
+a ``SortedList`` so rank queries stay O(log n) as in Redis. Callers treat
+Redis as a cache and fall back to the database on ``RedisError``.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+import threading
+import time
+from typing import Any
+
+import redis
+from redis.exceptions import RedisError
+from sortedcontainers import SortedList
+
+from app.core.config import settings
+
+__all__ = ["InMemoryRedis", "RedisError", "get_redis"]
+
+
+def _to_bytes(value: bytes | str | int | float) -> bytes:
+    if isinstance(value, bytes):
+        return value
+    return str(value).encode()
+
+
+class _SortedSet:
+    """Members ordered by ``(score, member)``, matching Redis tie-breaking."""
+
+    def __init__(self) -> None:
+        self.scores: dict[bytes, float] = {}
+        self.ordered = SortedList()
+
+    def add(self, member: bytes, score: float) -> bool:
+        previous = self.scores.get(member)
+        if previous is not None:
+            if previous == score:
+                return False
+            self.ordered.remove((previous, member))
+        self.scores[member] = score
+        self.ordered.add((score, member))
+        return previous is None
+
+    def remove(self, member: bytes) -> bool:
+        score = self.scores.pop(member, None)
+        if score is None:
+            return False
+        self.ordered.remove((score, member))
+        return True
+
+    def rev_rank(self, member: bytes) -> int | None:
+        score = self.scores.get(member)
+        if score is None:
+            return None
+        return len(self.ordered) - 1 - self.ordered.index((score, member))
+
+    def rev_range(self, start: int, end: int) -> list[tuple[bytes, float]]:
+        size = len(self.ordered)
+        if start < 0:
+            start = max(size + start, 0)
+        if end < 0:
+            end = size + end
+        end = min(end, size - 1)
+        if start > end:
+            return []
+        # Reverse index i maps to forward index size - 1 - i.
+        items = self.ordered.islice(size - 1 - end, size - start, reverse=True)
+        return [(member, score) for score, member in items]
+
+
+class _Pipeline:
+    """Queue commands and run them together, like ``redis.client.Pipeline``."""
+
+    def __init__(self, client: "InMemoryRedis") -> None:
+        self._client = client
+        self._commands: list[tuple[str, tuple, dict]] = []
+
+    def __getattr__(self, name: str) -> Any:
+        getattr(self._client, name)
+
+        def queue(*args: Any, **kwargs: Any) -> "_Pipeline":
+            self._commands.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    def execute(self) -> list[Any]:
+        commands, self._commands = self._commands, []
+        return [getattr(self._client, name)(*args, **kwargs) for name, args, kwargs in commands]
+
+    def __enter__(self) -> "_Pipeline":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._commands = []
+
+
+class InMemoryRedis:
+    def __init__(self) -> None:
+        self._data: dict[bytes, tuple[bytes, float | None]] = {}
+        self._zsets: dict[bytes, _SortedSet] = {}
+        self._lock = threading.RLock()
+
+    def _live(self, key: bytes) -> bytes | None:
+        entry = self._data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+        return value
+
+    def get(self, name: str | bytes) -> bytes | None:
+        with self._lock:
+            return self._live(_to_bytes(name))
+
+    def set(
+        self,
+        name: str | bytes,
+        value: bytes | str | int | float,
+        ex: float | None = None,
+        nx: bool = False,
+    ) -> bool | None:
+        expires_at = time.monotonic() + ex if ex else None
+        key = _to_bytes(name)
+        with self._lock:
+            if nx and self._live(key) is not None:
+                return None
+            self._data[key] = (_to_bytes(value), expires_at)
+        return True
+
+    def delete(self, *names: str | bytes) -> int:
+        removed = 0
+        with self._lock:
+            for name in names:
+                key = _to_bytes(name)
+                if self._data.pop(key, None) is not None or self._zsets.pop(key, None) is not None:
+                    removed += 1
+        return removed
+
+    def rename(self, src: str | bytes, dst: str | bytes) -> bool:
+        source, target = _to_bytes(src), _to_bytes(dst)
+        with self._lock:
+            if source in self._zsets:
+                self._data.pop(target, None)
+                self._zsets[target] = self._zsets.pop(source)
+            elif source in self._data:
+                self._zsets.pop(target, None)
+                self._data[target] = self._data.pop(source)
+            else:
+                raise redis.ResponseError("no such key")
+        return True
+
+    def flushdb(self) -> bool:
+        with self._lock:
+            self._data.clear()
+            self._zsets.clear()
+        return True
+
+    def pipeline(self, transaction: bool = True) -> _Pipeline:
+        return _Pipeline(self)
+
+    def zadd(
+        self,
+        name: str | bytes,
+        mapping: dict[str | bytes, float],
+        gt: bool = False,
+    ) -> int:
+        added = 0
+        with self._lock:
+            zset = self._zsets.setdefault(_to_bytes(name), _SortedSet())
+            for member, score in mapping.items():
+                member = _to_bytes(member)
+                previous = zset.scores.get(member)
+                if gt and previous is not None and float(score) <= previous:
+                    continue
+                added += zset.add(member, float(score))
+        return added
+
+    def zincrby(self, name: str | bytes, amount: float, value: str | bytes) -> float:
+        member = _to_bytes(value)
+        with self._lock:
+            zset = self._zsets.setdefault(_to_bytes(name), _SortedSet())
+            score = zset.scores.get(member, 0.0) + float(amount)
+            zset.add(member, score)
+        return score
+
+    def zrem(self, name: str | bytes, *values: str | bytes) -> int:
+        with self._lock:
+            zset = self._zsets.get(_to_bytes(name))
+            if zset is None:
+                return 0
+            return sum(zset.remove(_to_bytes(value)) for value in values)
+
+    def zscore(self, name: str | bytes, value: str | bytes) -> float | None:
+        with self._lock:
+            zset = self._zsets.get(_to_bytes(name))
+            return None if zset is None else zset.scores.get(_to_bytes(value))
+
+    def zcard(self, name: str | bytes) -> int:
+        with self._lock:
+            zset = self._zsets.get(_to_bytes(name))
+            return 0 if zset is None else len(zset.scores)
+
+    def zrevrank(self, name: str | bytes, value: str | bytes) -> int | None:
+        with self._lock:
+            zset = self._zsets.get(_to_bytes(name))
+            return None if zset is None else zset.rev_rank(_to_bytes(value))
+
+    def zrevrange(
+        self,
+        name: str | bytes,
+        start: int,
+        end: int,
+        withscores: bool = False,
+    ) -> list[bytes] | list[tuple[bytes, float]]:
+        with self._lock:
+            zset = self._zsets.get(_to_bytes(name))
+            items = [] if zset is None else zset.rev_range(start, end)
+        if withscores:
+            return items
+        return [member for member, _ in items]
+
+
+@lru_cache
+def get_redis() -> redis.Redis | InMemoryRedis:
+    if settings.redis_url.startswith("memory://"):
+        return InMemoryRedis()
+    return redis.Redis.from_url(
+        settings.redis_url,
+        socket_timeout=settings.redis_socket_timeout_seconds,
+        socket_connect_timeout=settings.redis_socket_timeout_seconds,
+    )
@@ -0,0 +1,126 @@
+"""
+Fast JSON responses for hot read endpoints.
+
+Routes that return database rows normally pay twice: ``response_model``
+validates the ORM objects into Pydantic models, then the models are
+encoded. For trusted data (rows read straight from our own tables, whose
+types the database already enforces) ``trusted_dump`` copies the schema's
+fields into a plain dict and ``FastJSONResponse`` encodes it with orjson.
+For flat schemas of str/int/float/bool/None/datetime fields the bytes are
+the same as ``model_dump_json`` (aware datetimes end in ``Z`` like
+Pydantic's). Keep ``response_model`` on the route for the OpenAPI schema;
+FastAPI skips it when a ``Response`` is returned.
+
+Compression is opt-in: with ``RESPONSE_COMPRESSION_MIN_BYTES`` set, bodies at
+least that large are sent Brotli-encoded when the client accepts ``br`` and
+the optional ``brotli`` package is installed, else gzip-encoded.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from functools import lru_cache
+import gzip
+from typing import Any
+
+import orjson
+from pydantic import BaseModel
+from starlette.background import BackgroundTask
+from starlette.responses import Response
+
+from app.core.config import settings
+
+try:
+    import brotli
+except ImportError:  # optional; gzip only without it
+    brotli = None
+
+JSON_MEDIA_TYPE = "application/json"
+ORJSON_OPTIONS = orjson.OPT_UTC_Z
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def dumps(content: Any) -> bytes:
+    return orjson.dumps(content, option=ORJSON_OPTIONS)
+
+
+@lru_cache
+def _field_names(schema: type[BaseModel]) -> tuple[str, ...]:
+    return tuple(schema.model_fields)
+
+
+def trusted_dump(schema: type[BaseModel], obj: Any) -> dict[str, Any]:
+    """Read ``schema``'s fields off ``obj`` without validation. Flat schemas only."""
+    return {name: getattr(obj, name) for name in _field_names(schema)}
+
+
+def negotiate_encoding(accept_encoding: str | None, size: int) -> str | None:
+    """Pick a content coding for a ``size``-byte body, or ``None`` to send it as is."""
+    threshold = settings.response_compression_min_bytes
+    if threshold is None or size < threshold or not accept_encoding:
+        return None
+    accepted = _accepted_codings(accept_encoding)
+    if brotli is not None and ("br" in accepted or "*" in accepted):
+        return "br"
+    if "gzip" in accepted or "*" in accepted:
+        return "gzip"
+    return None
+
+
+def _accepted_codings(accept_encoding: str) -> set[str]:
+    accepted = set()
+    for item in accept_encoding.split(","):
+        coding, *params = item.split(";")
+        quality = 1.0
+        for param in params:
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    quality = float(value)
+                except ValueError:
+                    quality = 0.0
+        if quality > 0:
+            accepted.add(coding.strip().lower())
+    return accepted
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    if encoding == "br":
+        return brotli.compress(body, quality=BROTLI_QUALITY)
+    # mtime=0 keeps the output, and so any ETag derived from it, deterministic.
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def encoding_headers(encoding: str | None) -> dict[str, str]:
+    headers = {}
+    if settings.response_compression_min_bytes is not None:
+        headers["Vary"] = "Accept-Encoding"
+    if encoding is not None:
+        headers["Content-Encoding"] = encoding
+    return headers
+
+
+class FastJSONResponse(Response):
+    """JSON encoded with orjson, compressed when ``accept_encoding`` allows it."""
+
+    media_type = JSON_MEDIA_TYPE
+
+    def __init__(
+        self,
+        content: Any,
+        status_code: int = 200,
+        headers: Mapping[str, str] | None = None,
+        media_type: str | None = None,
+        background: BackgroundTask | None = None,
+        accept_encoding: str | None = None,
+    ) -> None:
+        body = dumps(content)
+        encoding = negotiate_encoding(accept_encoding, len(body))
+        if encoding is not None:
+            body = compress(body, encoding)
+        headers = {**(headers or {}), **encoding_headers(encoding)}
+        super().__init__(body, status_code, headers, media_type, background)
+
+    def render(self, content: Any) -> bytes:
+        return content
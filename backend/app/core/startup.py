@@ -0,0 +1,104 @@
+"""
+Cold-start accounting.
+
+Startup is split into importing the app (from the first ``app`` import to
+the end of ``app.main``) and the lifespan startup work, and the total is
+checked against ``settings.startup_budget_seconds``. The report is logged
+once the app is ready, exported as ``axis_startup_seconds`` gauges and
+served on ``/health/startup``.
+
+With ``settings.lazy_imports`` (the default) heavy stacks such as the Privy
+SDK, the JWT library and NumPy-backed telemetry/scoring load on first use.
+Turning it off preloads them during startup instead, trading a slower
+start for no first-request penalty.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+import importlib
+import logging
+import sys
+import time
+from typing import Any
+
+import app
+from app.core.config import settings
+from app.core.metrics import startup_seconds
+
+logger = logging.getLogger(__name__)
+
+PRELOAD_MODULES = (
+    "privy",
+    "jose.jwt",
+    "app.telemetry.ingest",
+    "app.telemetry.replay",
+    "app.scoring.jobs",
+)
+
+
+@dataclass
+class StartupReport:
+    budget_seconds: float
+    import_seconds: float | None = None
+    lifespan_seconds: float | None = None
+    preload_seconds: float = 0.0
+    deferred_modules: list[str] = field(default_factory=list)
+
+    @property
+    def ready_seconds(self) -> float | None:
+        if self.import_seconds is None or self.lifespan_seconds is None:
+            return None
+        return self.import_seconds + self.lifespan_seconds
+
+    @property
+    def within_budget(self) -> bool | None:
+        ready = self.ready_seconds
+        return None if ready is None else ready <= self.budget_seconds
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "import_seconds": self.import_seconds,
+            "lifespan_seconds": self.lifespan_seconds,
+            "preload_seconds": self.preload_seconds,
+            "ready_seconds": self.ready_seconds,
+            "budget_seconds": self.budget_seconds,
+            "within_budget": self.within_budget,
+            "lazy_imports": settings.lazy_imports,
+            "deferred_modules": self.deferred_modules,
+        }
+
+
+startup_report = StartupReport(budget_seconds=settings.startup_budget_seconds)
+
+
+def mark_imported() -> None:
+    startup_report.import_seconds = time.perf_counter() - app.IMPORT_STARTED
+    startup_seconds.set(("import",), startup_report.import_seconds)
+
+
+def preload_heavy_modules() -> None:
+    started = time.perf_counter()
+    for name in PRELOAD_MODULES:
+        importlib.import_module(name)
+    startup_report.preload_seconds = time.perf_counter() - started
+
+
+def mark_ready(lifespan_started: float) -> None:
+    report = startup_report
+    report.lifespan_seconds = time.perf_counter() - lifespan_started
+    report.deferred_modules = [name for name in PRELOAD_MODULES if name not in sys.modules]
+    startup_seconds.set(("lifespan",), report.lifespan_seconds)
+    startup_seconds.set(("ready",), report.ready_seconds or 0.0)
+
+    logger.info(
+        "Startup ready=%.3fs import=%.3fs lifespan=%.3fs deferred=%s",
+        report.ready_seconds or 0.0,
+        report.import_seconds or 0.0,
+        report.lifespan_seconds,
+        ",".join(report.deferred_modules) or "-",
+    )
+    if report.within_budget is False:
+        logger.warning(
+            "Startup took %.3fs, over the %.3fs budget", report.ready_seconds, report.budget_seconds
+        )
@@ -0,0 +1 @@
+"""Offline export of completed sessions as a sharded training dataset."""
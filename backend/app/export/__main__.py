@@ -0,0 +1,57 @@
+"""
+Export completed sessions as a sharded dataset.
+
+Usage: ``python -m app.export OUTPUT_DIR [--task-id N ...] [--min-score N]
+[--outcome success|failure|completed] [--since ISO] [--until ISO] [--shard-size N]
+[--workers N]``. Re-run the same command to resume an interrupted export.
+"""
+
+from __future__ import annotations
+
+import argparse
+from datetime import datetime
+import json
+import os
+from pathlib import Path
+import sys
+
+from app.core.logging_config import configure_logging
+from app.export.dataset import CheckpointMismatch, ExportOptions, export_dataset
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m app.export", description=__doc__.split("\n\n")[0])
+    parser.add_argument("output", type=Path, help="Directory for shards, checkpoint and manifest.")
+    parser.add_argument("--task-id", type=int, action="append", default=[], help="Repeat for several tasks.")
+    parser.add_argument("--min-score", type=int, default=None, help="Minimum session contribution.")
+    parser.add_argument("--outcome", choices=["success", "failure", "completed"], default=None)
+    parser.add_argument("--since", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--until", type=datetime.fromisoformat, default=None)
+    parser.add_argument("--shard-size", type=int, default=1000, help="Sessions per shard.")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    return parser.parse_args()
+
+
+def main() -> int:
+    args = _parse_args()
+    configure_logging()
+    options = ExportOptions(
+        task_ids=tuple(sorted(set(args.task_id))),
+        min_contribution=args.min_score,
+        outcome=args.outcome,
+        since=args.since,
+        until=args.until,
+        shard_size=args.shard_size,
+    )
+    try:
+        manifest = export_dataset(args.output, options, workers=args.workers)
+    except CheckpointMismatch as exc:
+        print(exc, file=sys.stderr)
+        return 2
+    summary = {"samples": manifest["samples"], "missing": manifest["missing"], "shards": len(manifest["shards"])}
+    print(json.dumps(summary))
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,259 @@
+"""
+Sharded training-dataset export.
+
+Completed task sessions are selected by task, minimum contribution, outcome
+and start-time window, in ``(started_at, id)`` order, and cut into shards of
+``shard_size`` sessions. Each shard is a tar file (WebDataset layout): per
+session, ``<id>.axtraj`` (the columnar trajectory, copied straight from the
+store) and ``<id>.json`` (session metadata). Shards are written by a process
+pool; the parent only streams the selection from the database with
+``yield_per`` and keeps a bounded number of shards in flight.
+
+Progress is checkpointed after every finished shard. Re-running with the
+same options skips shards already written; the window's upper bound is
+frozen in the checkpoint on the first run and applies to both start and
+completion time, so the selection (and therefore shard boundaries) stays
+the same across resumes. ``manifest.json`` is
+written once all shards are done.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from dataclasses import asdict, dataclass, field
+from datetime import datetime, timezone
+import hashlib
+import io
+import json
+import logging
+import os
+from pathlib import Path
+import tarfile
+import time
+from typing import Any
+
+from sqlalchemy import select
+
+from app.core.database import SessionLocal
+from app.models import TaskSession
+from app.models.task_session import FINISHED_OUTCOMES
+from app.telemetry.store import LocalTrajectoryStore, get_trajectory_store
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_FILE = "checkpoint.json"
+MANIFEST_FILE = "manifest.json"
+FORMAT = "axis-trajectories/1"
+
+
+class CheckpointMismatch(RuntimeError):
+    """Raised when an output directory holds progress for different options."""
+
+
+@dataclass(frozen=True)
+class ExportOptions:
+    task_ids: tuple[int, ...] = ()
+    min_contribution: int | None = None
+    outcome: str | None = None
+    since: datetime | None = None
+    until: datetime | None = None
+    shard_size: int = 1000
+
+    def to_json(self) -> dict[str, Any]:
+        data = asdict(self)
+        data["task_ids"] = list(self.task_ids)
+        data["since"] = self.since.isoformat() if self.since else None
+        data["until"] = self.until.isoformat() if self.until else None
+        return data
+
+
+@dataclass
+class ShardInfo:
+    index: int
+    file: str
+    samples: int
+    missing: list[str]
+    bytes: int
+    sha256: str
+
+
+@dataclass
+class ExportCheckpoint:
+    options: dict[str, Any]
+    shards: dict[int, ShardInfo] = field(default_factory=dict)
+
+    @classmethod
+    def load(cls, path: Path) -> "ExportCheckpoint | None":
+        if not path.exists():
+            return None
+        data = json.loads(path.read_text())
+        shards = {int(key): ShardInfo(**value) for key, value in data["shards"].items()}
+        return cls(options=data["options"], shards=shards)
+
+    def save(self, path: Path) -> None:
+        payload = {
+            "options": self.options,
+            "shards": {str(index): asdict(info) for index, info in sorted(self.shards.items())},
+        }
+        _atomic_write(path, json.dumps(payload, indent=2))
+
+
+def _atomic_write(path: Path, text: str) -> None:
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    tmp_path.write_text(text)
+    os.replace(tmp_path, path)
+
+
+def selection_query(options: ExportOptions):
+    stmt = select(
+        TaskSession.id,
+        TaskSession.task_id,
+        TaskSession.started_at,
+        TaskSession.completed_at,
+        TaskSession.outcome,
+        TaskSession.contribution,
+    )
+    if options.outcome is not None:
+        stmt = stmt.where(TaskSession.outcome == options.outcome)
+    else:
+        stmt = stmt.where(TaskSession.outcome.in_(FINISHED_OUTCOMES))
+    if options.task_ids:
+        stmt = stmt.where(TaskSession.task_id.in_(options.task_ids))
+    if options.min_contribution is not None:
+        stmt = stmt.where(TaskSession.contribution >= options.min_contribution)
+    if options.since is not None:
+        stmt = stmt.where(TaskSession.started_at >= options.since)
+    if options.until is not None:
+        # Sessions completing after ``until`` would shift the shards of a resumed run.
+        stmt = stmt.where(TaskSession.started_at < options.until, TaskSession.completed_at < options.until)
+    return stmt.order_by(TaskSession.started_at, TaskSession.id)
+
+
+def iter_shards(options: ExportOptions, batch_size: int = 1000) -> Iterator[tuple[int, list[dict]]]:
+    """Stream the selection from the database, grouped into shards."""
+    shard: list[dict] = []
+    index = 0
+    with SessionLocal() as db:
+        rows = db.execute(selection_query(options).execution_options(yield_per=batch_size))
+        for row in rows:
+            shard.append(
+                {
+                    "session_id": row.id,
+                    "task_id": row.task_id,
+                    "started_at": row.started_at.isoformat(),
+                    "completed_at": row.completed_at.isoformat() if row.completed_at else None,
+                    "outcome": row.outcome,
+                    "contribution": row.contribution,
+                }
+            )
+            if len(shard) == options.shard_size:
+                yield index, shard
+                shard, index = [], index + 1
+    if shard:
+        yield index, shard
+
+
+def write_shard(output_dir: str, index: int, samples: list[dict]) -> ShardInfo:
+    """Write one shard; runs in a pool worker."""
+    store = get_trajectory_store()
+    if not isinstance(store, LocalTrajectoryStore):
+        raise RuntimeError("Dataset export reads trajectories from the local store")
+    name = f"shard-{index:06d}.tar"
+    path = Path(output_dir) / name
+    tmp_path = path.with_name(f".{name}.tmp")
+    missing: list[str] = []
+    written = 0
+    with tarfile.open(tmp_path, "w") as tar:
+        for sample in samples:
+            session_id = sample["session_id"]
+            trajectory = store.path_for(session_id)
+            if not trajectory.is_file():
+                missing.append(session_id)
+                continue
+            tar.add(trajectory, arcname=f"{session_id}.axtraj", recursive=False)
+            metadata = json.dumps({**sample, "format": FORMAT}).encode()
+            info = tarfile.TarInfo(f"{session_id}.json")
+            info.size = len(metadata)
+            info.mtime = int(time.time())
+            tar.addfile(info, io.BytesIO(metadata))
+            written += 1
+
+    digest = hashlib.sha256()
+    with tmp_path.open("rb") as fh:
+        for block in iter(lambda: fh.read(1 << 20), b""):
+            digest.update(block)
+    os.replace(tmp_path, path)
+    return ShardInfo(
+        index=index,
+        file=name,
+        samples=written,
+        missing=missing,
+        bytes=path.stat().st_size,
+        sha256=digest.hexdigest(),
+    )
+
+
+def export_dataset(output_dir: Path, options: ExportOptions, workers: int) -> dict[str, Any]:
+    """Run (or resume) an export into ``output_dir`` and return the manifest."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = output_dir / CHECKPOINT_FILE
+    checkpoint = ExportCheckpoint.load(checkpoint_path)
+    if checkpoint is None:
+        if options.until is None:
+            # Freeze the window so resumed runs cut identical shards.
+            options = ExportOptions(**{**asdict(options), "until": datetime.now(timezone.utc)})
+        checkpoint = ExportCheckpoint(options=options.to_json())
+        checkpoint.save(checkpoint_path)
+    else:
+        frozen = ExportOptions(
+            **{**asdict(options), "until": options.until or _parse_time(checkpoint.options["until"])}
+        )
+        if frozen.to_json() != checkpoint.options:
+            raise CheckpointMismatch(
+                f"{output_dir} holds an export with different options; use a new directory"
+            )
+        options = frozen
+        checkpoint.shards = {
+            index: info
+            for index, info in checkpoint.shards.items()
+            if (output_dir / info.file).is_file()
+        }
+        logger.info("Resuming dataset export shards_done=%s", len(checkpoint.shards))
+
+    max_in_flight = max(1, workers) * 2
+    in_flight: set[Future] = set()
+
+    def collect(done: set[Future]) -> None:
+        for future in done:
+            info = future.result()
+            checkpoint.shards[info.index] = info
+            checkpoint.save(checkpoint_path)
+            logger.info("Shard written index=%s samples=%s", info.index, info.samples)
+
+    with ProcessPoolExecutor(max_workers=max(1, workers)) as pool:
+        for index, samples in iter_shards(options):
+            if index in checkpoint.shards:
+                continue
+            if len(in_flight) >= max_in_flight:
+                done, in_flight = wait(in_flight, return_when=FIRST_COMPLETED)
+                collect(done)
+            in_flight.add(pool.submit(write_shard, str(output_dir), index, samples))
+        done, _ = wait(in_flight)
+        collect(done)
+
+    shards = [asdict(info) for _, info in sorted(checkpoint.shards.items())]
+    manifest = {
+        "format": FORMAT,
+        "created_at": datetime.now(timezone.utc).isoformat(),
+        "options": checkpoint.options,
+        "shards": shards,
+        "samples": sum(shard["samples"] for shard in shards),
+        "missing": sum(len(shard["missing"]) for shard in shards),
+    }
+    _atomic_write(output_dir / MANIFEST_FILE, json.dumps(manifest, indent=2))
+    return manifest
+
+
+def _parse_time(value: str | None) -> datetime | None:
+    return datetime.fromisoformat(value) if value else None
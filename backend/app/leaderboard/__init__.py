@@ -0,0 +1 @@
+"""Ranked contribution leaderboards kept in Redis sorted sets."""
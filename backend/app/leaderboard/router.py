@@ -0,0 +1,47 @@
+import logging
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+
+from app.auth.dependencies import get_current_user
+from app.core.redis import RedisError
+from app.leaderboard import service
+from app.models import User
+from app.schemas.leaderboard import LeaderboardEntry, LeaderboardPosition, LeaderboardResponse
+
+router = APIRouter(prefix="/leaderboard", tags=["leaderboard"])
+logger = logging.getLogger(__name__)
+
+
+@router.get("/", response_model=LeaderboardResponse, summary="Top contributors")
+def get_leaderboard(
+    task_id: int | None = Query(None, description="Per-task board; global when omitted."),
+    limit: int = Query(10, ge=1, le=100),
+) -> LeaderboardResponse:
+    try:
+        entries = service.top(limit, task_id)
+    except RedisError as exc:
+        logger.warning("Leaderboard unavailable: %s", exc)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Leaderboard unavailable") from exc
+    return LeaderboardResponse(
+        task_id=task_id,
+        entries=[LeaderboardEntry.model_validate(entry) for entry in entries],
+    )
+
+
+@router.get("/me", response_model=LeaderboardPosition, summary="Current user's rank and neighbours")
+def get_my_position(
+    task_id: int | None = Query(None, description="Per-task board; global when omitted."),
+    radius: int = Query(5, ge=0, le=50, description="Entries to include on each side."),
+    user: User = Depends(get_current_user),
+) -> LeaderboardPosition:
+    try:
+        entry = service.rank_of(user.id, task_id)
+        window = service.around(user.id, radius, task_id) if entry is not None else []
+    except RedisError as exc:
+        logger.warning("Leaderboard unavailable: %s", exc)
+        raise HTTPException(status_code=status.HTTP_503_SERVICE_UNAVAILABLE, detail="Leaderboard unavailable") from exc
+    return LeaderboardPosition(
+        task_id=task_id,
+        entry=LeaderboardEntry.model_validate(entry) if entry is not None else None,
+        window=[LeaderboardEntry.model_validate(item) for item in window],
+    )
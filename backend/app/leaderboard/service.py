@@ -0,0 +1,174 @@
+"""
+Leaderboards on Redis sorted sets.
+
+Two kinds of board are kept:
+
+- global: every user scored by their total contribution;
+- per task: every user scored by their best single session on that task.
+
+Both are written with ``ZADD ... GT`` using absolute values taken from the
+contribution ledger, so updates are idempotent and tolerate reordering.
+Rank, top-K and window-around-me lookups are O(log n + k). The ledger is the
+source of truth: ``rebuild`` reloads every board from it (on startup, and
+whenever Redis has lost data), building into temporary keys and swapping
+them in with ``RENAME`` so readers never see a half-built board. An entry
+published while a rebuild runs can be lost from the board until the user's
+next contribution or the next rebuild.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass
+import logging
+from typing import Any
+import uuid
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.core.database import SessionLocal
+from app.core.redis import get_redis
+from app.models import ContributionEntry, UserContribution
+
+logger = logging.getLogger(__name__)
+
+KEY_PREFIX = "axis:leaderboard:"
+GLOBAL_KEY = KEY_PREFIX + "global"
+REBUILD_LOCK_KEY = KEY_PREFIX + "rebuild-lock"
+REBUILD_LOCK_SECONDS = 300
+REBUILD_BATCH_SIZE = 5_000
+
+
+@dataclass(frozen=True)
+class RankedEntry:
+    rank: int
+    user_id: str
+    score: float
+
+
+def board_key(task_id: int | None = None) -> str:
+    return GLOBAL_KEY if task_id is None else f"{KEY_PREFIX}task:{task_id}"
+
+
+def top(limit: int, task_id: int | None = None) -> list[RankedEntry]:
+    items = get_redis().zrevrange(board_key(task_id), 0, limit - 1, withscores=True)
+    return _ranked(items, first_rank=1)
+
+
+def rank_of(user_id: str, task_id: int | None = None) -> RankedEntry | None:
+    key = board_key(task_id)
+    client = get_redis()
+    rank = client.zrevrank(key, user_id)
+    if rank is None:
+        return None
+    score = client.zscore(key, user_id)
+    return RankedEntry(rank=rank + 1, user_id=user_id, score=float(score or 0.0))
+
+
+def around(user_id: str, radius: int, task_id: int | None = None) -> list[RankedEntry]:
+    """Return the user's entry with up to ``radius`` neighbours on each side."""
+    key = board_key(task_id)
+    client = get_redis()
+    rank = client.zrevrank(key, user_id)
+    if rank is None:
+        return []
+    start = max(rank - radius, 0)
+    items = client.zrevrange(key, start, rank + radius, withscores=True)
+    return _ranked(items, first_rank=start + 1)
+
+
+def publish_contribution(
+    user_id: str,
+    total_contribution: int,
+    amount: int,
+    task_id: int | None = None,
+) -> None:
+    """Push one recorded ledger entry (and the user's new total) to the boards."""
+    with get_redis().pipeline(transaction=False) as pipe:
+        pipe.zadd(GLOBAL_KEY, {user_id: total_contribution}, gt=True)
+        if task_id is not None:
+            pipe.zadd(board_key(task_id), {user_id: amount}, gt=True)
+        pipe.execute()
+
+
+def rebuild(db: Session) -> int:
+    """
+    Reload every board from the ledger. Returns the number of boards built,
+    or -1 when another process holds the rebuild lock.
+    """
+    client = get_redis()
+    token = uuid.uuid4().hex
+    if not client.set(REBUILD_LOCK_KEY, token, ex=REBUILD_LOCK_SECONDS, nx=True):
+        return -1
+    try:
+        suffix = ":rebuild:" + token
+        boards = {GLOBAL_KEY}
+        _load_board(
+            client,
+            GLOBAL_KEY + suffix,
+            db.execute(
+                select(UserContribution.user_id, UserContribution.total_contribution)
+            ).yield_per(REBUILD_BATCH_SIZE),
+        )
+        best_per_task = (
+            select(ContributionEntry.task_id, ContributionEntry.user_id, func.max(ContributionEntry.amount))
+            .where(ContributionEntry.task_id.is_not(None))
+            .group_by(ContributionEntry.task_id, ContributionEntry.user_id)
+            .order_by(ContributionEntry.task_id)
+        )
+        batch: dict[int, dict[str, float]] = {}
+        pending = 0
+        for task_id, user_id, best in db.execute(best_per_task).yield_per(REBUILD_BATCH_SIZE):
+            boards.add(board_key(task_id))
+            batch.setdefault(task_id, {})[user_id] = best
+            pending += 1
+            if pending >= REBUILD_BATCH_SIZE:
+                _flush_task_batch(client, batch, suffix)
+                batch, pending = {}, 0
+        _flush_task_batch(client, batch, suffix)
+
+        with client.pipeline() as pipe:
+            for key in boards:
+                if client.zcard(key + suffix):
+                    pipe.rename(key + suffix, key)
+                else:
+                    pipe.delete(key)
+            pipe.execute()
+        logger.info("Leaderboards rebuilt boards=%s", len(boards))
+        return len(boards)
+    finally:
+        if client.get(REBUILD_LOCK_KEY) == token.encode():
+            client.delete(REBUILD_LOCK_KEY)
+
+
+def rebuild_from_ledger() -> int:
+    with SessionLocal() as db:
+        return rebuild(db)
+
+
+def _load_board(client: Any, key: str, rows: Iterable[tuple[str, float]]) -> None:
+    mapping: dict[str, float] = {}
+    for user_id, score in rows:
+        mapping[user_id] = score
+        if len(mapping) >= REBUILD_BATCH_SIZE:
+            client.zadd(key, mapping)
+            mapping = {}
+    if mapping:
+        client.zadd(key, mapping)
+
+
+def _flush_task_batch(client: Any, batch: dict[int, dict[str, float]], suffix: str) -> None:
+    if not batch:
+        return
+    with client.pipeline(transaction=False) as pipe:
+        for task_id, mapping in batch.items():
+            pipe.zadd(board_key(task_id) + suffix, mapping)
+        pipe.execute()
+
+
+def _ranked(items: list[tuple[bytes, float]], first_rank: int) -> list[RankedEntry]:
+    return [
+        RankedEntry(rank=first_rank + offset, user_id=member.decode(), score=float(score))
+        for offset, (member, score) in enumerate(items)
+    ]
@@ -1,10 +1,25 @@
-from fastapi import FastAPI
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+import logging
+import time
+
+from fastapi import Depends, FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
 from app.core.logging_config import configure_logging
+from app.core.metrics import MetricsMiddleware, render_metrics, slow_request_report
+from app.core.startup import mark_imported, mark_ready, preload_heavy_modules, startup_report
+from app.admin.stats import admin_stats
+from app.leaderboard.service import rebuild_from_ledger
+from app.services.session_sweeper import session_sweeper
+from app.scoring.pipeline import shutdown_scoring_backend
 from app.admin.router import router as admin_router
+from app.auth.dependencies import require_admin
 from app.auth.router import router as auth_router
+from app.leaderboard.router import router as leaderboard_router
 from app.sessions.router import router as sessions_router
 from app.tasks.router import router as tasks_router
 from app.taskdetail.router import router as task_detail_router
@@ -14,12 +29,35 @@ configure_logging()
 
 API_PREFIX = "/api"
 
+logger = logging.getLogger(__name__)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncIterator[None]:
+    started = time.perf_counter()
+    if not settings.lazy_imports:
+        await run_in_threadpool(preload_heavy_modules)
+    if settings.leaderboard_rebuild_on_startup:
+        try:
+            await run_in_threadpool(rebuild_from_ledger)
+        except Exception:
+            # Boards fill in again as contributions arrive; do not block startup.
+            logger.exception("Leaderboard rebuild failed")
+    admin_stats.start()
+    session_sweeper.start()
+    mark_ready(started)
+    yield
+    await session_sweeper.stop()
+    await admin_stats.stop()
+    shutdown_scoring_backend()
+
 
 def create_app() -> FastAPI:
     app = FastAPI(
         title=settings.app_name,
         debug=settings.debug,
         version="0.1.0",
+        lifespan=lifespan,
     )
 
     # Parse CORS origins from config (supports both list and comma-separated string)
@@ -34,20 +72,44 @@ def create_app() -> FastAPI:
         allow_methods=["*"],
         allow_headers=["*"],
     )
+    if settings.metrics_enabled:
+        # Added last so it wraps CORS and times the whole request.
+        app.add_middleware(
+            MetricsMiddleware,
+            slow_request_seconds=settings.slow_request_seconds,
+            profile_sample_rate=settings.profile_sample_rate,
+        )
 
     @app.get("/health", tags=["health"])
     def health_check() -> dict[str, str]:
         return {"status": "ok"}
 
+    @app.get("/health/startup", tags=["health"])
+    def startup_health() -> dict:
+        return startup_report.as_dict()
+
+    if settings.metrics_enabled:
+
+        @app.get("/metrics", include_in_schema=False, response_class=PlainTextResponse)
+        def metrics() -> PlainTextResponse:
+            return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4")
+
+        # Profiles expose code paths and request data; admins only.
+        @app.get("/metrics/slow-requests", include_in_schema=False, dependencies=[Depends(require_admin)])
+        def slow_requests() -> list[dict]:
+            return slow_request_report()
+
     app.include_router(auth_router, prefix=API_PREFIX)
     app.include_router(admin_router, prefix=API_PREFIX)
     app.include_router(tasks_router, prefix=API_PREFIX)
     app.include_router(task_detail_router, prefix=API_PREFIX)
     app.include_router(sessions_router, prefix=API_PREFIX)
     app.include_router(users_router, prefix=API_PREFIX)
+    app.include_router(leaderboard_router, prefix=API_PREFIX)
 
     return app
 
 
 app = create_app()
+mark_imported()
 
@@ -0,0 +1,37 @@
+"""add task type and catalog indexes
+
+Revision ID: c3f1a9d27e40
+Revises: b6450813a61e
+Create Date: 2026-10-17 10:12:04.517233
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f1a9d27e40'
+down_revision: Union[str, Sequence[str], None] = 'b6450813a61e'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'tasks',
+        sa.Column('task_type', sa.String(length=50), server_default='manipulation', nullable=False),
+    )
+    op.create_index('ix_tasks_difficulty_id', 'tasks', ['difficulty', 'id'], unique=False)
+    op.create_index('ix_tasks_task_type_id', 'tasks', ['task_type', 'id'], unique=False)
+    op.create_index('ix_tasks_expected_duration_id', 'tasks', ['expected_duration', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_tasks_expected_duration_id', table_name='tasks')
+    op.drop_index('ix_tasks_task_type_id', table_name='tasks')
+    op.drop_index('ix_tasks_difficulty_id', table_name='tasks')
+    op.drop_column('tasks', 'task_type')
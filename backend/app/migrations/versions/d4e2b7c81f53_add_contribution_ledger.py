@@ -0,0 +1,58 @@
+"""add contribution ledger
+
+Revision ID: d4e2b7c81f53
+Revises: c3f1a9d27e40
+Create Date: 2026-10-17 14:03:51.208114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4e2b7c81f53'
+down_revision: Union[str, Sequence[str], None] = 'c3f1a9d27e40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'contribution_ledger',
+        sa.Column('id', sa.BigInteger().with_variant(sa.Integer(), 'sqlite'), autoincrement=True, nullable=False),
+        sa.Column('user_id', sa.String(length=64), nullable=False),
+        sa.Column('session_id', sa.String(length=64), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=True),
+        sa.Column('amount', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('session_id'),
+    )
+    op.create_index(
+        'ix_contribution_ledger_user_id_created_at',
+        'contribution_ledger',
+        ['user_id', 'created_at'],
+        unique=False,
+    )
+    op.create_table(
+        'user_contributions',
+        sa.Column('user_id', sa.String(length=64), nullable=False),
+        sa.Column('total_contribution', sa.BigInteger(), nullable=False),
+        sa.Column('sessions_count', sa.Integer(), nullable=False),
+        sa.Column('last_contribution_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('user_id'),
+    )
+    # Backfill is unnecessary: no contributions were persisted before this revision.
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_table('user_contributions')
+    op.drop_index('ix_contribution_ledger_user_id_created_at', table_name='contribution_ledger')
+    op.drop_table('contribution_ledger')
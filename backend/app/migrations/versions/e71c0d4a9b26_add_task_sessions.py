@@ -0,0 +1,48 @@
+"""add task sessions
+
+Revision ID: e71c0d4a9b26
+Revises: d4e2b7c81f53
+Create Date: 2026-10-17 15:21:40.884302
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e71c0d4a9b26'
+down_revision: Union[str, Sequence[str], None] = 'd4e2b7c81f53'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table(
+        'task_sessions',
+        sa.Column('id', sa.String(length=64), nullable=False),
+        sa.Column('user_id', sa.String(length=64), nullable=False),
+        sa.Column('task_id', sa.Integer(), nullable=False),
+        sa.Column('started_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('outcome', sa.String(length=20), nullable=False),
+        sa.Column('contribution', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['task_id'], ['tasks.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        'ix_task_sessions_user_id_started_at',
+        'task_sessions',
+        ['user_id', sa.text('started_at DESC'), sa.text('id DESC')],
+        unique=False,
+        postgresql_include=['task_id', 'outcome', 'contribution', 'completed_at'],
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_task_sessions_user_id_started_at', table_name='task_sessions')
+    op.drop_table('task_sessions')
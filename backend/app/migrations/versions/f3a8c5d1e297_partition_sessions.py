@@ -0,0 +1,86 @@
+"""partition sessions by created_at
+
+Revision ID: f3a8c5d1e297
+Revises: e71c0d4a9b26
+Create Date: 2026-10-17 16:05:12.417730
+
+"""
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3a8c5d1e297'
+down_revision: Union[str, Sequence[str], None] = 'e71c0d4a9b26'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+COLUMNS = "id, user_id, privy_session_id, created_at, expires_at, revoked_at"
+
+
+def _columns() -> list[sa.Column]:
+    return [
+        sa.Column('id', sa.UUID(), nullable=False),
+        sa.Column('user_id', sa.String(length=64), nullable=False),
+        sa.Column('privy_session_id', sa.String(length=128), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('expires_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('revoked_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    ]
+
+
+def _create_daily_partition(day: date) -> None:
+    start = datetime.combine(day, time.min, tzinfo=timezone.utc)
+    op.execute(
+        f"CREATE TABLE sessions_p{day:%Y%m%d} PARTITION OF sessions "
+        f"FOR VALUES FROM ('{start.isoformat()}') TO ('{(start + timedelta(days=1)).isoformat()}')"
+    )
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.rename_table('sessions', 'sessions_legacy')
+    op.execute('ALTER INDEX sessions_pkey RENAME TO sessions_legacy_pkey')
+
+    op.create_table(
+        'sessions',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id', 'created_at'),
+        postgresql_partition_by='RANGE (created_at)',
+    )
+    op.execute('CREATE TABLE sessions_default PARTITION OF sessions DEFAULT')
+    # Yesterday (live sessions last a day) through the sweeper's look-ahead.
+    today = datetime.now(timezone.utc).date()
+    for offset in range(-1, 4):
+        _create_daily_partition(today + timedelta(days=offset))
+
+    op.create_index('ix_sessions_privy_session_id', 'sessions', ['privy_session_id'], unique=False)
+    op.create_index('ix_sessions_user_id', 'sessions', ['user_id'], unique=False)
+    op.create_index('ix_sessions_expires_at', 'sessions', ['expires_at'], unique=False)
+
+    # Expired and revoked rows are dead weight; only live sessions move over.
+    op.execute(
+        f"INSERT INTO sessions ({COLUMNS}) SELECT {COLUMNS} FROM sessions_legacy "
+        "WHERE revoked_at IS NULL AND (expires_at IS NULL OR expires_at > now())"
+    )
+    op.drop_table('sessions_legacy')
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.create_table(
+        'sessions_unpartitioned',
+        *_columns(),
+        sa.PrimaryKeyConstraint('id', name='sessions_unpartitioned_pkey'),
+    )
+    op.execute(
+        f"INSERT INTO sessions_unpartitioned ({COLUMNS}) SELECT {COLUMNS} FROM sessions"
+    )
+    # Dropping the parent drops every partition with it.
+    op.drop_table('sessions')
+    op.rename_table('sessions_unpartitioned', 'sessions')
+    op.execute('ALTER INDEX sessions_unpartitioned_pkey RENAME TO sessions_pkey')
@@ -2,6 +2,15 @@ from .base import Base
 from .task import Task
 from .user import User
 from .session import Session
+from .contribution import ContributionEntry, UserContribution
+from .task_session import TaskSession
 
-__all__ = ["Base", "Task", "User", "Session"]
-
+__all__ = [
+    "Base",
+    "Task",
+    "User",
+    "Session",
+    "ContributionEntry",
+    "UserContribution",
+    "TaskSession",
+]
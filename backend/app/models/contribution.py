@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+# BIGINT ids only autoincrement on SQLite when declared as INTEGER.
+LedgerId = BigInteger().with_variant(Integer(), "sqlite")
+
+
+class ContributionEntry(Base):
+    """Append-only record of contribution earned by one scored session."""
+
+    __tablename__ = "contribution_ledger"
+    __table_args__ = (
+        Index("ix_contribution_ledger_user_id_created_at", "user_id", "created_at"),
+    )
+
+    id: Mapped[int] = mapped_column(LedgerId, primary_key=True, autoincrement=True)
+    user_id: Mapped[str] = mapped_column(
+        String(64), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    # One entry per session keeps re-scoring idempotent.
+    session_id: Mapped[str] = mapped_column(String(64), nullable=False, unique=True)
+    task_id: Mapped[int | None] = mapped_column(Integer, nullable=True)
+    amount: Mapped[int] = mapped_column(Integer, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+
+
+class UserContribution(Base):
+    """Running per-user totals, maintained alongside every ledger insert."""
+
+    __tablename__ = "user_contributions"
+
+    user_id: Mapped[str] = mapped_column(
+        String(64), ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
+    )
+    total_contribution: Mapped[int] = mapped_column(BigInteger, nullable=False, default=0)
+    sessions_count: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    last_contribution_at: Mapped[datetime | None] = mapped_column(
+        DateTime(timezone=True), nullable=True
+    )
+    updated_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
@@ -4,7 +4,7 @@ from datetime import datetime, timedelta, timezone
 import uuid
 from typing import TYPE_CHECKING
 
-from sqlalchemy import DateTime, ForeignKey, String
+from sqlalchemy import DDL, DateTime, ForeignKey, Index, String, event
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
@@ -19,7 +19,19 @@ def default_expires_at() -> datetime:
 
 
 class Session(Base):
+    """
+    Backend login session. On Postgres the table is range-partitioned by
+    ``created_at`` into daily partitions (see ``app.services.session_sweeper``),
+    so ``created_at`` is part of the primary key.
+    """
+
     __tablename__ = "sessions"
+    __table_args__ = (
+        Index("ix_sessions_privy_session_id", "privy_session_id"),
+        Index("ix_sessions_user_id", "user_id"),
+        Index("ix_sessions_expires_at", "expires_at"),
+        {"postgresql_partition_by": "RANGE (created_at)"},
+    )
 
     id: Mapped[uuid.UUID] = mapped_column(
         UUID(as_uuid=True), primary_key=True, default=uuid.uuid4
@@ -29,7 +41,10 @@ class Session(Base):
     )
     privy_session_id: Mapped[str] = mapped_column(String(128), nullable=False)
     created_at: Mapped[datetime] = mapped_column(
-        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+        DateTime(timezone=True),
+        primary_key=True,
+        nullable=False,
+        default=lambda: datetime.now(timezone.utc),
     )
     expires_at: Mapped[datetime | None] = mapped_column(
         DateTime(timezone=True), nullable=True, default=default_expires_at
@@ -37,3 +52,14 @@ class Session(Base):
     revoked_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True))
 
     user: Mapped["User"] = relationship("User", back_populates="sessions")
+
+
+# Rows land here when no daily partition covers them (e.g. maintenance fell
+# behind), so inserts never fail for lack of a partition.
+event.listen(
+    Session.__table__,
+    "after_create",
+    DDL("CREATE TABLE IF NOT EXISTS sessions_default PARTITION OF sessions DEFAULT").execute_if(
+        dialect="postgresql"
+    ),
+)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from sqlalchemy import Float, Integer, String, Text
+from sqlalchemy import Float, Index, Integer, String, Text
 from sqlalchemy.orm import Mapped, mapped_column
 
 from app.models.base import Base
@@ -8,12 +8,20 @@ from app.models.base import Base
 
 class Task(Base):
     __tablename__ = "tasks"
+    __table_args__ = (
+        # Keyset pagination indexes: every filter/sort combination ends in id.
+        Index("ix_tasks_difficulty_id", "difficulty", "id"),
+        Index("ix_tasks_task_type_id", "task_type", "id"),
+        Index("ix_tasks_expected_duration_id", "expected_duration", "id"),
+    )
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(String(200), nullable=False)
     description: Mapped[str] = mapped_column(Text, nullable=False)
     difficulty: Mapped[str] = mapped_column(String(50), nullable=False)
+    task_type: Mapped[str] = mapped_column(
+        String(50), nullable=False, default="manipulation", server_default="manipulation"
+    )
     expected_duration: Mapped[int] = mapped_column(Integer, nullable=False)
     success_rate: Mapped[float] = mapped_column(Float, nullable=False)
     thumbnail: Mapped[str] = mapped_column(String(255), nullable=False)
-
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+
+from sqlalchemy import DateTime, ForeignKey, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from app.models.base import Base
+
+OUTCOME_IN_PROGRESS = "in_progress"
+OUTCOME_SUCCESS = "success"
+OUTCOME_FAILURE = "failure"
+# Scored, but the task has no goal to judge success against.
+OUTCOME_COMPLETED = "completed"
+OUTCOMES = (OUTCOME_IN_PROGRESS, OUTCOME_SUCCESS, OUTCOME_FAILURE, OUTCOME_COMPLETED)
+FINISHED_OUTCOMES = (OUTCOME_SUCCESS, OUTCOME_FAILURE, OUTCOME_COMPLETED)
+
+
+class TaskSession(Base):
+    """One attempt at a task; its id names the session's telemetry directory."""
+
+    __tablename__ = "task_sessions"
+
+    id: Mapped[str] = mapped_column(String(64), primary_key=True)
+    user_id: Mapped[str] = mapped_column(
+        String(64), ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    task_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("tasks.id", ondelete="CASCADE"), nullable=False
+    )
+    started_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True), nullable=False, default=lambda: datetime.now(timezone.utc)
+    )
+    completed_at: Mapped[datetime | None] = mapped_column(DateTime(timezone=True), nullable=True)
+    outcome: Mapped[str] = mapped_column(
+        String(20), nullable=False, default=OUTCOME_IN_PROGRESS
+    )
+    contribution: Mapped[int | None] = mapped_column(Integer, nullable=True)
+
+
+# Serves /me/history: keyset pages walk (started_at, id) downwards within one
+# user, and the INCLUDE columns let Postgres answer from the index alone.
+Index(
+    "ix_task_sessions_user_id_started_at",
+    TaskSession.user_id,
+    TaskSession.started_at.desc(),
+    TaskSession.id.desc(),
+    postgresql_include=["task_id", "outcome", "contribution", "completed_at"],
+)
@@ -1,4 +1,4 @@
-from datetime import datetime
+from datetime import date, datetime
 from pydantic import BaseModel
 
 from app.schemas.task import TaskRead
@@ -19,3 +19,29 @@ class AdminDatabaseOverviewResponse(BaseModel):
     users: list[UserSummary]
     tasks: list[TaskRead]
 
+
+
+class DailyActiveUsers(BaseModel):
+    day: date
+    users: int
+
+
+class TaskStats(BaseModel):
+    task_id: int
+    sessions: int
+    successes: int
+    success_rate: float | None
+    average_contribution: float | None
+
+
+class AdminStatsResponse(BaseModel):
+    computed_at: datetime
+    users: int
+    tasks: int
+    sessions: int
+    completed_sessions: int
+    success_rate: float | None
+    total_contribution: int
+    daily_active_users: int
+    daily_active_history: list[DailyActiveUsers]
+    per_task: list[TaskStats]
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+
+
+class LeaderboardEntry(BaseModel):
+    rank: int
+    user_id: str
+    score: float
+
+    class Config:
+        from_attributes = True
+
+
+class LeaderboardResponse(BaseModel):
+    task_id: int | None
+    entries: list[LeaderboardEntry]
+
+
+class LeaderboardPosition(BaseModel):
+    task_id: int | None
+    entry: LeaderboardEntry | None
+    window: list[LeaderboardEntry]
@@ -0,0 +1,11 @@
+from typing import Any
+
+from pydantic import BaseModel
+
+
+class ScoringJobResponse(BaseModel):
+    job_id: str
+    session_id: str | None
+    status: str
+    result: dict[str, Any] | None = None
+    error: str | None = None
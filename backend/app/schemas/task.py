@@ -6,6 +6,7 @@ class TaskRead(BaseModel):
     name: str
     description: str
     difficulty: str
+    task_type: str
     expected_duration: int
     success_rate: float
     thumbnail: str
@@ -16,4 +17,4 @@ class TaskRead(BaseModel):
 
 class TaskListResponse(BaseModel):
     tasks: list[TaskRead]
-
+    next_cursor: str | None = None
@@ -0,0 +1,20 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class TaskSessionRead(BaseModel):
+    id: str
+    task_id: int
+    started_at: datetime
+    completed_at: datetime | None
+    outcome: str
+    contribution: int | None
+
+    class Config:
+        from_attributes = True
+
+
+class TaskSessionHistoryResponse(BaseModel):
+    sessions: list[TaskSessionRead]
+    next_cursor: str | None = None
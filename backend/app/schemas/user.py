@@ -0,0 +1,18 @@
+from datetime import datetime
+
+from pydantic import BaseModel
+
+
+class UserProfile(BaseModel):
+    id: str
+    email: str | None
+    default_wallet_address: str | None
+    created_at: datetime
+    total_contribution: int = 0
+    sessions_count: int = 0
+    level: int = 1
+    next_level_at: int | None = None
+    to_next_level: int | None = None
+
+    class Config:
+        from_attributes = True
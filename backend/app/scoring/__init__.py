@@ -0,0 +1 @@
+"""ERM scoring engine and contribution mapping."""
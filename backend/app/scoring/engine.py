@@ -0,0 +1,205 @@
+"""
+Simplified ERM scoring.
+
+Trajectories are scored column-wise: a batch of N trajectories is flattened
+into one contiguous array, finite differences are taken across the whole
+array, samples that straddle two trajectories are masked out and per-run
+totals are gathered with ``np.bincount``. No Python code runs per frame.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+from dataclasses import asdict, dataclass
+import math
+
+import numpy as np
+
+MIN_DT = 1e-3
+
+
+@dataclass(frozen=True)
+class Trajectory:
+    t: np.ndarray
+    state: np.ndarray
+    action: np.ndarray
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> "Trajectory":
+        return cls(
+            t=np.ascontiguousarray(records["t"], dtype=np.float64),
+            state=np.ascontiguousarray(records["state"]),
+            action=np.ascontiguousarray(records["action"]),
+        )
+
+    @classmethod
+    def from_columns(cls, columns: dict[str, np.ndarray]) -> "Trajectory":
+        """Wrap stored field arrays; they are already contiguous, so nothing is copied."""
+        return cls(
+            t=np.ascontiguousarray(columns["t"], dtype=np.float64),
+            state=np.ascontiguousarray(columns["state"]),
+            action=np.ascontiguousarray(columns["action"]),
+        )
+
+    def __len__(self) -> int:
+        return len(self.t)
+
+
+@dataclass(frozen=True)
+class ScoringConfig:
+    idle_threshold: float = 1e-3
+    success_radius: float = 0.05
+    points_per_minute: float = 10.0
+    max_scored_seconds: float = 600.0
+    success_multiplier: float = 1.5
+
+
+@dataclass
+class TrajectoryScore:
+    frames: int
+    duration: float
+    path_length: float
+    path_smoothness: float | None
+    jerk_rms: float | None
+    idle_ratio: float
+    time_to_success: float | None
+    distance_to_goal: float | None
+    success: bool
+    contribution: int
+
+    def to_dict(self) -> dict[str, float | int | bool | None]:
+        return asdict(self)
+
+
+def score_trajectory(
+    trajectory: Trajectory,
+    goal: np.ndarray | None = None,
+    config: ScoringConfig = ScoringConfig(),
+) -> TrajectoryScore:
+    return score_batch([trajectory], goals=[goal], config=config)[0]
+
+
+def score_batch(
+    trajectories: Sequence[Trajectory],
+    goals: Sequence[np.ndarray | None] | None = None,
+    config: ScoringConfig = ScoringConfig(),
+) -> list[TrajectoryScore]:
+    """
+    Score many trajectories in one vectorized pass.
+
+    ``goals`` holds one optional target per trajectory, compared against the
+    leading state channels. All trajectories must share a state dimension.
+    """
+    count = len(trajectories)
+    if count == 0:
+        return []
+    if goals is None:
+        goals = [None] * count
+    if len(goals) != count:
+        raise ValueError("goals must contain one entry per trajectory")
+
+    lengths = np.fromiter((len(traj) for traj in trajectories), dtype=np.int64, count=count)
+    if (lengths == 0).any():
+        raise ValueError("Cannot score an empty trajectory")
+    ids = np.repeat(np.arange(count), lengths)
+    t = np.concatenate([traj.t for traj in trajectories]).astype(np.float64, copy=False)
+    position = np.concatenate([traj.state for traj in trajectories]).astype(np.float64, copy=False)
+    action = np.concatenate([traj.action for traj in trajectories]).astype(np.float64, copy=False)
+
+    def per_run(values: np.ndarray, sample_ids: np.ndarray) -> np.ndarray:
+        return np.bincount(sample_ids, weights=values, minlength=count)
+
+    # Finite differences across the flattened batch; masks drop the samples
+    # that span the boundary between two runs.
+    dt = np.maximum(np.diff(t), MIN_DT)
+    valid1 = ids[1:] == ids[:-1]
+    step = np.diff(position, axis=0)
+    velocity = step / dt[:, None]
+    acceleration = np.diff(velocity, axis=0) / dt[1:, None]
+    valid2 = valid1[1:] & valid1[:-1]
+    jerk = np.diff(acceleration, axis=0) / dt[2:, None]
+    valid3 = valid2[1:] & valid2[:-1]
+
+    ids1, ids3 = ids[1:], ids[3:]
+    starts = np.concatenate(([0], np.cumsum(lengths)[:-1]))
+    ends = starts + lengths - 1
+    duration = t[ends] - t[starts]
+
+    step_length = np.linalg.norm(step, axis=1) * valid1
+    path_length = per_run(step_length, ids1)
+
+    speed = np.linalg.norm(velocity, axis=1) * valid1
+    peak_speed = np.zeros(count)
+    np.maximum.at(peak_speed, ids1, speed)
+
+    jerk_sq = np.einsum("ij,ij->i", jerk, jerk) * valid3
+    jerk_samples = per_run(valid3.astype(np.float64), ids3)
+    jerk_integral = per_run(jerk_sq * dt[2:], ids3)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        jerk_rms = np.sqrt(per_run(jerk_sq, ids3) / jerk_samples)
+        # Log dimensionless jerk: higher (closer to zero) means smoother.
+        smoothness = -np.log(duration**3 / peak_speed**2 * jerk_integral)
+
+    if action.shape[1]:
+        activity = np.linalg.norm(action[1:], axis=1)
+    else:
+        activity = speed
+    idle_time = per_run((activity < config.idle_threshold) * dt * valid1, ids1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        idle_ratio = np.where(duration > 0, idle_time / per_run(dt * valid1, ids1), 1.0)
+
+    distance_to_goal = np.full(count, np.nan)
+    time_to_success = np.full(count, np.nan)
+    goal_rows = [index for index, goal in enumerate(goals) if goal is not None]
+    if goal_rows:
+        goal_dim = len(np.asarray(goals[goal_rows[0]]))
+        targets = np.full((count, goal_dim), np.nan)
+        for index in goal_rows:
+            targets[index] = np.asarray(goals[index], dtype=np.float64)
+        distance = np.linalg.norm(position[:, :goal_dim] - targets[ids], axis=1)
+        distance_to_goal = distance[ends]
+        reached = np.flatnonzero(distance <= config.success_radius)
+        first_hit = np.full(count, len(t))
+        np.minimum.at(first_hit, ids[reached], reached)
+        hit = first_hit < len(t)
+        time_to_success[hit] = t[first_hit[hit]] - t[starts[hit]]
+
+    success = np.isfinite(time_to_success)
+    contribution = _contribution(duration, idle_ratio, smoothness, success, config)
+
+    return [
+        TrajectoryScore(
+            frames=int(lengths[index]),
+            duration=float(duration[index]),
+            path_length=float(path_length[index]),
+            path_smoothness=_optional(smoothness[index]),
+            jerk_rms=_optional(jerk_rms[index]),
+            idle_ratio=float(idle_ratio[index]),
+            time_to_success=_optional(time_to_success[index]),
+            distance_to_goal=_optional(distance_to_goal[index]),
+            success=bool(success[index]),
+            contribution=int(contribution[index]),
+        )
+        for index in range(count)
+    ]
+
+
+def _contribution(
+    duration: np.ndarray,
+    idle_ratio: np.ndarray,
+    smoothness: np.ndarray,
+    success: np.ndarray,
+    config: ScoringConfig,
+) -> np.ndarray:
+    """Map metrics to contribution points: active, smooth minutes earn the most."""
+    minutes = np.minimum(duration, config.max_scored_seconds) / 60.0
+    smoothness = np.nan_to_num(smoothness, nan=-20.0, posinf=0.0, neginf=-20.0)
+    smooth_factor = np.clip((smoothness + 20.0) / 15.0, 0.2, 1.0)
+    quality = (1.0 - idle_ratio) * smooth_factor
+    points = minutes * config.points_per_minute * quality
+    points = np.where(success, points * config.success_multiplier, points)
+    return np.rint(points).astype(np.int64)
+
+
+def _optional(value: float) -> float | None:
+    return float(value) if math.isfinite(value) else None
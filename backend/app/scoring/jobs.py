@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import logging
+from typing import Any
+
+from app.scoring.engine import Trajectory, TrajectoryScore, score_trajectory
+from app.telemetry.store import finalize_session
+
+logger = logging.getLogger(__name__)
+
+
+def init_worker_process() -> None:
+    """
+    Drop connections inherited from the parent across ``fork``; the child
+    opens its own on first use.
+    """
+    from app.core.database import engine
+
+    engine.dispose(close=False)
+
+
+def score_session_job(session_id: str, user_id: str | None = None) -> dict[str, Any]:
+    """
+    Score one session's recorded telemetry.
+
+    Runs inside a worker (Celery or a pool process), so it only takes and
+    returns plain picklable/JSON-able values. The session's segments are
+    first folded into the columnar trajectory store. With a ``user_id`` the score is
+    also written to the contribution ledger before the job reports success,
+    so ``/me`` reflects it as soon as the client sees the result.
+    """
+    score = score_trajectory(Trajectory.from_columns(finalize_session(session_id).fields))
+    result: dict[str, Any] = {"session_id": session_id, **score.to_dict()}
+    if user_id is not None:
+        result.update(_record(user_id, session_id, score))
+    return result
+
+
+def _record(user_id: str, session_id: str, score: TrajectoryScore) -> dict[str, Any]:
+    from app.core.database import SessionLocal
+    from app.models import TaskSession
+    from app.models.task_session import OUTCOME_COMPLETED, OUTCOME_FAILURE, OUTCOME_SUCCESS
+    from app.services.contributions import level_for, record_contribution
+
+    with SessionLocal() as db:
+        task_session = db.get(TaskSession, session_id)
+        task_id = None
+        if task_session is not None and task_session.user_id == user_id:
+            task_id = task_session.task_id
+            if score.distance_to_goal is None:
+                # No goal was evaluated, so ``score.success`` says nothing.
+                task_session.outcome = OUTCOME_COMPLETED
+            else:
+                task_session.outcome = OUTCOME_SUCCESS if score.success else OUTCOME_FAILURE
+            task_session.contribution = score.contribution
+            # Re-scoring keeps the first completion time; dataset exports window on it.
+            if task_session.completed_at is None:
+                task_session.completed_at = datetime.now(timezone.utc)
+        recorded = record_contribution(
+            db,
+            user_id=user_id,
+            session_id=session_id,
+            amount=score.contribution,
+            task_id=task_id,
+        )
+        db.commit()
+    progress = level_for(recorded.total_contribution)
+    return {
+        "user_id": user_id,
+        "task_id": task_id,
+        "recorded": recorded.recorded,
+        "total_contribution": recorded.total_contribution,
+        "level": progress.level,
+        "to_next_level": progress.to_next_level,
+    }
+
+
+def publish_job_result(result: dict[str, Any]) -> None:
+    """
+    Push a newly recorded contribution to the leaderboards. Runs where Redis
+    is shared: in the Celery worker, or in the API process for the process
+    pool backend. Failures are only logged; the next rebuild catches up.
+    """
+    if not result.get("recorded"):
+        return
+    from app.core.redis import RedisError
+    from app.leaderboard.service import publish_contribution
+
+    try:
+        publish_contribution(
+            result["user_id"],
+            result["total_contribution"],
+            result["contribution"],
+            task_id=result.get("task_id"),
+        )
+    except RedisError:
+        logger.warning("Leaderboard update failed session_id=%s", result["session_id"])
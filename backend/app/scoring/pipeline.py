@@ -0,0 +1,214 @@
+"""
+Scoring job backends.
+
+``complete_session`` hands the session to a backend and returns straight
+away; clients then poll (or long-poll) for the job state. Two backends share
+one interface:
+
+- ``process``: an in-process ``ProcessPoolExecutor``. Needs no broker, so it
+  is the default for development and tests. Job state lives in the API
+  process, so it only suits a single API worker.
+- ``celery``: tasks go through Redis to ``app.scoring.worker``.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from dataclasses import dataclass, field
+from functools import lru_cache
+import threading
+from typing import Any
+import uuid
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+
+QUEUED = "queued"
+RUNNING = "running"
+SUCCEEDED = "succeeded"
+FAILED = "failed"
+
+MAX_TRACKED_JOBS = 10_000
+
+
+@dataclass
+class JobState:
+    job_id: str
+    status: str
+    session_id: str | None = None
+    result: dict[str, Any] | None = None
+    error: str | None = None
+
+    @property
+    def done(self) -> bool:
+        return self.status in (SUCCEEDED, FAILED)
+
+
+class UnknownJobError(KeyError):
+    """Raised when a job id is not known to the backend."""
+
+
+class ScoringBackend:
+    def submit(self, session_id: str, user_id: str | None = None) -> JobState:
+        """Queue scoring; with ``user_id`` the result is also credited to that user."""
+        raise NotImplementedError
+
+    def status(self, job_id: str) -> JobState:
+        raise NotImplementedError
+
+    async def wait(self, job_id: str, timeout: float) -> JobState:
+        """Return the job state once it finishes or ``timeout`` seconds pass."""
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+@dataclass
+class _TrackedJob:
+    session_id: str
+    future: Future = field(repr=False)
+
+
+class ProcessPoolBackend(ScoringBackend):
+    def __init__(self, max_workers: int) -> None:
+        self.max_workers = max_workers
+        self._executor: ProcessPoolExecutor | None = None
+        self._jobs: OrderedDict[str, _TrackedJob] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            from app.scoring.jobs import init_worker_process
+
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, initializer=init_worker_process
+            )
+        return self._executor
+
+    def submit(self, session_id: str, user_id: str | None = None) -> JobState:
+        # Imported on first use: the scoring stack pulls in NumPy.
+        from app.scoring.jobs import score_session_job
+
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            future = self._get_executor().submit(score_session_job, session_id, user_id)
+            future.add_done_callback(_publish_from_future)
+            self._jobs[job_id] = _TrackedJob(session_id=session_id, future=future)
+            while len(self._jobs) > MAX_TRACKED_JOBS:
+                self._jobs.popitem(last=False)
+        return self._state(job_id, self._jobs[job_id])
+
+    def status(self, job_id: str) -> JobState:
+        return self._state(job_id, self._get_job(job_id))
+
+    async def wait(self, job_id: str, timeout: float) -> JobState:
+        job = self._get_job(job_id)
+        if not job.future.done() and timeout > 0:
+            try:
+                await asyncio.wait_for(asyncio.shield(asyncio.wrap_future(job.future)), timeout)
+            except asyncio.TimeoutError:
+                pass
+            except Exception:
+                # Failures are reported through the job state below.
+                pass
+        return self._state(job_id, job)
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    def _get_job(self, job_id: str) -> _TrackedJob:
+        try:
+            return self._jobs[job_id]
+        except KeyError as exc:
+            raise UnknownJobError(job_id) from exc
+
+    @staticmethod
+    def _state(job_id: str, job: _TrackedJob) -> JobState:
+        future = job.future
+        if future.running():
+            return JobState(job_id, RUNNING, job.session_id)
+        if not future.done():
+            return JobState(job_id, QUEUED, job.session_id)
+        if future.cancelled():
+            return JobState(job_id, FAILED, job.session_id, error="cancelled")
+        error = future.exception()
+        if error is not None:
+            return JobState(job_id, FAILED, job.session_id, error=str(error) or type(error).__name__)
+        return JobState(job_id, SUCCEEDED, job.session_id, result=future.result())
+
+
+def _publish_from_future(future: Future) -> None:
+    # Pool children do not share the API process's Redis client (or its
+    # in-memory stand-in), so leaderboard updates are applied here.
+    if not future.cancelled() and future.exception() is None:
+        from app.scoring.jobs import publish_job_result
+
+        publish_job_result(future.result())
+
+
+class CeleryBackend(ScoringBackend):
+    POLL_INTERVAL = 0.1
+    MAX_POLL_INTERVAL = 1.0
+
+    _STATUS_MAP = {
+        "PENDING": QUEUED,
+        "RECEIVED": QUEUED,
+        "RETRY": QUEUED,
+        "STARTED": RUNNING,
+        "SUCCESS": SUCCEEDED,
+        "FAILURE": FAILED,
+        "REVOKED": FAILED,
+    }
+
+    def __init__(self) -> None:
+        from app.scoring.worker import SCORE_SESSION_TASK, celery_app
+
+        self._app = celery_app
+        self._task_name = SCORE_SESSION_TASK
+
+    def submit(self, session_id: str, user_id: str | None = None) -> JobState:
+        job_id = uuid.uuid4().hex
+        self._app.send_task(self._task_name, args=[session_id, user_id], task_id=job_id)
+        return JobState(job_id, QUEUED, session_id)
+
+    def status(self, job_id: str) -> JobState:
+        result = self._app.AsyncResult(job_id)
+        status = self._STATUS_MAP.get(result.state, QUEUED)
+        if status == SUCCEEDED:
+            payload = result.result
+            return JobState(job_id, status, payload.get("session_id"), result=payload)
+        if status == FAILED:
+            return JobState(job_id, status, error=str(result.result))
+        return JobState(job_id, status)
+
+    async def wait(self, job_id: str, timeout: float) -> JobState:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        interval = self.POLL_INTERVAL
+        while True:
+            state = await run_in_threadpool(self.status, job_id)
+            remaining = deadline - loop.time()
+            if state.done or remaining <= 0:
+                return state
+            await asyncio.sleep(min(interval, remaining))
+            interval = min(interval * 2, self.MAX_POLL_INTERVAL)
+
+
+@lru_cache
+def get_scoring_backend() -> ScoringBackend:
+    if settings.scoring_backend == "celery":
+        return CeleryBackend()
+    if settings.scoring_backend == "process":
+        return ProcessPoolBackend(max_workers=settings.scoring_workers)
+    raise RuntimeError(f"Unknown scoring backend {settings.scoring_backend!r}")
+
+
+def shutdown_scoring_backend() -> None:
+    if get_scoring_backend.cache_info().currsize:
+        get_scoring_backend().shutdown()
@@ -0,0 +1,36 @@
+"""
+Celery application for scoring jobs.
+
+Start a worker with ``celery -A app.scoring.worker worker --loglevel=INFO``.
+"""
+
+from celery import Celery
+from celery.signals import worker_process_init
+
+from app.core.config import settings
+from app.scoring.jobs import init_worker_process, publish_job_result, score_session_job
+
+SCORE_SESSION_TASK = "scoring.score_session"
+
+celery_app = Celery("axis", broker=settings.redis_url, backend=settings.redis_url)
+celery_app.conf.update(
+    task_serializer="json",
+    result_serializer="json",
+    accept_content=["json"],
+    task_track_started=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    result_expires=settings.scoring_result_ttl_seconds,
+)
+
+
+@worker_process_init.connect
+def _reset_db_connections(**_: object) -> None:
+    init_worker_process()
+
+
+@celery_app.task(name=SCORE_SESSION_TASK)
+def score_session_task(session_id: str, user_id: str | None = None) -> dict:
+    result = score_session_job(session_id, user_id)
+    publish_job_result(result)
+    return result
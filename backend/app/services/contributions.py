@@ -0,0 +1,108 @@
+"""
+Contribution ledger.
+
+Every scored session appends one row to ``contribution_ledger`` and, in the
+same transaction, folds its amount into the user's ``user_contributions``
+row with an upsert. Totals are therefore never summed at read time: ``/me``
+and the result page read one row by primary key, however many sessions the
+user has played. The ledger's unique ``session_id`` makes recording
+idempotent, so a re-scored or retried session is never counted twice.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_right
+from dataclasses import dataclass
+from datetime import datetime, timezone
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.core.database import dialect_insert
+from app.models import ContributionEntry, UserContribution
+
+# Minimum total contribution for each level; level 1 starts at zero.
+LEVEL_THRESHOLDS = (0, 100, 300, 700, 1_500, 3_000, 6_000, 12_000, 25_000, 50_000)
+
+
+@dataclass(frozen=True)
+class LevelProgress:
+    level: int
+    next_level_at: int | None
+    to_next_level: int | None
+
+
+@dataclass(frozen=True)
+class RecordedContribution:
+    recorded: bool
+    total_contribution: int
+    sessions_count: int
+
+
+def level_for(total: int) -> LevelProgress:
+    level = max(1, bisect_right(LEVEL_THRESHOLDS, total))
+    if level >= len(LEVEL_THRESHOLDS):
+        return LevelProgress(level=level, next_level_at=None, to_next_level=None)
+    next_level_at = LEVEL_THRESHOLDS[level]
+    return LevelProgress(level=level, next_level_at=next_level_at, to_next_level=next_level_at - total)
+
+
+def record_contribution(
+    db: Session,
+    *,
+    user_id: str,
+    session_id: str,
+    amount: int,
+    task_id: int | None = None,
+) -> RecordedContribution:
+    """
+    Append the session's ledger entry and update the user's totals.
+
+    The caller owns the transaction and must commit. Recording the same
+    ``session_id`` again leaves both tables untouched.
+    """
+    insert = dialect_insert(db)
+    now = datetime.now(timezone.utc)
+
+    entry_id = db.scalar(
+        insert(ContributionEntry)
+        .values(
+            user_id=user_id,
+            session_id=session_id,
+            task_id=task_id,
+            amount=amount,
+            created_at=now,
+        )
+        .on_conflict_do_nothing(index_elements=["session_id"])
+        .returning(ContributionEntry.id)
+    )
+    if entry_id is None:
+        # Already recorded, possibly for another user who has no totals row
+        # of their own yet; report this user's totals unchanged.
+        row = db.execute(
+            select(UserContribution.total_contribution, UserContribution.sessions_count).where(
+                UserContribution.user_id == user_id
+            )
+        ).one_or_none()
+        if row is None:
+            return RecordedContribution(False, 0, 0)
+        return RecordedContribution(False, row.total_contribution, row.sessions_count)
+
+    stmt = insert(UserContribution).values(
+        user_id=user_id,
+        total_contribution=amount,
+        sessions_count=1,
+        last_contribution_at=now,
+        updated_at=now,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["user_id"],
+        set_={
+            "total_contribution": UserContribution.total_contribution + stmt.excluded.total_contribution,
+            "sessions_count": UserContribution.sessions_count + 1,
+            "last_contribution_at": stmt.excluded.last_contribution_at,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    ).returning(UserContribution.total_contribution, UserContribution.sessions_count)
+    row = db.execute(stmt).one()
+    return RecordedContribution(True, row.total_contribution, row.sessions_count)
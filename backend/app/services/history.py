@@ -0,0 +1,81 @@
+"""
+Task-session history queries.
+
+Pages are keyset-paginated on ``(started_at, id)`` descending within one
+user, matching ``ix_task_sessions_user_id_started_at``. Only columns held in
+that index are selected, so on Postgres every page, filtered or not, is an
+index-only range scan; there is no OFFSET.
+"""
+
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass
+from datetime import datetime
+import json
+
+from sqlalchemy import Row, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import TaskSession
+from app.services.task_catalog import InvalidCursorError
+
+DEFAULT_HISTORY_PAGE_SIZE = 20
+MAX_HISTORY_PAGE_SIZE = 100
+
+HISTORY_COLUMNS = (
+    TaskSession.id,
+    TaskSession.task_id,
+    TaskSession.started_at,
+    TaskSession.completed_at,
+    TaskSession.outcome,
+    TaskSession.contribution,
+)
+
+
+@dataclass(frozen=True)
+class HistoryQuery:
+    task_id: int | None = None
+    outcome: str | None = None
+    limit: int = DEFAULT_HISTORY_PAGE_SIZE
+    cursor: str | None = None
+
+
+def encode_history_cursor(started_at: datetime, session_id: str) -> str:
+    raw = json.dumps([started_at.isoformat(), session_id], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_history_cursor(cursor: str) -> tuple[datetime, str]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        started_at, session_id = json.loads(base64.urlsafe_b64decode(padded))
+        if not isinstance(session_id, str):
+            raise TypeError("session id must be a string")
+        return datetime.fromisoformat(started_at), session_id
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError("Malformed pagination cursor") from exc
+
+
+async def fetch_history_page(
+    db: AsyncSession, user_id: str, query: HistoryQuery
+) -> tuple[list[Row], str | None]:
+    """Return one page of the user's sessions, newest first, plus the next cursor."""
+    stmt = select(*HISTORY_COLUMNS).where(TaskSession.user_id == user_id)
+    if query.task_id is not None:
+        stmt = stmt.where(TaskSession.task_id == query.task_id)
+    if query.outcome is not None:
+        stmt = stmt.where(TaskSession.outcome == query.outcome)
+    if query.cursor is not None:
+        started_at, session_id = decode_history_cursor(query.cursor)
+        stmt = stmt.where(
+            tuple_(TaskSession.started_at, TaskSession.id) < tuple_(started_at, session_id)
+        )
+    stmt = stmt.order_by(TaskSession.started_at.desc(), TaskSession.id.desc()).limit(query.limit + 1)
+
+    rows = list((await db.execute(stmt)).all())
+    next_cursor = None
+    if len(rows) > query.limit:
+        rows = rows[: query.limit]
+        next_cursor = encode_history_cursor(rows[-1].started_at, rows[-1].id)
+    return rows, next_cursor
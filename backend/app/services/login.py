@@ -0,0 +1,131 @@
+"""
+Persistence for the Privy login exchange.
+
+A login is two statements, each returning the row it wrote:
+
+1. ``users``: ``INSERT ... ON CONFLICT (id) DO UPDATE`` that only touches
+   ``updated_at`` when the last touch is older than
+   ``settings.user_touch_interval_seconds``. When the update is skipped the
+   same statement selects the existing row instead.
+2. ``sessions``: extend the user's live session for the Privy session id
+   (the same cookie then stays valid across tabs), or insert one when there
+   is none. Extended rows keep their ``created_at``; the sweeper only drops
+   a partition once none of its sessions is live.
+
+``sessions`` is partitioned by ``created_at`` and Postgres only allows
+unique constraints that include the partition key, so ``privy_session_id``
+cannot be unique and there is nothing for ``ON CONFLICT`` to key on. Step 2
+is an update-or-insert built from data-modifying CTEs instead. Two
+concurrent first logins of one Privy session can therefore both insert;
+both are valid sessions and expire normally.
+
+SQLite has no data-modifying CTEs, so there each step may take a second
+statement.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+import uuid
+
+from sqlalchemy import Row, exists, insert, literal, select, update
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.database import dialect_insert
+from app.models import Session as SessionRecord
+from app.models import User
+
+USER_COLUMNS = (User.id, User.email, User.default_wallet_address, User.created_at, User.updated_at)
+
+
+@dataclass(frozen=True)
+class LoginRows:
+    user: Row
+    session: Row
+
+
+def upsert_user(db: Session, user_id: str, now: datetime) -> Row:
+    insert_user = dialect_insert(db)
+    stmt = insert_user(User).values(id=user_id, created_at=now, updated_at=now)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["id"],
+        set_={"updated_at": stmt.excluded.updated_at},
+        where=User.updated_at < now - timedelta(seconds=settings.user_touch_interval_seconds),
+    ).returning(*USER_COLUMNS)
+
+    if db.get_bind().dialect.name == "postgresql":
+        upserted = stmt.cte("upserted")
+        unchanged = select(*USER_COLUMNS).where(User.id == user_id, ~exists(select(upserted.c.id)))
+        stmt = select(*upserted.c).union_all(unchanged)
+    row = db.execute(stmt).first()
+    if row is None:
+        # Skipped touch on SQLite, or a concurrent first login whose row this
+        # statement's snapshot could not see.
+        row = db.execute(select(*USER_COLUMNS).where(User.id == user_id)).one()
+    return row
+
+
+def upsert_session(
+    db: Session,
+    *,
+    user_id: str,
+    privy_session_id: str,
+    expires_at: datetime,
+    now: datetime,
+) -> Row:
+    table = SessionRecord.__table__
+    returned = (table.c.id, table.c.expires_at)
+    refresh = (
+        update(table)
+        .where(
+            table.c.privy_session_id == privy_session_id,
+            table.c.user_id == user_id,
+            table.c.revoked_at.is_(None),
+            table.c.expires_at > now,
+        )
+        .values(expires_at=expires_at)
+        .returning(*returned)
+    )
+    values = {
+        "id": uuid.uuid4(),
+        "user_id": user_id,
+        "privy_session_id": privy_session_id,
+        "created_at": now,
+        "expires_at": expires_at,
+    }
+
+    if db.get_bind().dialect.name == "postgresql":
+        refreshed = refresh.cte("refreshed")
+        created = (
+            insert(table)
+            .from_select(
+                list(values),
+                select(
+                    *(literal(value, type_=table.c[name].type) for name, value in values.items())
+                ).where(~exists(select(refreshed.c.id))),
+            )
+            .returning(*returned)
+            .cte("created")
+        )
+        return db.execute(select(*refreshed.c).union_all(select(*created.c))).first()
+
+    row = db.execute(refresh).first()
+    if row is None:
+        row = db.execute(insert(table).values(**values).returning(*returned)).one()
+    return row
+
+
+def record_login(db: Session, *, user_id: str, privy_session_id: str, ttl: timedelta) -> LoginRows:
+    """Upsert the user and their session. The caller owns the transaction and must commit."""
+    now = datetime.now(timezone.utc)
+    user = upsert_user(db, user_id, now)
+    session = upsert_session(
+        db,
+        user_id=user_id,
+        privy_session_id=privy_session_id,
+        expires_at=now + ttl,
+        now=now,
+    )
+    return LoginRows(user=user, session=session)
@@ -0,0 +1,215 @@
+"""
+Removal of expired and revoked login sessions.
+
+On Postgres ``sessions`` is range-partitioned by ``created_at`` into daily
+partitions named ``sessions_pYYYYMMDD``, plus a default partition as a
+safety net. Every sweep:
+
+1. creates the partitions for the next ``partitions_ahead`` days;
+2. drops whole partitions that end more than ``retention_days`` ago and
+   hold no live session, so dropping costs the same however many logins
+   the day had. Logins extend a live session in place, so an old partition
+   can still hold one; it is kept until that session ends. A session that
+   is not live cannot become live again, so the check cannot race a login;
+3. deletes what is left to delete (revoked rows, and rows that expired in
+   partitions still kept) in batches of ``batch_size``, one short
+   transaction per batch and at most ``MAX_BATCHES_PER_SWEEP`` per sweep.
+
+Partition maintenance is guarded by an advisory lock so only one API worker
+runs DDL at a time; batch deletes skip rows another worker has locked. On
+other databases (SQLite in development) only step 3 runs.
+
+No cache invalidation is needed: cached sessions expire with the session,
+and revocations invalidate the cache when they are written.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass
+from datetime import date, datetime, time, timedelta, timezone
+import logging
+import re
+
+from sqlalchemy import or_, select, text, tuple_
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.orm import Session as OrmSession
+
+from app.core.config import settings
+from app.core.database import SessionLocal
+from app.models import Session as SessionRecord
+
+logger = logging.getLogger(__name__)
+
+PARENT_TABLE = "sessions"
+PARTITION_PATTERN = re.compile(r"^sessions_p(\d{8})$")
+MAX_BATCHES_PER_SWEEP = 100
+# Arbitrary constant identifying the partition-maintenance advisory lock.
+MAINTENANCE_LOCK_KEY = 0x6178_7365_7373
+
+
+@dataclass(frozen=True)
+class SweepResult:
+    partitions_created: int = 0
+    partitions_dropped: int = 0
+    rows_deleted: int = 0
+
+
+def partition_name(day: date) -> str:
+    return f"sessions_p{day:%Y%m%d}"
+
+
+def _day_start(day: date) -> datetime:
+    return datetime.combine(day, time.min, tzinfo=timezone.utc)
+
+
+def list_partitions(db: OrmSession) -> dict[date, str]:
+    rows = db.execute(
+        text(
+            "SELECT child.relname FROM pg_inherits "
+            "JOIN pg_class parent ON parent.oid = pg_inherits.inhparent "
+            "JOIN pg_class child ON child.oid = pg_inherits.inhrelid "
+            "WHERE parent.relname = :parent"
+        ),
+        {"parent": PARENT_TABLE},
+    ).scalars()
+    partitions: dict[date, str] = {}
+    for name in rows:
+        match = PARTITION_PATTERN.match(name)
+        if match:
+            partitions[datetime.strptime(match.group(1), "%Y%m%d").date()] = name
+    return partitions
+
+
+def maintain_partitions(
+    db: OrmSession,
+    now: datetime,
+    partitions_ahead: int,
+    retention_days: int,
+) -> tuple[int, int]:
+    """Create upcoming daily partitions and drop expired ones. Returns (created, dropped)."""
+    if not db.execute(
+        text("SELECT pg_try_advisory_xact_lock(:key)"), {"key": MAINTENANCE_LOCK_KEY}
+    ).scalar():
+        return 0, 0
+
+    existing = list_partitions(db)
+    today = now.astimezone(timezone.utc).date()
+    created = 0
+    for offset in range(partitions_ahead + 1):
+        day = today + timedelta(days=offset)
+        if day in existing:
+            continue
+        try:
+            # Fails if the default partition already holds rows for that day;
+            # they are still served from there, so skip the day.
+            with db.begin_nested():
+                db.execute(
+                    text(
+                        f"CREATE TABLE IF NOT EXISTS {partition_name(day)} PARTITION OF {PARENT_TABLE} "
+                        f"FOR VALUES FROM ('{_day_start(day).isoformat()}') "
+                        f"TO ('{_day_start(day + timedelta(days=1)).isoformat()}')"
+                    )
+                )
+        except DBAPIError:
+            logger.warning("Could not create session partition day=%s", day, exc_info=True)
+            continue
+        created += 1
+
+    # A partition for ``day`` holds rows created before ``day + 1``.
+    cutoff = today - timedelta(days=retention_days)
+    dropped = 0
+    for day, name in sorted(existing.items()):
+        if day + timedelta(days=1) > cutoff:
+            break
+        # Sessions without an expiry never end, so they count as live.
+        if db.execute(
+            text(
+                f"SELECT EXISTS (SELECT 1 FROM {name} "
+                "WHERE revoked_at IS NULL AND (expires_at IS NULL OR expires_at > :now))"
+            ),
+            {"now": now},
+        ).scalar():
+            continue
+        db.execute(text(f"ALTER TABLE {PARENT_TABLE} DETACH PARTITION {name}"))
+        db.execute(text(f"DROP TABLE {name}"))
+        dropped += 1
+    db.commit()
+    return created, dropped
+
+
+def delete_expired_batch(db: OrmSession, now: datetime, batch_size: int) -> int:
+    """Delete up to ``batch_size`` expired or revoked sessions and commit."""
+    doomed = select(SessionRecord.id, SessionRecord.created_at).where(
+        or_(SessionRecord.expires_at < now, SessionRecord.revoked_at.is_not(None))
+    )
+    if db.get_bind().dialect.name == "postgresql":
+        doomed = doomed.with_for_update(skip_locked=True)
+    deleted = db.execute(
+        SessionRecord.__table__.delete().where(
+            tuple_(SessionRecord.id, SessionRecord.created_at).in_(doomed.limit(batch_size))
+        )
+    ).rowcount
+    db.commit()
+    return deleted or 0
+
+
+def sweep_sessions(
+    session_factory: Callable[[], OrmSession] = SessionLocal,
+    now: datetime | None = None,
+) -> SweepResult:
+    now = now or datetime.now(timezone.utc)
+    created = dropped = 0
+    with session_factory() as db:
+        if db.get_bind().dialect.name == "postgresql":
+            created, dropped = maintain_partitions(
+                db,
+                now,
+                partitions_ahead=settings.session_partitions_ahead,
+                retention_days=settings.session_retention_days,
+            )
+        deleted = 0
+        for _ in range(MAX_BATCHES_PER_SWEEP):
+            batch = delete_expired_batch(db, now, settings.session_sweep_batch_size)
+            deleted += batch
+            if batch < settings.session_sweep_batch_size:
+                break
+    return SweepResult(partitions_created=created, partitions_dropped=dropped, rows_deleted=deleted)
+
+
+class SessionSweeper:
+    def __init__(self, interval_seconds: float) -> None:
+        self.interval_seconds = interval_seconds
+        self._task: asyncio.Task | None = None
+
+    def start(self) -> None:
+        if self._task is None and self.interval_seconds > 0:
+            self._task = asyncio.create_task(self._run(), name="session-sweeper")
+
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                result = await asyncio.to_thread(sweep_sessions)
+                if result.partitions_created or result.partitions_dropped or result.rows_deleted:
+                    logger.info(
+                        "Session sweep created=%s dropped=%s deleted=%s",
+                        result.partitions_created,
+                        result.partitions_dropped,
+                        result.rows_deleted,
+                    )
+            except Exception:
+                logger.exception("Session sweep failed")
+            await asyncio.sleep(self.interval_seconds)
+
+
+session_sweeper = SessionSweeper(interval_seconds=settings.session_sweep_interval_seconds)
@@ -0,0 +1,90 @@
+"""
+Task catalog queries.
+
+Listing uses keyset pagination: the cursor carries the sort key of the last
+row served and the next page starts strictly after it, so page N costs the
+same index range scan as page one. Each sort order is backed by a composite
+index ending in ``id`` (see migration ``c3f1a9d27e40``).
+"""
+
+from __future__ import annotations
+
+import base64
+from dataclasses import dataclass
+import json
+
+from sqlalchemy import select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models import Task
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 100
+
+SORT_KEYS = {
+    "id": (Task.id,),
+    "duration": (Task.expected_duration, Task.id),
+}
+
+
+class InvalidCursorError(ValueError):
+    """Raised when a pagination cursor cannot be decoded for the requested sort."""
+
+
+@dataclass(frozen=True)
+class TaskQuery:
+    difficulty: tuple[str, ...] = ()
+    task_type: tuple[str, ...] = ()
+    min_duration: int | None = None
+    max_duration: int | None = None
+    sort: str = "id"
+    limit: int = DEFAULT_PAGE_SIZE
+    cursor: str | None = None
+
+
+def encode_cursor(sort: str, key: tuple) -> str:
+    raw = json.dumps([sort, *key], separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, sort: str) -> tuple:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded))
+    except (ValueError, TypeError) as exc:
+        raise InvalidCursorError("Malformed pagination cursor") from exc
+    if not isinstance(values, list) or not values or values[0] != sort:
+        raise InvalidCursorError("Cursor does not match the requested sort order")
+    key = tuple(values[1:])
+    if len(key) != len(SORT_KEYS[sort]) or not all(isinstance(v, int) for v in key):
+        raise InvalidCursorError("Malformed pagination cursor")
+    return key
+
+
+async def fetch_task_page(db: AsyncSession, query: TaskQuery) -> tuple[list[Task], str | None]:
+    """Return one page of tasks plus the cursor for the next page, if any."""
+    columns = SORT_KEYS[query.sort]
+    stmt = select(Task)
+    if query.difficulty:
+        stmt = stmt.where(Task.difficulty.in_(query.difficulty))
+    if query.task_type:
+        stmt = stmt.where(Task.task_type.in_(query.task_type))
+    if query.min_duration is not None:
+        stmt = stmt.where(Task.expected_duration >= query.min_duration)
+    if query.max_duration is not None:
+        stmt = stmt.where(Task.expected_duration <= query.max_duration)
+    if query.cursor is not None:
+        after = decode_cursor(query.cursor, query.sort)
+        if len(columns) == 1:
+            stmt = stmt.where(columns[0] > after[0])
+        else:
+            stmt = stmt.where(tuple_(*columns) > tuple_(*after))
+    stmt = stmt.order_by(*columns).limit(query.limit + 1)
+
+    rows = list(await db.scalars(stmt))
+    next_cursor = None
+    if len(rows) > query.limit:
+        rows = rows[: query.limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(query.sort, tuple(getattr(last, c.key) for c in columns))
+    return rows, next_cursor
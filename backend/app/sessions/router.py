@@ -1,19 +1,32 @@
 from datetime import datetime, timedelta, timezone
-from functools import lru_cache
 import logging
-from typing import Any, Optional
+from typing import TYPE_CHECKING, Any
+import uuid
 
-from fastapi import APIRouter, Depends, HTTPException, Response, status
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response, status
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
+from app.auth.dependencies import SESSION_COOKIE, get_current_user
+from app.auth.privy import InvalidPrivyToken, PrivyTokenVerifier, get_privy_verifier
+from app.auth.session_cache import CachedSession, session_auth_cache
+from app.core.admission import admit, check_user, check_user_async
 from app.core.config import settings
-from app.core.database import get_db
-from app.models import Session as SessionRecord
-from app.models import User
-from privy import AuthenticationError, PrivyAPI
+from app.core.database import get_async_db, get_db
+from app.core.logging_config import SAMPLED
+from app.models import Task, TaskSession, User
+from app.schemas.scoring import ScoringJobResponse
+from app.scoring.pipeline import JobState, UnknownJobError, get_scoring_backend
+from app.services.login import record_login
+
+if TYPE_CHECKING:
+    from app.telemetry.uploads import UploadStatus
 
 SESSION_TTL = timedelta(days=1)
+REPLAY_MEDIA_TYPE = "application/vnd.axis.telemetry"
 
 
 class PrivyExchangeRequest(BaseModel):
@@ -26,29 +39,53 @@ class PrivyExchangeResponse(BaseModel):
     session_id: str
 
 
-@lru_cache
-def get_privy_client() -> PrivyAPI:
-    if not settings.privy_app_id or not settings.privy_client_secret:
-        raise RuntimeError("Privy credentials are not configured on the backend.")
-    return PrivyAPI(
-        app_id=settings.privy_app_id,
-        app_secret=settings.privy_client_secret,
-    )
+class StartSessionRequest(BaseModel):
+    task_id: int
+
+
+class StartSessionResponse(BaseModel):
+    session_id: str
+    task_id: int
+    started_at: datetime
 
 
 router = APIRouter(prefix="/sessions", tags=["sessions"])
 logger = logging.getLogger(__name__)
 
 
+async def limit_telemetry_user(current_user: User = Depends(get_current_user)) -> None:
+    await check_user_async("telemetry", current_user.id)
+
+
+def _session_not_found() -> HTTPException:
+    return HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Session not found")
+
+
+async def require_owned_task_session(
+    session_id: str,
+    db: AsyncSession = Depends(get_async_db),
+    current_user: User = Depends(get_current_user),
+) -> TaskSession:
+    """404 unless ``session_id`` is a task session started by the caller."""
+    task_session = await db.get(TaskSession, session_id)
+    # Hand the connection back now rather than holding it for a long upload.
+    await db.close()
+    if task_session is None or task_session.user_id != current_user.id:
+        raise _session_not_found()
+    return task_session
+
+
 @router.post(
     "/privy",
     response_model=PrivyExchangeResponse,
     summary="Exchange Privy access token for backend session",
+    dependencies=[Depends(admit("login"))],
 )
 def exchange_privy_token(
     payload: PrivyExchangeRequest,
     response: Response,
     db: Session = Depends(get_db),
+    verifier: PrivyTokenVerifier = Depends(get_privy_verifier),
 ) -> PrivyExchangeResponse:
     """
     Validate a Privy access token and mint a backend session cookie.
@@ -66,10 +103,8 @@ def exchange_privy_token(
     )
 
     try:
-        raw_claims = get_privy_client().users.verify_access_token(
-            auth_token=payload.token
-        )
-    except AuthenticationError as exc:
+        claims = verifier.verify(payload.token)
+    except InvalidPrivyToken as exc:
         logger.warning(
             "Privy session exchange failed: authentication error",
             exc_info=exc,
@@ -78,6 +113,8 @@ def exchange_privy_token(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid Privy access token",
         ) from exc
+    except HTTPException:
+        raise
     except Exception as exc:  # pragma: no cover - defensive guard
         logger.exception("Privy session exchange failed during token verification")
         raise HTTPException(
@@ -85,35 +122,18 @@ def exchange_privy_token(
             detail="Failed to verify Privy access token",
         ) from exc
 
-    claims = _normalize_privy_claims(raw_claims)
-
     user_id = claims["user_id"]
     session_id = claims["session_id"]
     app_id = claims["app_id"]
+    check_user("login", user_id)
 
-    user = db.get(User, user_id)
-    if user is None:
-        user = User(id=user_id)
-        db.add(user)
-    user.touch()
-
-    # Remove any stale session rows for this Privy session id to avoid duplicates.
-    db.query(SessionRecord).filter(
-        SessionRecord.privy_session_id == session_id
-    ).delete(synchronize_session=False)
-
-    session_record = SessionRecord(
-        user=user,
-        privy_session_id=session_id,
-        expires_at=datetime.now(timezone.utc) + SESSION_TTL,
-    )
-    db.add(session_record)
+    login = record_login(db, user_id=user_id, privy_session_id=session_id, ttl=SESSION_TTL)
     db.commit()
-    db.refresh(session_record)
+    session_auth_cache.put(CachedSession.from_rows(login.session, login.user))
 
     response.set_cookie(
-        key="axis_session",
-        value=str(session_record.id),
+        key=SESSION_COOKIE,
+        value=str(login.session.id),
         httponly=True,
         secure=not settings.debug,
         samesite="lax",
@@ -126,7 +146,7 @@ def exchange_privy_token(
             "user_id": user_id,
             "session_id": session_id,
             "app_id": app_id,
-            "session_record_id": str(session_record.id),
+            "session_record_id": str(login.session.id),
         },
     )
 
@@ -137,72 +157,310 @@ def exchange_privy_token(
     )
 
 
-def _normalize_privy_claims(raw_claims: Any) -> dict[str, str]:
-    """
-    Convert the Privy verify_access_token response into a dict with the fields we need.
+@router.post(
+    "/",
+    response_model=StartSessionResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Start task session",
+)
+def start_session(
+    payload: StartSessionRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> StartSessionResponse:
+    if db.get(Task, payload.task_id) is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Task not found")
+    task_session = TaskSession(
+        id=uuid.uuid4().hex,
+        user_id=current_user.id,
+        task_id=payload.task_id,
+        started_at=datetime.now(timezone.utc),
+    )
+    db.add(task_session)
+    db.commit()
+    return StartSessionResponse(
+        session_id=task_session.id,
+        task_id=task_session.task_id,
+        started_at=task_session.started_at,
+    )
 
-    The library can return either an object with attributes or a plain dict. We
-    defensively support both shapes and surface a clear 500 if required fields
-    are missing.
+
+@router.post(
+    "/{session_id}/telemetry",
+    summary="Upload session telemetry",
+    dependencies=[
+        Depends(admit("telemetry")),
+        Depends(limit_telemetry_user),
+        Depends(require_owned_task_session),
+    ],
+)
+async def upload_telemetry(
+    session_id: str,
+    request: Request,
+    upload_id: str | None = Header(
+        None,
+        alias="X-Telemetry-Upload-Id",
+        description="Makes the upload resumable; repeat it on every request of the upload.",
+    ),
+    chunk_seq: int = Header(
+        0, ge=0, alias="X-Telemetry-Chunk-Seq", description="Sequence number of the body's first chunk."
+    ),
+    chunk_offset: int | None = Header(
+        None,
+        ge=0,
+        alias="X-Telemetry-Offset",
+        description="Byte offset of the body's first chunk in the full stream; checked when given.",
+    ),
+) -> dict[str, Any]:
+    """
+    Stream a binary telemetry upload (see ``app.telemetry.frames``) into a new
+    segment file for the session. The body is decoded chunk by chunk, so
+    memory use does not grow with upload size.
+
+    With ``X-Telemetry-Upload-Id`` the upload is resumable (see
+    ``app.telemetry.uploads``): the response acknowledges the chunks stored
+    so far, resent chunks are skipped, and the segment is published when the
+    end-of-stream marker arrives.
     """
+    from app.telemetry.frames import ChunkTooLargeError
+    from app.telemetry.ingest import ingest_resumable, ingest_stream
+    from app.telemetry.segments import SegmentLayoutMismatch
+    from app.telemetry.store import SessionFinalizedError
+    from app.telemetry.uploads import UploadBusyError, UploadConflictError
 
-    def _extract(source: Any, key: str, fallback: Optional[str] = None) -> Optional[str]:
-        """Attempt to extract attribute or dict key with optional fallback path."""
-        if isinstance(source, dict):
-            if key in source:
-                return source[key]
-            if fallback and fallback in source:
-                nested = source[fallback]
-                if isinstance(nested, dict):
-                    return nested.get("id")
+    try:
+        if upload_id is not None:
+            resumed = await ingest_resumable(
+                session_id, upload_id, request.stream(), first_seq=chunk_seq, first_offset=chunk_offset
+            )
         else:
-            if hasattr(source, key):
-                value = getattr(source, key)
-                if isinstance(value, (str, int)):
-                    return str(value)
-            if fallback and hasattr(source, fallback):
-                nested = getattr(source, fallback)
-                if hasattr(nested, "id"):
-                    nested_id = getattr(nested, "id")
-                    if isinstance(nested_id, (str, int)):
-                        return str(nested_id)
-        return None
-
-    user_id = _extract(raw_claims, "user_id", fallback="user")
-    session_id = _extract(raw_claims, "session_id", fallback="session")
-    app_id = _extract(raw_claims, "app_id")
-
-    missing = [name for name, value in [("user_id", user_id), ("session_id", session_id), ("app_id", app_id)] if value is None]
-    if missing:
+            result = await ingest_stream(session_id, request.stream())
+    except ChunkTooLargeError as exc:
         raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Privy claims missing expected field(s): {', '.join(missing)}",
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE, detail=str(exc)
+        ) from exc
+    except (SegmentLayoutMismatch, SessionFinalizedError, UploadConflictError, UploadBusyError) as exc:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(exc)) from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+
+    if upload_id is not None:
+        logger.info(
+            "Telemetry chunks accepted session_id=%s upload_id=%s chunks=%s duplicates=%s next_seq=%s",
+            session_id,
+            upload_id,
+            resumed.chunks,
+            resumed.duplicates,
+            resumed.status.next_seq,
+            extra=SAMPLED,
         )
+        return {
+            "session_id": session_id,
+            "status": "complete" if resumed.status.complete else "accepted",
+            **_upload_status(resumed.status),
+            "chunks": resumed.chunks,
+            "duplicates": resumed.duplicates,
+            "frames_added": resumed.frames,
+            "bytes": resumed.bytes_received,
+        }
 
+    logger.info(
+        "Telemetry upload accepted session_id=%s segment=%s frames=%s bytes=%s",
+        session_id,
+        result.segment,
+        result.frames,
+        result.bytes_received,
+        extra=SAMPLED,
+    )
     return {
-        "user_id": user_id,
         "session_id": session_id,
-        "app_id": app_id,
+        "status": "accepted",
+        "segment": result.segment,
+        "frames": result.frames,
+        "bytes": result.bytes_received,
     }
 
 
-@router.post("/", summary="Start task session")
-def start_session(db: Session = Depends(get_db)) -> dict[str, str]:
-    # TODO: implement session creation logic
-    _ = db
-    return {"session_id": "placeholder"}
+@router.get(
+    "/{session_id}/telemetry/{upload_id}",
+    summary="Resumable upload status",
+    dependencies=[Depends(require_owned_task_session)],
+)
+def get_upload_status(session_id: str, upload_id: str) -> dict[str, Any]:
+    """
+    Report the contiguous prefix of a resumable upload that is stored:
+    resume by sending the stream header plus the stream from ``offset``,
+    starting at chunk ``next_seq``. Once the session is completed its upload
+    state is gone and every status request gets 409, as further uploads do.
+    """
+    from app.telemetry.segments import session_directory
+    from app.telemetry.store import get_trajectory_store
+    from app.telemetry.uploads import UnknownUploadError, read_status
 
+    try:
+        upload = read_status(session_directory(session_id), upload_id)
+    except UnknownUploadError as exc:
+        if get_trajectory_store().exists(session_id):
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Session {session_id} is already completed",
+            ) from exc
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Upload not found") from exc
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return {"session_id": session_id, **_upload_status(upload)}
 
-@router.post("/{session_id}/telemetry", summary="Upload session telemetry")
-def upload_telemetry(session_id: str, db: Session = Depends(get_db)) -> dict[str, str]:
-    # TODO: implement telemetry ingestion logic
-    _ = db
-    return {"session_id": session_id, "status": "accepted"}
 
+@router.post(
+    "/{session_id}/complete",
+    response_model=ScoringJobResponse,
+    status_code=status.HTTP_202_ACCEPTED,
+    summary="Complete task session and enqueue scoring",
+)
+def complete_session(
+    session_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user),
+) -> ScoringJobResponse:
+    """
+    Hand the session's telemetry to the scoring backend and return a job
+    handle immediately; poll ``/{session_id}/jobs/{job_id}`` for the result.
+    """
+    from app.telemetry.segments import list_segments, session_directory
+    from app.telemetry.store import get_trajectory_store
+
+    try:
+        directory = session_directory(session_id)
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    task_session = db.get(TaskSession, session_id)
+    if task_session is None or task_session.user_id != current_user.id:
+        raise _session_not_found()
+    if not list_segments(directory) and not get_trajectory_store().exists(session_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="No telemetry has been uploaded for this session",
+        )
+
+    job = get_scoring_backend().submit(session_id, current_user.id)
+    logger.info(
+        "Scoring job queued session_id=%s job_id=%s user_id=%s",
+        session_id,
+        job.job_id,
+        current_user.id,
+    )
+    return _job_response(job)
+
+
+@router.get(
+    "/{session_id}/jobs/{job_id}",
+    response_model=ScoringJobResponse,
+    summary="Poll or long-poll a scoring job",
+    dependencies=[Depends(require_owned_task_session)],
+)
+async def get_scoring_job(
+    session_id: str,
+    job_id: str,
+    wait: float = Query(0.0, ge=0.0, description="Seconds to wait for completion."),
+) -> ScoringJobResponse:
+    timeout = min(wait, settings.scoring_max_wait_seconds)
+    try:
+        job = await get_scoring_backend().wait(job_id, timeout)
+    except UnknownJobError as exc:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found") from exc
+    if job.session_id is not None and job.session_id != session_id:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job not found")
+    return _job_response(job)
+
+
+@router.get(
+    "/{session_id}/replay",
+    summary="Stream a completed session's trajectory for replay",
+    dependencies=[Depends(require_owned_task_session)],
+    response_class=StreamingResponse,
+)
+async def replay_session(
+    session_id: str,
+    request: Request,
+    fps: float | None = Query(None, gt=0, description="Target frame rate; full rate when omitted."),
+    t_start: float | None = Query(None, description="Seek: first timestamp to include."),
+    t_end: float | None = Query(None, description="Timestamp to stop before."),
+    chunk_frames: int | None = Query(
+        None, ge=16, le=8192, description="Frames per chunk; the replay module's default when omitted."
+    ),
+) -> Response:
+    """
+    Stream the trajectory in the telemetry wire format, in time-ordered
+    chunks, downsampled from the precomputed LOD levels. ``Range: bytes=``
+    requests are honoured, so players can resume or seek within a stream.
+    """
+    # Imported here so NumPy loads on the first replay rather than at startup.
+    from app.telemetry.replay import DEFAULT_CHUNK_FRAMES, UnsatisfiableRange, parse_range, plan_replay
+    from app.telemetry.store import get_trajectory_store
 
-@router.post("/{session_id}/complete", summary="Complete task session")
-def complete_session(session_id: str, db: Session = Depends(get_db)) -> dict[str, str]:
-    # TODO: implement completion and scoring logic
-    _ = db
-    return {"session_id": session_id, "status": "completed"}
+    try:
+        plan = await run_in_threadpool(
+            plan_replay,
+            get_trajectory_store(),
+            session_id,
+            fps=fps,
+            t_start=t_start,
+            t_end=t_end,
+            chunk_frames=chunk_frames or DEFAULT_CHUNK_FRAMES,
+        )
+    except ValueError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    except FileNotFoundError as exc:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail="Session has no completed trajectory"
+        ) from exc
+
+    total = plan.total_bytes
+    headers = {
+        "Accept-Ranges": "bytes",
+        "X-Replay-Level": str(plan.level),
+        "X-Replay-Stride": str(plan.stride),
+        "X-Replay-Frames": str(plan.frames),
+    }
+    try:
+        byte_range = parse_range(request.headers.get("range"), total)
+    except UnsatisfiableRange:
+        headers["Content-Range"] = f"bytes */{total}"
+        return Response(status_code=status.HTTP_416_RANGE_NOT_SATISFIABLE, headers=headers)
+
+    if byte_range is None:
+        headers["Content-Length"] = str(total)
+        return StreamingResponse(plan.iter_bytes(), media_type=REPLAY_MEDIA_TYPE, headers=headers)
+
+    first, last = byte_range
+    headers["Content-Range"] = f"bytes {first}-{last}/{total}"
+    headers["Content-Length"] = str(last - first + 1)
+    return StreamingResponse(
+        plan.iter_bytes(first, last),
+        status_code=status.HTTP_206_PARTIAL_CONTENT,
+        media_type=REPLAY_MEDIA_TYPE,
+        headers=headers,
+    )
+
+
+def _upload_status(upload: "UploadStatus") -> dict[str, Any]:
+    return {
+        "upload_id": upload.upload_id,
+        "last_seq": upload.last_seq,
+        "next_seq": upload.next_seq,
+        "offset": upload.offset,
+        "frames": upload.frames,
+        "complete": upload.complete,
+        "segment": upload.segment,
+    }
+
+
+def _job_response(job: JobState) -> ScoringJobResponse:
+    return ScoringJobResponse(
+        job_id=job.job_id,
+        session_id=job.session_id,
+        status=job.status,
+        result=job.result,
+        error=job.error,
+    )
 
@@ -1,22 +1,20 @@
 import logging
 
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException, Request, Response
 
-from app.core.database import get_db
-from app.models import Task
+from app.core.logging_config import SAMPLED
 from app.schemas.task import TaskRead
+from app.tasks.cache import cached_json_response, task_catalog
 
 router = APIRouter(prefix="/taskdetail", tags=["taskdetail"])
 logger = logging.getLogger("app.taskdetail")
 
 
 @router.get("/", response_model=TaskRead, summary="Get task detail by id")
-def get_task_detail(id: int, db: Session = Depends(get_db)) -> TaskRead:
-    task = db.get(Task, id)
-    if not task:
+async def get_task_detail(id: int, request: Request) -> Response:
+    cached = await task_catalog.task(id)
+    if cached is None:
         logger.warning("Task not found id=%s", id)
         raise HTTPException(status_code=404, detail="Task not found")
-    logger.info("Returning task detail id=%s data=%s", id, task)
-    return task
-
+    logger.info("Returning task detail id=%s", id, extra=SAMPLED)
+    return cached_json_response(request, cached)
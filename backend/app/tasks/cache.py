@@ -0,0 +1,192 @@
+"""
+In-process, versioned cache of task catalog responses.
+
+The catalog changes rarely, so responses for ``/tasks``, ``/tasks/{id}`` and
+``/taskdetail`` are serialized once per snapshot and served as bytes. Pages
+(one per filter/sort/cursor combination) and single tasks are loaded on first
+use, so the whole table is never read at once. A snapshot is discarded when
+its TTL lapses or when ``invalidate()`` bumps the version; between rebuilds a
+hit costs no DB round trip and no Pydantic work. Bodies are built from the
+ORM rows with the trusted serializers in ``app.core.responses``, and each
+compressed variant is produced once per cached body. ETags are content
+hashes, so they agree across workers.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Awaitable, Callable, Hashable
+from dataclasses import dataclass, field
+import hashlib
+import logging
+import threading
+import time
+from typing import Any
+
+from fastapi import Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.database import AsyncSessionLocal
+from app.core.responses import (
+    JSON_MEDIA_TYPE,
+    compress,
+    dumps,
+    encoding_headers,
+    negotiate_encoding,
+    trusted_dump,
+)
+from app.models import Task
+from app.schemas.task import TaskRead
+from app.services.task_catalog import TaskQuery, fetch_task_page
+
+logger = logging.getLogger("app.tasks")
+
+MAX_CACHED_PAGES = 1024
+MAX_CACHED_TASKS = 4096
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    body: bytes
+    etag: str
+    # Compressed variants by content coding, filled on first request.
+    encoded: dict[str, bytes] = field(default_factory=dict, compare=False, repr=False)
+
+    @classmethod
+    def build(cls, body: bytes) -> "CachedBody":
+        return cls(body=body, etag=f'"{hashlib.blake2b(body, digest_size=12).hexdigest()}"')
+
+    def encode(self, encoding: str | None) -> tuple[bytes, str]:
+        """Body and ETag for ``encoding``; each coding is a distinct representation."""
+        if encoding is None:
+            return self.body, self.etag
+        body = self.encoded.get(encoding)
+        if body is None:
+            body = self.encoded.setdefault(encoding, compress(self.body, encoding))
+        return body, f'{self.etag[:-1]}-{encoding}"'
+
+
+@dataclass
+class CatalogSnapshot:
+    version: int
+    loaded_at: float
+    pages: dict[TaskQuery, CachedBody] = field(default_factory=dict)
+    # Misses are not cached, so probing arbitrary ids cannot grow the snapshot.
+    tasks: dict[int, CachedBody] = field(default_factory=dict)
+
+
+class TaskCatalogCache:
+    def __init__(
+        self,
+        ttl_seconds: float,
+        session_factory: Callable[[], AsyncSession] = AsyncSessionLocal,
+    ) -> None:
+        self.ttl_seconds = ttl_seconds
+        self._session_factory = session_factory
+        self._version = 0
+        self._snapshot = CatalogSnapshot(version=0, loaded_at=time.monotonic())
+        self._previous: CatalogSnapshot | None = None
+        self._lock = threading.Lock()
+
+    def snapshot(self) -> CatalogSnapshot:
+        current = self._snapshot
+        if not self._is_stale(current):
+            return current
+        with self._lock:
+            current = self._snapshot
+            if self._is_stale(current):
+                self._previous = current
+                current = CatalogSnapshot(version=self._version, loaded_at=time.monotonic())
+                self._snapshot = current
+                logger.info("Task catalog snapshot rotated version=%s", current.version)
+        return current
+
+    def invalidate(self) -> int:
+        """Bump the catalog version so the next read starts a fresh snapshot."""
+        with self._lock:
+            self._version += 1
+            return self._version
+
+    async def page(self, query: TaskQuery) -> CachedBody:
+        snapshot = self.snapshot()
+        cached = snapshot.pages.get(query)
+        if cached is None:
+            cached = await self._load(query, "pages", self._load_page)
+            if len(snapshot.pages) >= MAX_CACHED_PAGES:
+                snapshot.pages.pop(next(iter(snapshot.pages)), None)
+            snapshot.pages[query] = cached
+        return cached
+
+    async def task(self, task_id: int) -> CachedBody | None:
+        snapshot = self.snapshot()
+        cached = snapshot.tasks.get(task_id)
+        if cached is None:
+            cached = await self._load(task_id, "tasks", self._load_task)
+            if cached is None:
+                return None
+            if len(snapshot.tasks) >= MAX_CACHED_TASKS:
+                snapshot.tasks.pop(next(iter(snapshot.tasks)), None)
+            snapshot.tasks[task_id] = cached
+        return cached
+
+    def _is_stale(self, snapshot: CatalogSnapshot) -> bool:
+        return (
+            snapshot.version != self._version
+            or time.monotonic() - snapshot.loaded_at > self.ttl_seconds
+        )
+
+    async def _load(
+        self,
+        key: Hashable,
+        section: str,
+        loader: Callable[[AsyncSession, Any], Awaitable[Any]],
+    ) -> Any:
+        try:
+            async with self._session_factory() as db:
+                return await loader(db, key)
+        except Exception:
+            fallback = getattr(self._previous, section, None) or {}
+            if key not in fallback:
+                raise
+            # Keep serving the previous catalog rather than failing hot reads.
+            logger.exception("Task catalog load failed; serving previous snapshot")
+            return fallback[key]
+
+    @staticmethod
+    async def _load_page(db: AsyncSession, query: TaskQuery) -> CachedBody:
+        rows, next_cursor = await fetch_task_page(db, query)
+        # Same bytes as TaskListResponse(...).model_dump_json(), without validating rows.
+        return CachedBody.build(
+            dumps({"tasks": [trusted_dump(TaskRead, row) for row in rows], "next_cursor": next_cursor})
+        )
+
+    @staticmethod
+    async def _load_task(db: AsyncSession, task_id: int) -> CachedBody | None:
+        task = await db.get(Task, task_id)
+        if task is None:
+            return None
+        return CachedBody.build(dumps(trusted_dump(TaskRead, task)))
+
+
+task_catalog = TaskCatalogCache(ttl_seconds=settings.task_catalog_ttl_seconds)
+
+
+def cached_json_response(request: Request, cached: CachedBody) -> Response:
+    """Serve pre-serialized JSON, answering a matching If-None-Match with 304."""
+    encoding = negotiate_encoding(request.headers.get("accept-encoding"), len(cached.body))
+    body, etag = cached.encode(encoding)
+    headers = {"ETag": etag, "Cache-Control": "no-cache", **encoding_headers(encoding)}
+    if _etag_matches(request.headers.get("if-none-match"), etag):
+        headers.pop("Content-Encoding", None)
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type=JSON_MEDIA_TYPE, headers=headers)
+
+
+def _etag_matches(header: str | None, etag: str) -> bool:
+    if not header:
+        return False
+    for candidate in header.split(","):
+        candidate = candidate.strip()
+        if candidate == "*" or candidate.removeprefix("W/") == etag:
+            return True
+    return False
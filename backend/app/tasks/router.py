@@ -1,28 +1,55 @@
 import logging
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from typing import Literal
 
-from app.core.database import get_db
-from app.models import Task
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+
+from app.core.logging_config import SAMPLED
 from app.schemas.task import TaskListResponse, TaskRead
+from app.services.task_catalog import (
+    DEFAULT_PAGE_SIZE,
+    MAX_PAGE_SIZE,
+    InvalidCursorError,
+    TaskQuery,
+)
+from app.tasks.cache import cached_json_response, task_catalog
 
 router = APIRouter(prefix="/tasks", tags=["tasks"])
 logger = logging.getLogger("app.tasks")
 
 
 @router.get("/", response_model=TaskListResponse, summary="List tasks")
-def list_tasks(db: Session = Depends(get_db)) -> TaskListResponse:
-    tasks = db.query(Task).all()
-    logger.info("Listing tasks count=%s data=%s", len(tasks), tasks)
-    return TaskListResponse(tasks=tasks)
+async def list_tasks(
+    request: Request,
+    difficulty: list[str] | None = Query(None, description="Repeat to match any of several."),
+    task_type: list[str] | None = Query(None, alias="type", description="Repeat to match any of several."),
+    min_duration: int | None = Query(None, ge=0, description="Minimum expected duration (minutes)."),
+    max_duration: int | None = Query(None, ge=0, description="Maximum expected duration (minutes)."),
+    sort: Literal["id", "duration"] = Query("id"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    cursor: str | None = Query(None, description="next_cursor from the previous page."),
+) -> Response:
+    query = TaskQuery(
+        difficulty=tuple(sorted(set(difficulty or ()))),
+        task_type=tuple(sorted(set(task_type or ()))),
+        min_duration=min_duration,
+        max_duration=max_duration,
+        sort=sort,
+        limit=limit,
+        cursor=cursor,
+    )
+    try:
+        cached = await task_catalog.page(query)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=400, detail=str(exc)) from exc
+    logger.info("Listing tasks query=%s", query, extra=SAMPLED)
+    return cached_json_response(request, cached)
 
 
 @router.get("/{task_id}", response_model=TaskRead, summary="Get task detail")
-def get_task(task_id: int, db: Session = Depends(get_db)) -> TaskRead:
-    task = db.get(Task, task_id)
-    if not task:
+async def get_task(task_id: int, request: Request) -> Response:
+    cached = await task_catalog.task(task_id)
+    if cached is None:
         logger.warning("Task not found id=%s", task_id)
         raise HTTPException(status_code=404, detail="Task not found")
-    logger.info("Returning task detail id=%s data=%s", task_id, task)
-    return task
-
+    logger.info("Returning task detail id=%s", task_id, extra=SAMPLED)
+    return cached_json_response(request, cached)
@@ -0,0 +1 @@
+"""Telemetry wire format, ingestion and on-disk segments."""
@@ -0,0 +1,248 @@
+"""
+Binary telemetry wire format.
+
+An upload body is a stream header followed by length-prefixed chunks::
+
+    header  : magic "AXT1" | version u16 | state_dim u16 | action_dim u16 | codec u16 | quant_step f32
+    chunk   : payload_length u32 | payload
+    payload : records of (t f8, state f4[state_dim], action f4[action_dim])
+
+Everything is little-endian. A zero-length chunk ends the stream early; the
+end of the request body ends it otherwise. Records are fixed size, so a chunk
+payload maps straight onto a NumPy structured array without per-frame parsing.
+
+With ``codec = CODEC_DELTA`` each payload is instead a ``DeltaCodec`` chunk
+(``app.telemetry.codec``) quantized to ``quant_step``; it is decoded back
+into records on arrival. ``codec = 0`` (raw) keeps the original layout, whose
+trailing header bytes were reserved zeros.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import struct
+
+import numpy as np
+
+from app.telemetry.codec import CodecError, DeltaCodec
+
+MAGIC = b"AXT1"
+VERSION = 1
+
+STREAM_HEADER = struct.Struct("<4sHHHHf")
+CHUNK_PREFIX = struct.Struct("<I")
+
+CODEC_RAW = 0
+CODEC_DELTA = 1
+
+# Decoded chunks may be at most this many times the raw chunk size limit.
+MAX_DECODED_EXPANSION = 16
+
+
+class TelemetryFormatError(ValueError):
+    """Raised when an upload body does not follow the telemetry wire format."""
+
+
+class ChunkTooLargeError(TelemetryFormatError):
+    """Raised when a chunk payload exceeds the configured size limit."""
+
+
+@dataclass(frozen=True)
+class FrameLayout:
+    state_dim: int
+    action_dim: int
+    codec: int = CODEC_RAW
+    quant_step: float = 0.0
+
+    def __post_init__(self) -> None:
+        # The header carries the step as float32; encode with exactly that value.
+        object.__setattr__(self, "quant_step", float(np.float32(self.quant_step)))
+
+    @property
+    def dtype(self) -> np.dtype:
+        return record_dtype(self.state_dim, self.action_dim)
+
+    @property
+    def record_size(self) -> int:
+        return 8 + 4 * (self.state_dim + self.action_dim)
+
+    @property
+    def delta_codec(self) -> DeltaCodec | None:
+        if self.codec == CODEC_RAW:
+            return None
+        return DeltaCodec(step=self.quant_step)
+
+    def without_codec(self) -> "FrameLayout":
+        """The layout of the decoded records, as stored in segments."""
+        return FrameLayout(state_dim=self.state_dim, action_dim=self.action_dim)
+
+    def pack_header(self) -> bytes:
+        return STREAM_HEADER.pack(
+            MAGIC, VERSION, self.state_dim, self.action_dim, self.codec, self.quant_step
+        )
+
+    @classmethod
+    def unpack_header(cls, data: bytes) -> "FrameLayout":
+        magic, version, state_dim, action_dim, codec, quant_step = STREAM_HEADER.unpack(data)
+        if magic != MAGIC:
+            raise TelemetryFormatError("Telemetry stream has an unknown magic number")
+        if version != VERSION:
+            raise TelemetryFormatError(f"Unsupported telemetry version {version}")
+        if state_dim == 0 and action_dim == 0:
+            raise TelemetryFormatError("Telemetry stream declares no state or action channels")
+        if codec == CODEC_RAW:
+            return cls(state_dim=state_dim, action_dim=action_dim)
+        if codec != CODEC_DELTA:
+            raise TelemetryFormatError(f"Unsupported telemetry codec {codec}")
+        if not (quant_step > 0 and np.isfinite(quant_step)):
+            raise TelemetryFormatError("Delta codec requires a positive quantization step")
+        return cls(state_dim=state_dim, action_dim=action_dim, codec=codec, quant_step=quant_step)
+
+
+def record_dtype(state_dim: int, action_dim: int) -> np.dtype:
+    return np.dtype(
+        [
+            ("t", "<f8"),
+            ("state", "<f4", (state_dim,)),
+            ("action", "<f4", (action_dim,)),
+        ]
+    )
+
+
+def encode_chunk(records: np.ndarray, layout: FrameLayout | None = None) -> bytes:
+    """Serialize a structured record array as one length-prefixed chunk."""
+    codec = layout.delta_codec if layout is not None else None
+    if codec is None:
+        payload = np.ascontiguousarray(records).tobytes()
+    else:
+        payload = codec.encode(records)
+    return CHUNK_PREFIX.pack(len(payload)) + payload
+
+
+def decode_stream(data: bytes, max_chunk_bytes: int) -> tuple[FrameLayout, np.ndarray]:
+    """Decode a complete stream (e.g. an archived upload) into one record array."""
+    decoder = FrameStreamDecoder(max_chunk_bytes=max_chunk_bytes)
+    chunks = decoder.feed(data)
+    decoder.close()
+    assert decoder.layout is not None
+    records = [chunk.records for chunk in chunks]
+    if not records:
+        return decoder.layout, np.empty(0, dtype=decoder.layout.dtype)
+    return decoder.layout, np.concatenate(records)
+
+
+@dataclass
+class DecodedChunk:
+    # Raw record bytes, whatever codec the chunk arrived in.
+    payload: bytes
+    records: np.ndarray
+
+
+class FrameStreamDecoder:
+    """
+    Incremental decoder for the telemetry wire format.
+
+    Feed it arbitrary slices of the request body; it buffers at most one
+    partial chunk and hands back every chunk that became complete. Chunk
+    contents are validated with vectorized checks only. ``split`` and
+    ``decode_chunk`` are the two halves of ``feed``, for callers that skip
+    some chunks without decoding them; ``last_timestamp`` continues the
+    ordering check from an earlier stream.
+    """
+
+    def __init__(self, max_chunk_bytes: int, last_timestamp: float = -np.inf) -> None:
+        self.max_chunk_bytes = max_chunk_bytes
+        self.max_decoded_bytes = max_chunk_bytes * MAX_DECODED_EXPANSION
+        self.layout: FrameLayout | None = None
+        self.frames = 0
+        self.bytes_received = 0
+        self._buffer = bytearray()
+        self._last_timestamp = last_timestamp
+        self._finished = False
+
+    @property
+    def finished(self) -> bool:
+        """Whether the end-of-stream marker has been read."""
+        return self._finished
+
+    def feed(self, data: bytes) -> list[DecodedChunk]:
+        return [self.decode_chunk(payload) for payload in self.split(data)]
+
+    def split(self, data: bytes) -> list[bytes]:
+        """Return the payloads (still codec-encoded) of every chunk ``data`` completes."""
+        if not data:
+            return []
+        if self._finished:
+            raise TelemetryFormatError("Unexpected data after end-of-stream marker")
+        self.bytes_received += len(data)
+        self._buffer += data
+
+        payloads: list[bytes] = []
+        offset = 0
+        if self.layout is None:
+            if len(self._buffer) < STREAM_HEADER.size:
+                return payloads
+            self.layout = FrameLayout.unpack_header(bytes(self._buffer[: STREAM_HEADER.size]))
+            offset = STREAM_HEADER.size
+
+        buffer_length = len(self._buffer)
+        with memoryview(self._buffer) as view:
+            while buffer_length - offset >= CHUNK_PREFIX.size:
+                (length,) = CHUNK_PREFIX.unpack_from(view, offset)
+                if length > self.max_chunk_bytes:
+                    raise ChunkTooLargeError(
+                        f"Chunk of {length} bytes exceeds limit of {self.max_chunk_bytes}"
+                    )
+                if length == 0:
+                    offset += CHUNK_PREFIX.size
+                    self._finished = True
+                    if offset != buffer_length:
+                        raise TelemetryFormatError("Unexpected data after end-of-stream marker")
+                    break
+                end = offset + CHUNK_PREFIX.size + length
+                if end > buffer_length:
+                    break
+                payloads.append(bytes(view[offset + CHUNK_PREFIX.size : end]))
+                offset = end
+
+        del self._buffer[:offset]
+        return payloads
+
+    def close(self) -> None:
+        """Check the stream ended on a chunk boundary."""
+        if self.layout is None:
+            raise TelemetryFormatError("Telemetry stream is missing its header")
+        if self._buffer:
+            raise TelemetryFormatError("Telemetry stream ended inside a chunk")
+
+    def decode_chunk(self, payload: bytes) -> DecodedChunk:
+        assert self.layout is not None
+        codec = self.layout.delta_codec
+        if codec is None:
+            if len(payload) % self.layout.record_size:
+                raise TelemetryFormatError(
+                    f"Chunk of {len(payload)} bytes is not a multiple of the "
+                    f"{self.layout.record_size}-byte record size"
+                )
+            records = np.frombuffer(payload, dtype=self.layout.dtype)
+        else:
+            try:
+                records = codec.decode(payload, self.layout.dtype, self.max_decoded_bytes)
+            except CodecError as exc:
+                raise TelemetryFormatError(str(exc)) from exc
+            payload = records.tobytes()
+        self._validate(records)
+        return DecodedChunk(payload=payload, records=records)
+
+    def _validate(self, records: np.ndarray) -> None:
+        if not len(records):
+            raise TelemetryFormatError("Chunk contains no records")
+        timestamps = records["t"]
+        if not np.isfinite(timestamps).all():
+            raise TelemetryFormatError("Chunk contains non-finite timestamps")
+        if timestamps[0] < self._last_timestamp or (np.diff(timestamps) < 0).any():
+            raise TelemetryFormatError("Telemetry timestamps must be non-decreasing")
+        if not (np.isfinite(records["state"]).all() and np.isfinite(records["action"]).all()):
+            raise TelemetryFormatError("Chunk contains non-finite state or action values")
+        self._last_timestamp = timestamps[-1]
+        self.frames += len(records)
@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from collections.abc import AsyncIterator
+from dataclasses import dataclass
+
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.telemetry.frames import FrameStreamDecoder
+from app.telemetry.segments import SegmentWriter, last_timestamp, session_directory
+from app.telemetry.store import SessionFinalizedError, get_trajectory_store
+from app.telemetry.uploads import ResumableUpload, UploadConflictError, UploadStatus
+
+
+@dataclass
+class IngestResult:
+    session_id: str
+    segment: str | None
+    frames: int
+    bytes_received: int
+
+
+@dataclass
+class ResumableIngestResult:
+    status: UploadStatus
+    # Chunks and frames this request added, and resent chunks it skipped.
+    chunks: int
+    frames: int
+    duplicates: int
+    bytes_received: int
+
+
+async def ingest_stream(session_id: str, body: AsyncIterator[bytes]) -> IngestResult:
+    """
+    Decode a telemetry upload as it arrives and append it to a new segment.
+
+    Only one partial chunk is held in memory at a time; file writes run in the
+    threadpool so the event loop keeps serving other requests. The segment is
+    published only once the whole body validated, so a failed upload leaves
+    nothing behind.
+    """
+    directory = session_directory(session_id)
+    if get_trajectory_store().exists(session_id):
+        raise SessionFinalizedError(f"Session {session_id} is already completed")
+    # Continue the ordering check from earlier uploads, so segments concatenate in time order.
+    decoder = FrameStreamDecoder(
+        max_chunk_bytes=settings.telemetry_max_chunk_bytes,
+        last_timestamp=await run_in_threadpool(last_timestamp, directory),
+    )
+    writer: SegmentWriter | None = None
+
+    try:
+        async for piece in body:
+            for chunk in decoder.feed(piece):
+                if writer is None:
+                    writer = await run_in_threadpool(
+                        SegmentWriter.open, directory, decoder.layout.without_codec()
+                    )
+                await run_in_threadpool(writer.write, chunk.payload)
+        decoder.close()
+        if writer is None:
+            return IngestResult(session_id, None, 0, decoder.bytes_received)
+        segment = await run_in_threadpool(writer.commit)
+    except BaseException:
+        if writer is not None:
+            writer.abort()
+        raise
+
+    return IngestResult(
+        session_id=session_id,
+        segment=segment.name,
+        frames=decoder.frames,
+        bytes_received=decoder.bytes_received,
+    )
+
+
+async def ingest_resumable(
+    session_id: str,
+    upload_id: str,
+    body: AsyncIterator[bytes],
+    first_seq: int = 0,
+    first_offset: int | None = None,
+) -> ResumableIngestResult:
+    """
+    Add one request's chunks to a resumable upload (see ``app.telemetry.uploads``).
+
+    The body starts at chunk ``first_seq``; ``first_offset``, when given, must
+    agree with where the server has that chunk starting. Chunks are durable
+    as soon as they are written, so a request that fails part way still
+    keeps (and reports through the status) every chunk before the failure.
+    """
+    directory = session_directory(session_id)
+    if get_trajectory_store().exists(session_id):
+        raise SessionFinalizedError(f"Session {session_id} is already completed")
+    upload = await run_in_threadpool(ResumableUpload.open, directory, upload_id)
+    try:
+        if first_seq > upload.next_seq:
+            raise UploadConflictError(
+                f"Expected chunk {upload.next_seq}, got {first_seq}; resume from the upload status"
+            )
+        if first_offset is not None and first_offset != upload.chunk_offset(first_seq):
+            raise UploadConflictError(
+                f"Chunk {first_seq} starts at offset {upload.chunk_offset(first_seq)}, not {first_offset}"
+            )
+        # A fresh upload continues from the segments already published.
+        previous = upload.last_timestamp
+        if not upload.entries:
+            previous = await run_in_threadpool(last_timestamp, directory)
+        decoder = FrameStreamDecoder(
+            max_chunk_bytes=settings.telemetry_max_chunk_bytes,
+            last_timestamp=previous,
+        )
+        seq = first_seq
+        chunks = duplicates = 0
+        try:
+            async for piece in body:
+                payloads = decoder.split(piece)
+                if decoder.layout is not None and upload.layout != decoder.layout.without_codec():
+                    await run_in_threadpool(upload.start, decoder.layout.without_codec())
+                for payload in payloads:
+                    if seq < upload.next_seq:
+                        upload.verify(seq, payload)
+                        duplicates += 1
+                    else:
+                        chunk = decoder.decode_chunk(payload)
+                        await run_in_threadpool(upload.append, payload, chunk)
+                        chunks += 1
+                    seq += 1
+            decoder.close()
+            if decoder.finished:
+                await run_in_threadpool(upload.commit)
+        finally:
+            await run_in_threadpool(upload.sync)
+        status = upload.status()
+    finally:
+        upload.close()
+
+    return ResumableIngestResult(
+        status=status,
+        chunks=chunks,
+        frames=decoder.frames,
+        duplicates=duplicates,
+        bytes_received=decoder.bytes_received,
+    )
@@ -0,0 +1,158 @@
+"""
+Trajectory replay streams.
+
+A replay is the session's trajectory re-encoded in the upload wire format
+(``app.telemetry.frames``): the stream header followed by length-prefixed,
+time-ordered chunks of ``chunk_frames`` records. The browser can decode it
+with the same parser as uploads and start playback after the first chunk.
+
+For a requested frame rate the coarsest stored LOD level that still meets it
+is chosen, then thinned further with a stride. Chunks are fixed size, so the
+byte offset of every chunk is known up front. This allows answering HTTP
+``Range`` requests without generating the bytes that precede the range.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from dataclasses import dataclass
+import math
+
+import numpy as np
+
+from app.telemetry.frames import CHUNK_PREFIX, STREAM_HEADER, FrameLayout, encode_chunk
+from app.telemetry.store import LOD_FACTOR, ColumnarTrajectory, TrajectoryStore
+
+DEFAULT_CHUNK_FRAMES = 512
+
+
+class UnsatisfiableRange(ValueError):
+    """Raised when a requested byte range lies outside the replay stream."""
+
+
+@dataclass(frozen=True)
+class ReplayPlan:
+    trajectory: ColumnarTrajectory
+    level: int
+    stride: int
+    start: int
+    stop: int
+    chunk_frames: int
+    layout: FrameLayout
+
+    @property
+    def frames(self) -> int:
+        return max(0, math.ceil((self.stop - self.start) / self.stride))
+
+    @property
+    def chunk_bytes(self) -> int:
+        """Size of one full chunk, including its length prefix."""
+        return CHUNK_PREFIX.size + self.chunk_frames * self.layout.record_size
+
+    @property
+    def total_bytes(self) -> int:
+        chunks = math.ceil(self.frames / self.chunk_frames)
+        return STREAM_HEADER.size + chunks * CHUNK_PREFIX.size + self.frames * self.layout.record_size
+
+    def iter_bytes(self, first: int = 0, last: int | None = None) -> Iterator[bytes]:
+        """Yield the stream's bytes ``first..last`` (inclusive), chunk by chunk."""
+        if last is None:
+            last = self.total_bytes - 1
+        header = self.layout.pack_header()
+        if first < len(header):
+            yield header[first : last + 1]
+
+        chunk_index = max(0, (first - STREAM_HEADER.size) // self.chunk_bytes)
+        position = STREAM_HEADER.size + chunk_index * self.chunk_bytes
+        records = np.empty(self.chunk_frames, dtype=self.layout.dtype)
+        while position <= last and chunk_index * self.chunk_frames < self.frames:
+            piece = encode_chunk(self._chunk_records(chunk_index, records))
+            yield piece[max(0, first - position) : last + 1 - position]
+            position += len(piece)
+            chunk_index += 1
+
+    def _chunk_records(self, chunk_index: int, records: np.ndarray) -> np.ndarray:
+        begin = self.start + chunk_index * self.chunk_frames * self.stride
+        end = min(self.stop, begin + self.chunk_frames * self.stride)
+        fields = self.trajectory.slice(begin, end)
+        count = len(range(begin, end, self.stride))
+        out = records[:count]
+        out["t"] = fields["t"][:: self.stride]
+        out["state"] = fields["state"][:: self.stride]
+        out["action"] = fields["action"][:: self.stride]
+        return out
+
+
+def plan_replay(
+    store: TrajectoryStore,
+    session_id: str,
+    fps: float | None = None,
+    t_start: float | None = None,
+    t_end: float | None = None,
+    chunk_frames: int = DEFAULT_CHUNK_FRAMES,
+) -> ReplayPlan:
+    """Pick the LOD level and stride for ``fps`` and the frame window to stream."""
+    levels = store.levels(session_id)
+    if not levels:
+        raise FileNotFoundError(f"Session {session_id} has no stored trajectory")
+
+    base = store.open(session_id)
+    level, stride = 0, 1
+    if fps is not None and base.frames > 1:
+        t = base["t"]
+        duration = float(t[-1] - t[0])
+        source_rate = (base.frames - 1) / duration if duration > 0 else float("inf")
+        ratio = max(1, int(source_rate // fps)) if math.isfinite(source_rate) else 1
+        while level + 1 < len(levels) and LOD_FACTOR ** (level + 1) <= ratio:
+            level += 1
+        stride = max(1, ratio // LOD_FACTOR**level)
+
+    trajectory = base if level == 0 else store.open(session_id, level)
+    start, stop = 0, trajectory.frames
+    if t_start is not None or t_end is not None:
+        t = trajectory["t"]
+        if t_start is not None:
+            start = int(np.searchsorted(t, t_start, side="left"))
+        if t_end is not None:
+            stop = int(np.searchsorted(t, t_end, side="left"))
+        stop = max(start, stop)
+
+    return ReplayPlan(
+        trajectory=trajectory,
+        level=level,
+        stride=stride,
+        start=start,
+        stop=stop,
+        chunk_frames=chunk_frames,
+        layout=FrameLayout(
+            state_dim=_width(trajectory["state"]),
+            action_dim=_width(trajectory["action"]),
+        ),
+    )
+
+
+def parse_range(header: str | None, total: int) -> tuple[int, int] | None:
+    """
+    Parse a single ``bytes=`` range into inclusive offsets. Returns ``None``
+    when the whole stream should be sent (no header, or a form we ignore,
+    such as multiple ranges).
+    """
+    if not header or not header.startswith("bytes=") or "," in header:
+        return None
+    first_text, _, last_text = header[len("bytes=") :].strip().partition("-")
+    try:
+        if first_text:
+            first = int(first_text)
+            last = int(last_text) if last_text else total - 1
+        else:
+            suffix = int(last_text)
+            first, last = max(0, total - suffix), total - 1 if suffix else -1
+    except ValueError:
+        return None
+    if first >= total or first > last:
+        raise UnsatisfiableRange(header)
+    return first, min(last, total - 1)
+
+
+def _width(values: np.ndarray) -> int:
+    return values.shape[1] if values.ndim == 2 else 1
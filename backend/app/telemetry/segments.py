@@ -0,0 +1,139 @@
+"""
+Per-session telemetry segment files.
+
+Each accepted upload becomes one segment: the 16-byte stream header followed
+by the raw records of every chunk, with the length prefixes stripped. Segments
+are therefore directly memory-mappable as a structured array.
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+import re
+import uuid
+
+import numpy as np
+
+from app.core.config import settings
+from app.telemetry.frames import STREAM_HEADER, FrameLayout
+
+SEGMENT_SUFFIX = ".seg"
+_SESSION_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class SegmentLayoutMismatch(ValueError):
+    """Raised when an upload's dimensions differ from earlier segments."""
+
+
+def session_directory(session_id: str) -> Path:
+    if not _SESSION_ID_PATTERN.match(session_id):
+        raise ValueError(f"Invalid session id {session_id!r}")
+    return Path(settings.telemetry_dir) / session_id
+
+
+def list_segments(directory: Path) -> list[Path]:
+    if not directory.is_dir():
+        return []
+    return sorted(directory.glob(f"*{SEGMENT_SUFFIX}"))
+
+
+def read_layout(path: Path) -> FrameLayout:
+    with path.open("rb") as fh:
+        return FrameLayout.unpack_header(fh.read(STREAM_HEADER.size))
+
+
+def open_segment(path: Path) -> np.ndarray:
+    """Memory-map a segment's records without reading them."""
+    layout = read_layout(path)
+    if path.stat().st_size == STREAM_HEADER.size:
+        return np.empty(0, dtype=layout.dtype)
+    return np.memmap(path, dtype=layout.dtype, mode="r", offset=STREAM_HEADER.size)
+
+
+def load_session_records(session_id: str) -> np.ndarray:
+    """
+    Return every record uploaded for a session, in segment order.
+
+    A single segment is returned as a read-only memory map; several segments
+    are concatenated into one contiguous array.
+    """
+    segments = [open_segment(path) for path in list_segments(session_directory(session_id))]
+    if not segments:
+        raise FileNotFoundError(f"No telemetry recorded for session {session_id}")
+    if len(segments) == 1:
+        return segments[0]
+    return np.concatenate(segments)
+
+
+def last_timestamp(directory: Path) -> float:
+    """Timestamp of the last record published for the session; ``-inf`` if none."""
+    for path in reversed(list_segments(directory)):
+        records = open_segment(path)
+        if len(records):
+            return float(records["t"][-1])
+    return -np.inf
+
+
+def check_layout(directory: Path, layout: FrameLayout) -> None:
+    existing = list_segments(directory)
+    if existing and read_layout(existing[0]) != layout:
+        raise SegmentLayoutMismatch(
+            "Telemetry dimensions differ from earlier uploads for this session"
+        )
+
+
+def publish_segment(directory: Path, source: Path) -> Path:
+    """
+    Hard-link ``source`` into ``directory`` as the next segment. Names are
+    claimed with ``os.link`` so concurrent uploads never overwrite each other.
+    """
+    index = len(list_segments(directory))
+    while True:
+        candidate = directory / f"{index:06d}{SEGMENT_SUFFIX}"
+        try:
+            os.link(source, candidate)
+        except FileExistsError:
+            index += 1
+            continue
+        return candidate
+
+
+class SegmentWriter:
+    """
+    Append chunk payloads to a temporary file and publish it as the next
+    segment on commit.
+    """
+
+    def __init__(self, directory: Path, layout: FrameLayout) -> None:
+        self.directory = directory
+        self.layout = layout
+        self.bytes_written = 0
+        self.path: Path | None = None
+        self._tmp_path = directory / f".{uuid.uuid4().hex}.tmp"
+        self._fh = None
+
+    @classmethod
+    def open(cls, directory: Path, layout: FrameLayout) -> "SegmentWriter":
+        directory.mkdir(parents=True, exist_ok=True)
+        check_layout(directory, layout)
+        writer = cls(directory, layout)
+        writer._fh = writer._tmp_path.open("wb")
+        writer._fh.write(layout.pack_header())
+        return writer
+
+    def write(self, payload: bytes) -> None:
+        self._fh.write(payload)
+        self.bytes_written += len(payload)
+
+    def commit(self) -> Path:
+        self._fh.close()
+        candidate = publish_segment(self.directory, self._tmp_path)
+        self._tmp_path.unlink()
+        self.path = candidate
+        return candidate
+
+    def abort(self) -> None:
+        if self._fh is not None and not self._fh.closed:
+            self._fh.close()
+        self._tmp_path.unlink(missing_ok=True)
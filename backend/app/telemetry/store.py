@@ -0,0 +1,286 @@
+"""
+Columnar trajectory store.
+
+A finished session is written once as a single ``.axtraj`` file: a small
+header index followed by one contiguous, 64-byte aligned array per field::
+
+    header : magic "AXTS" | version u16 | field_count u16 | frames u64 | 8 reserved bytes
+    field  : name 16s | dtype 8s | ndim u16 | 2 reserved | width u32 | offset u64 | nbytes u64
+    data   : field arrays at their offsets
+
+Readers map the file and get every field as a read-only NumPy view over the
+mapping, so slicing a field or a time range never copies. Segments
+(``app.telemetry.segments``) are the ingest staging area; ``finalize_session``
+folds them into the store when the session is completed.
+
+Alongside the full-rate file (level 0) the store keeps level-of-detail
+copies for replay: level ``k`` holds every ``LOD_FACTOR ** k``-th frame and
+levels stop once fewer than ``MIN_LOD_FRAMES`` frames would remain.
+
+``TrajectoryStore`` is the backend interface; ``LocalTrajectoryStore`` keeps
+files on the local filesystem. An object-store backend would implement the
+same methods, uploading the bytes from ``pack_columns`` and handing a
+downloaded or ranged buffer to ``ColumnarTrajectory.from_buffer``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from functools import lru_cache
+import logging
+import mmap
+import os
+from pathlib import Path
+import shutil
+import struct
+import uuid
+
+import numpy as np
+
+from app.core.config import settings
+from app.telemetry.frames import TelemetryFormatError
+from app.telemetry.segments import list_segments, load_session_records, session_directory
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"AXTS"
+VERSION = 1
+TRAJECTORY_SUFFIX = ".axtraj"
+ALIGNMENT = 64
+LOD_FACTOR = 4
+MIN_LOD_FRAMES = 256
+
+STORE_HEADER = struct.Struct("<4sHHQ8x")
+FIELD_ENTRY = struct.Struct("<16s8sH2xIQQ")
+
+
+class SessionFinalizedError(Exception):
+    """Raised when telemetry is uploaded for a session that was already finalized."""
+
+
+def _align(offset: int) -> int:
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def pack_columns(columns: Mapping[str, np.ndarray]) -> list[bytes | memoryview]:
+    """
+    Lay out ``columns`` in the store format. Returns the pieces to write in
+    order (header, padding and each array's buffer) so large arrays are never
+    copied into one bytes object.
+    """
+    frames = None
+    arrays: list[tuple[str, np.ndarray]] = []
+    for name, values in columns.items():
+        array = np.ascontiguousarray(values)
+        if array.dtype.byteorder == ">":
+            array = array.astype(array.dtype.newbyteorder("<"))
+        if array.ndim not in (1, 2):
+            raise ValueError(f"Field {name!r} must be 1- or 2-dimensional")
+        if frames is None:
+            frames = len(array)
+        elif len(array) != frames:
+            raise ValueError(f"Field {name!r} has {len(array)} frames, expected {frames}")
+        if len(name.encode()) > 16:
+            raise ValueError(f"Field name {name!r} is longer than 16 bytes")
+        arrays.append((name, array))
+
+    offset = _align(STORE_HEADER.size + FIELD_ENTRY.size * len(arrays))
+    entries = []
+    pieces: list[bytes | memoryview] = []
+    position = offset
+    for name, array in arrays:
+        width = array.shape[1] if array.ndim == 2 else 1
+        entries.append(
+            FIELD_ENTRY.pack(
+                name.encode(), array.dtype.str.encode(), array.ndim, width, position, array.nbytes
+            )
+        )
+        pieces.append(memoryview(array.reshape(-1)).cast("B") if array.size else b"")
+        position = _align(position + array.nbytes)
+
+    header = STORE_HEADER.pack(MAGIC, VERSION, len(arrays), frames or 0) + b"".join(entries)
+    out: list[bytes | memoryview] = [header.ljust(offset, b"\0")]
+    written = offset
+    for piece in pieces:
+        out.append(piece)
+        written += len(piece)
+        padding = _align(written) - written
+        if padding:
+            out.append(b"\0" * padding)
+            written += padding
+    return out
+
+
+class ColumnarTrajectory:
+    """Read-only field views over one stored trajectory."""
+
+    def __init__(self, frames: int, fields: dict[str, np.ndarray]) -> None:
+        self.frames = frames
+        self.fields = fields
+
+    @classmethod
+    def from_buffer(cls, buffer: bytes | memoryview | mmap.mmap) -> "ColumnarTrajectory":
+        if len(buffer) < STORE_HEADER.size:
+            raise TelemetryFormatError("Trajectory file is truncated")
+        magic, version, field_count, frames = STORE_HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            raise TelemetryFormatError("Trajectory file has an unknown magic number")
+        if version != VERSION:
+            raise TelemetryFormatError(f"Unsupported trajectory file version {version}")
+
+        fields: dict[str, np.ndarray] = {}
+        for index in range(field_count):
+            raw_name, raw_dtype, ndim, width, offset, nbytes = FIELD_ENTRY.unpack_from(
+                buffer, STORE_HEADER.size + index * FIELD_ENTRY.size
+            )
+            name = raw_name.rstrip(b"\0").decode()
+            dtype = np.dtype(raw_dtype.rstrip(b"\0").decode())
+            shape = (frames, width) if ndim == 2 else (frames,)
+            if nbytes != dtype.itemsize * frames * width or offset + nbytes > len(buffer):
+                raise TelemetryFormatError(f"Trajectory field {name!r} is truncated")
+            if nbytes == 0:
+                fields[name] = np.empty(shape, dtype=dtype)
+                continue
+            view = np.frombuffer(buffer, dtype=dtype, count=frames * width, offset=offset)
+            fields[name] = view.reshape(shape)
+        return cls(frames=frames, fields=fields)
+
+    def __len__(self) -> int:
+        return self.frames
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self.fields[name]
+
+    def slice(self, start: int, stop: int) -> dict[str, np.ndarray]:
+        """Views of every field for frames ``[start, stop)``."""
+        return {name: values[start:stop] for name, values in self.fields.items()}
+
+    def time_range(self, t_start: float, t_end: float) -> dict[str, np.ndarray]:
+        """Views of every field for ``t_start <= t < t_end`` (``t`` is non-decreasing)."""
+        t = self.fields["t"]
+        start, stop = np.searchsorted(t, [t_start, t_end], side="left")
+        return self.slice(int(start), int(stop))
+
+
+class TrajectoryStore:
+    def write(self, session_id: str, columns: Mapping[str, np.ndarray], level: int = 0) -> None:
+        raise NotImplementedError
+
+    def open(self, session_id: str, level: int = 0) -> ColumnarTrajectory:
+        """Raise ``FileNotFoundError`` if the session (or level) has not been stored."""
+        raise NotImplementedError
+
+    def exists(self, session_id: str, level: int = 0) -> bool:
+        raise NotImplementedError
+
+    def levels(self, session_id: str) -> list[int]:
+        """Stored levels in ascending order; empty if the session is not stored."""
+        levels = []
+        while self.exists(session_id, len(levels)):
+            levels.append(len(levels))
+        return levels
+
+    def delete(self, session_id: str) -> None:
+        raise NotImplementedError
+
+
+class LocalTrajectoryStore(TrajectoryStore):
+    def __init__(self, root: Path) -> None:
+        self.root = Path(root)
+
+    def path_for(self, session_id: str, level: int = 0) -> Path:
+        # Reuse the segment id check so ids can never escape the root.
+        session_directory(session_id)
+        name = session_id if level == 0 else f"{session_id}.lod{level}"
+        return self.root / session_id[:2] / f"{name}{TRAJECTORY_SUFFIX}"
+
+    def write(self, session_id: str, columns: Mapping[str, np.ndarray], level: int = 0) -> None:
+        path = self.path_for(session_id, level)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.parent / f".{uuid.uuid4().hex}.tmp"
+        try:
+            with tmp_path.open("wb") as fh:
+                for piece in pack_columns(columns):
+                    fh.write(piece)
+                fh.flush()
+                os.fsync(fh.fileno())
+            os.replace(tmp_path, path)
+        except BaseException:
+            tmp_path.unlink(missing_ok=True)
+            raise
+
+    def open(self, session_id: str, level: int = 0) -> ColumnarTrajectory:
+        with self.path_for(session_id, level).open("rb") as fh:
+            mapped = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        # The field views keep the mapping alive.
+        return ColumnarTrajectory.from_buffer(mapped)
+
+    def exists(self, session_id: str, level: int = 0) -> bool:
+        return self.path_for(session_id, level).is_file()
+
+    def delete(self, session_id: str) -> None:
+        # Remove the LOD files first so a partial delete never leaves level 0 missing.
+        for level in reversed(self.levels(session_id)):
+            self.path_for(session_id, level).unlink(missing_ok=True)
+
+
+@lru_cache
+def get_trajectory_store() -> TrajectoryStore:
+    return LocalTrajectoryStore(settings.trajectory_store_dir)
+
+
+def finalize_session(session_id: str) -> ColumnarTrajectory:
+    """
+    Fold a session's uploaded segments into the store and return it.
+
+    Once stored, the segments are removed; a session that was already
+    finalized (e.g. when it is re-scored) is opened as is. The stored file
+    is never rewritten: segments found next to it are either copies left by
+    a finalize interrupted before cleanup, or uploads that raced the
+    completion and arrived too late; both are discarded.
+    """
+    store = get_trajectory_store()
+    directory = session_directory(session_id)
+    leftover = list_segments(directory)
+    if store.exists(session_id):
+        if leftover:
+            logger.warning(
+                "Discarding telemetry segments of finalized session session_id=%s segments=%s",
+                session_id,
+                len(leftover),
+            )
+            # An interrupted finalize may also have stopped before the LODs.
+            build_lods(store, session_id, store.open(session_id))
+            shutil.rmtree(directory, ignore_errors=True)
+        return store.open(session_id)
+    if not leftover:
+        return store.open(session_id)
+    records = load_session_records(session_id)
+    t = records["t"]
+    if len(t) > 1 and (t[1:] < t[:-1]).any():
+        # Uploads that ran concurrently can publish overlapping segments;
+        # readers rely on ``t`` being non-decreasing, so merge them in time order.
+        logger.warning("Merging overlapping telemetry segments session_id=%s", session_id)
+        records = records[np.argsort(t, kind="stable")]
+    store.write(
+        session_id,
+        {"t": records["t"], "state": records["state"], "action": records["action"]},
+    )
+    build_lods(store, session_id, store.open(session_id))
+    shutil.rmtree(directory, ignore_errors=True)
+    return store.open(session_id)
+
+
+def build_lods(store: TrajectoryStore, session_id: str, base: ColumnarTrajectory) -> int:
+    """Write decimated replay levels for a stored session; returns the top level."""
+    level = 0
+    stride = LOD_FACTOR
+    while base.frames // stride >= MIN_LOD_FRAMES:
+        level += 1
+        store.write(
+            session_id,
+            {name: values[::stride] for name, values in base.fields.items()},
+            level=level,
+        )
+        stride *= LOD_FACTOR
+    return level
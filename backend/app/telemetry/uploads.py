@@ -0,0 +1,267 @@
+"""
+Resumable telemetry uploads.
+
+A client that may lose its connection names its upload (``upload_id``) and
+numbers the chunks of its stream: chunk ``seq`` is the ``seq``-th chunk
+after the stream header, and its offset is where its length prefix starts
+in the complete stream. Each request carries a stream header followed by
+the chunks from some ``first_seq`` on, i.e. ``header + stream[offset:]``.
+
+Chunks are acknowledged in the response once written. Chunks the server
+already has (``seq`` below ``next_seq``) are matched against the BLAKE2b
+digest recorded for them and skipped without decoding or writing; a
+different digest is a conflict. A chunk past ``next_seq`` is a gap and is
+rejected too, so what is stored is always a contiguous prefix of the
+client's stream. After an interruption the client reads ``next_seq`` and
+``offset`` from the status and resumes there. The end-of-stream marker
+completes the upload and publishes its records as one segment.
+
+State lives with the session's segments, in ``.uploads/<upload_id>/``:
+
+- ``records.part``: the stream header and decoded records, in segment
+  layout. On completion it is hard-linked in as the segment;
+- ``chunks.idx``: one ``INDEX_ENTRY`` per accepted chunk (end offset in the
+  client's stream, size of ``records.part`` after it, its last timestamp and
+  the digest of its wire payload);
+- ``segment``: the published segment's name, once complete.
+
+Completing the session folds the segments into the trajectory store and
+removes this state with them; from then on the session answers every
+upload and status request with a conflict instead.
+
+Records are written before their index entry and both are fsynced before a
+request is acknowledged; on open, whichever file is ahead is cut back to
+the other. Requests for one upload are serialized with a non-blocking
+``flock``; a concurrent one gets ``UploadBusyError``.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+import fcntl
+import hashlib
+import os
+from pathlib import Path
+import re
+import struct
+
+import numpy as np
+
+from app.telemetry.frames import CHUNK_PREFIX, STREAM_HEADER, DecodedChunk, FrameLayout
+from app.telemetry.segments import check_layout, publish_segment
+
+UPLOADS_DIRNAME = ".uploads"
+PART_NAME = "records.part"
+INDEX_NAME = "chunks.idx"
+SEGMENT_MARKER = "segment"
+DIGEST_SIZE = 16
+INDEX_ENTRY = struct.Struct(f"<QQd{DIGEST_SIZE}s")
+_UPLOAD_ID_PATTERN = re.compile(r"^[A-Za-z0-9_-]{1,64}$")
+
+
+class UploadConflictError(ValueError):
+    """Raised when a chunk contradicts the upload: a gap, a changed digest or offset."""
+
+
+class UploadBusyError(Exception):
+    """Raised when another request is writing to the same upload."""
+
+
+class UnknownUploadError(LookupError):
+    """Raised when asking for the status of an upload that never started."""
+
+
+@dataclass(frozen=True)
+class ChunkEntry:
+    end_offset: int
+    part_size: int
+    last_timestamp: float
+    digest: bytes
+
+
+@dataclass(frozen=True)
+class UploadStatus:
+    upload_id: str
+    # Next chunk the server expects, and where it starts in the client's stream.
+    next_seq: int
+    offset: int
+    frames: int
+    complete: bool
+    segment: str | None
+
+    @property
+    def last_seq(self) -> int | None:
+        """Highest chunk of the contiguous prefix received, if any."""
+        return self.next_seq - 1 if self.next_seq else None
+
+
+def chunk_digest(payload: bytes) -> bytes:
+    return hashlib.blake2b(payload, digest_size=DIGEST_SIZE).digest()
+
+
+def upload_directory(session_directory: Path, upload_id: str) -> Path:
+    if not _UPLOAD_ID_PATTERN.match(upload_id):
+        raise ValueError(f"Invalid upload id {upload_id!r}")
+    return session_directory / UPLOADS_DIRNAME / upload_id
+
+
+def _read_entries(index_path: Path) -> list[ChunkEntry]:
+    data = index_path.read_bytes() if index_path.exists() else b""
+    # A torn trailing entry (crash mid-write) is ignored.
+    usable = len(data) - len(data) % INDEX_ENTRY.size
+    return [ChunkEntry(*fields) for fields in INDEX_ENTRY.iter_unpack(data[:usable])]
+
+
+def _frames(layout: FrameLayout | None, part_size: int) -> int:
+    if layout is None:
+        return 0
+    return (part_size - STREAM_HEADER.size) // layout.record_size
+
+
+def _read_part_layout(part_path: Path) -> FrameLayout | None:
+    try:
+        with part_path.open("rb") as fh:
+            header = fh.read(STREAM_HEADER.size)
+    except FileNotFoundError:
+        return None
+    return FrameLayout.unpack_header(header) if len(header) == STREAM_HEADER.size else None
+
+
+def _status(path: Path, upload_id: str, entries: list[ChunkEntry]) -> UploadStatus:
+    marker = path / SEGMENT_MARKER
+    segment = marker.read_text() if marker.exists() else None
+    last = entries[-1] if entries else None
+    return UploadStatus(
+        upload_id=upload_id,
+        next_seq=len(entries),
+        offset=last.end_offset if last else STREAM_HEADER.size,
+        frames=_frames(_read_part_layout(path / PART_NAME), last.part_size) if last else 0,
+        complete=segment is not None,
+        segment=segment,
+    )
+
+
+def read_status(session_directory: Path, upload_id: str) -> UploadStatus:
+    """Status of an upload as of its last acknowledged chunk. Takes no lock."""
+    path = upload_directory(session_directory, upload_id)
+    if not path.is_dir():
+        raise UnknownUploadError(f"Unknown upload {upload_id!r}")
+    return _status(path, upload_id, _read_entries(path / INDEX_NAME))
+
+
+class ResumableUpload:
+    """One request's exclusive handle on an upload; always ``close()`` it."""
+
+    def __init__(self, session_directory: Path, upload_id: str) -> None:
+        self.session_directory = session_directory
+        self.upload_id = upload_id
+        self.path = upload_directory(session_directory, upload_id)
+        self.entries: list[ChunkEntry] = []
+        self.layout: FrameLayout | None = None
+        self._index = None
+        self._part = None
+
+    @classmethod
+    def open(cls, session_directory: Path, upload_id: str) -> "ResumableUpload":
+        upload = cls(session_directory, upload_id)
+        upload.path.mkdir(parents=True, exist_ok=True)
+        upload._index = (upload.path / INDEX_NAME).open("a+b")
+        try:
+            fcntl.flock(upload._index.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError as exc:
+            upload._index.close()
+            raise UploadBusyError(f"Upload {upload_id!r} is being written by another request") from exc
+        upload._recover()
+        return upload
+
+    @property
+    def next_seq(self) -> int:
+        return len(self.entries)
+
+    @property
+    def complete(self) -> bool:
+        return (self.path / SEGMENT_MARKER).exists()
+
+    @property
+    def last_timestamp(self) -> float:
+        return self.entries[-1].last_timestamp if self.entries else -np.inf
+
+    def chunk_offset(self, seq: int) -> int:
+        """Where chunk ``seq`` (at most ``next_seq``) starts in the client's stream."""
+        return self.entries[seq - 1].end_offset if seq else STREAM_HEADER.size
+
+    def status(self) -> UploadStatus:
+        return _status(self.path, self.upload_id, self.entries)
+
+    def start(self, layout: FrameLayout) -> None:
+        """Check or record the upload's layout; ``layout`` is the decoded (codec-free) one."""
+        if self.layout is None:
+            check_layout(self.session_directory, layout)
+            self._part.write(layout.pack_header())
+            self.layout = layout
+        elif layout != self.layout:
+            raise UploadConflictError("Telemetry dimensions differ from earlier chunks of this upload")
+
+    def verify(self, seq: int, payload: bytes) -> None:
+        """Accept a resent chunk as a no-op if it is the one already stored."""
+        if chunk_digest(payload) != self.entries[seq].digest:
+            raise UploadConflictError(f"Chunk {seq} differs from the copy already received")
+
+    def append(self, payload: bytes, chunk: DecodedChunk) -> None:
+        """Store the next chunk; ``payload`` is its wire form, as digested."""
+        if self.complete:
+            raise UploadConflictError(f"Upload {self.upload_id!r} is already complete")
+        self._part.write(chunk.payload)
+        self._part.flush()
+        entry = ChunkEntry(
+            end_offset=self.chunk_offset(self.next_seq) + CHUNK_PREFIX.size + len(payload),
+            part_size=self._part.tell(),
+            last_timestamp=float(chunk.records["t"][-1]),
+            digest=chunk_digest(payload),
+        )
+        self._index.write(INDEX_ENTRY.pack(entry.end_offset, entry.part_size, entry.last_timestamp, entry.digest))
+        self.entries.append(entry)
+
+    def sync(self) -> None:
+        """Make every appended chunk durable; call before acknowledging them."""
+        for fh in (self._part, self._index):
+            fh.flush()
+            os.fsync(fh.fileno())
+
+    def commit(self) -> str:
+        """Publish the records as a segment; a completed upload returns its segment again."""
+        marker = self.path / SEGMENT_MARKER
+        if marker.exists():
+            return marker.read_text()
+        self.sync()
+        segment = publish_segment(self.session_directory, self.path / PART_NAME)
+        tmp_marker = self.path / f".{SEGMENT_MARKER}.tmp"
+        tmp_marker.write_text(segment.name)
+        os.replace(tmp_marker, marker)
+        return segment.name
+
+    def close(self) -> None:
+        if self._part is not None:
+            self._part.close()
+        if self._index is not None:
+            # Closing the file releases the lock.
+            self._index.close()
+
+    def _recover(self) -> None:
+        """Load the index and cut back whichever of the two files is ahead."""
+        part_path = self.path / PART_NAME
+        part_size = part_path.stat().st_size if part_path.exists() else 0
+        entries = _read_entries(self.path / INDEX_NAME)
+        while entries and entries[-1].part_size > part_size:
+            entries.pop()
+        self.entries = entries
+        self._index.truncate(len(entries) * INDEX_ENTRY.size)
+        self._index.seek(0, os.SEEK_END)
+
+        self.layout = _read_part_layout(part_path)
+        keep = entries[-1].part_size if entries else (STREAM_HEADER.size if self.layout else 0)
+        self._part = part_path.open("r+b" if part_path.exists() else "w+b")
+        # Once complete the part is also the published segment; never cut it.
+        if not self.complete:
+            self._part.truncate(keep)
+        self._part.seek(keep)
@@ -1,16 +1,66 @@
-from fastapi import APIRouter
+from typing import Literal
 
-router = APIRouter(prefix="/me", tags=["users"])
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.auth.dependencies import get_current_user
+from app.core.database import get_async_db
+from app.models import User, UserContribution
+from app.schemas.task_session import TaskSessionHistoryResponse, TaskSessionRead
+from app.schemas.user import UserProfile
+from app.services.contributions import level_for
+from app.services.history import (
+    DEFAULT_HISTORY_PAGE_SIZE,
+    MAX_HISTORY_PAGE_SIZE,
+    HistoryQuery,
+    fetch_history_page,
+)
+from app.services.task_catalog import InvalidCursorError
 
+router = APIRouter(prefix="/me", tags=["users"])
 
-@router.get("/", summary="Get current user profile")
-def get_profile() -> dict[str, str]:
-    # TODO: return actual user profile
-    return {"message": "profile placeholder"}
 
+@router.get("/", response_model=UserProfile, summary="Get current user profile")
+async def get_profile(
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> UserProfile:
+    # Totals are maintained by the contribution ledger; one primary-key read.
+    totals = await db.get(UserContribution, user.id)
+    total = totals.total_contribution if totals is not None else 0
+    progress = level_for(total)
+    return UserProfile(
+        id=user.id,
+        email=user.email,
+        default_wallet_address=user.default_wallet_address,
+        created_at=user.created_at,
+        total_contribution=total,
+        sessions_count=totals.sessions_count if totals is not None else 0,
+        level=progress.level,
+        next_level_at=progress.next_level_at,
+        to_next_level=progress.to_next_level,
+    )
 
-@router.get("/history", summary="List user session history")
-def list_history() -> dict[str, list]:
-    # TODO: return actual session history
-    return {"sessions": []}
 
+@router.get(
+    "/history",
+    response_model=TaskSessionHistoryResponse,
+    summary="List user session history",
+)
+async def list_history(
+    task_id: int | None = Query(None),
+    outcome: Literal["in_progress", "success", "failure", "completed"] | None = Query(None),
+    limit: int = Query(DEFAULT_HISTORY_PAGE_SIZE, ge=1, le=MAX_HISTORY_PAGE_SIZE),
+    cursor: str | None = Query(None, description="Opaque cursor from the previous page."),
+    user: User = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db),
+) -> TaskSessionHistoryResponse:
+    query = HistoryQuery(task_id=task_id, outcome=outcome, limit=limit, cursor=cursor)
+    try:
+        rows, next_cursor = await fetch_history_page(db, user.id, query)
+    except InvalidCursorError as exc:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(exc)) from exc
+    return TaskSessionHistoryResponse(
+        sessions=[TaskSessionRead.model_validate(row) for row in rows],
+        next_cursor=next_cursor,
+    )
@@ -0,0 +1,8 @@
+"""
+Load tests and latency benchmarks for the API.
+
+Not part of the application: ``python -m benchmarks`` (or ``make bench``)
+seeds a throwaway database, starts the app under uvicorn and reports
+p50/p95/p99 latency and throughput per scenario as JSON, optionally
+compared against a saved baseline.
+"""
@@ -0,0 +1,100 @@
+"""
+Run the API benchmark suite.
+
+Usage: ``python -m benchmarks [--scenario NAME ...] [--concurrency N]
+[--duration S] [--users N] [--tasks N] [--sessions N] [--database-url URL]
+[--output FILE] [--baseline FILE] [--tolerance F]``. Prints the JSON report;
+with ``--baseline`` it also compares against a saved report and exits with
+status 1 when a scenario regressed.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+from pathlib import Path
+import sys
+import tempfile
+
+import httpx
+
+from benchmarks.harness import SeedSize, prepare_environment, run_server, seed_database
+from benchmarks.report import build_report, compare
+from benchmarks.scenarios import SCENARIOS, ScenarioContext, prepare_context, run_scenario
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks", description=__doc__.split("\n\n")[0])
+    parser.add_argument(
+        "--scenario",
+        action="append",
+        choices=sorted(SCENARIOS),
+        default=[],
+        help="Repeat for several; all scenarios by default.",
+    )
+    parser.add_argument("--concurrency", type=int, default=16, help="Concurrent client connections.")
+    parser.add_argument("--duration", type=float, default=10.0, help="Measured seconds per scenario.")
+    parser.add_argument("--warmup", type=float, default=2.0, help="Unmeasured seconds per scenario.")
+    parser.add_argument("--server-workers", type=int, default=1, help="uvicorn worker processes.")
+    parser.add_argument("--users", type=int, default=SeedSize.users)
+    parser.add_argument("--tasks", type=int, default=SeedSize.tasks)
+    parser.add_argument("--sessions", type=int, default=SeedSize.sessions)
+    parser.add_argument(
+        "--database-url",
+        default=None,
+        help="Throwaway database to use instead of SQLite; its tables are dropped and recreated.",
+    )
+    parser.add_argument("--workdir", type=Path, default=None, help="Keep the database and server log here.")
+    parser.add_argument("--output", type=Path, default=None, help="Also write the report to this file.")
+    parser.add_argument("--baseline", type=Path, default=None, help="Saved report to compare against.")
+    parser.add_argument("--tolerance", type=float, default=0.10, help="Allowed relative regression.")
+    return parser.parse_args()
+
+
+async def _drive(base_url: str, ctx: ScenarioContext, args: argparse.Namespace, names: list[str]) -> list:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=30.0) as client:
+        await prepare_context(client, ctx)
+        return [
+            await run_scenario(client, ctx, SCENARIOS[name], args.concurrency, args.duration, args.warmup)
+            for name in names
+        ]
+
+
+def main() -> int:
+    args = _parse_args()
+    names = args.scenario or list(SCENARIOS)
+    size = SeedSize(users=args.users, tasks=args.tasks, sessions=args.sessions)
+
+    with tempfile.TemporaryDirectory(prefix="axis-bench-") as tmp:
+        bench = prepare_environment(args.workdir or Path(tmp), args.database_url)
+        seed_database(size)
+        with run_server(bench, workers=args.server_workers) as base_url:
+            results = asyncio.run(_drive(base_url, ScenarioContext(bench=bench, size=size), args, names))
+
+    report = build_report(
+        results,
+        {
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "server_workers": args.server_workers,
+            "database": bench.database_url.split(":", 1)[0],
+            "seed": vars(size),
+        },
+    )
+    status = 0
+    if args.baseline is not None:
+        report["comparison"] = compare(report, json.loads(args.baseline.read_text()), args.tolerance)
+        status = 1 if report["comparison"]["regressed"] else 0
+
+    text = json.dumps(report, indent=2)
+    if args.output is not None:
+        args.output.write_text(text + "\n")
+    print(text)
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,204 @@
+"""
+Benchmark environment: a throwaway database, a seeded data set and the API
+running under uvicorn in a child process.
+
+The server runs in its own process so the load generator does not compete
+with it for the GIL. Everything it needs is passed through the environment:
+an SQLite file in the work directory unless ``database_url`` points at a
+throwaway Postgres, the in-memory Redis stand-in, and a freshly generated
+ES256 key pair as the static Privy verification key, so token exchange is
+verified for real without talking to Privy.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+import os
+from pathlib import Path
+import socket
+import subprocess
+import sys
+import time
+
+import httpx
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import ec
+from jose import jwt
+
+BACKEND_ROOT = Path(__file__).resolve().parents[1]
+PRIVY_APP_ID = "axis-bench"
+STARTUP_TIMEOUT_SECONDS = 30.0
+
+
+@dataclass(frozen=True)
+class SeedSize:
+    users: int = 1000
+    tasks: int = 50
+    sessions: int = 10000
+
+
+@dataclass
+class BenchEnvironment:
+    workdir: Path
+    database_url: str
+    private_key: str
+    env: dict[str, str] = field(default_factory=dict)
+
+    def privy_token(self, user_id: str, privy_session_id: str) -> str:
+        now = int(time.time())
+        return jwt.encode(
+            {
+                "sub": user_id,
+                "sid": privy_session_id,
+                "aud": PRIVY_APP_ID,
+                "iss": "privy.io",
+                "iat": now,
+                "exp": now + 3600,
+            },
+            self.private_key,
+            algorithm="ES256",
+        )
+
+
+def prepare_environment(workdir: Path, database_url: str | None = None) -> BenchEnvironment:
+    """
+    Point this process (for seeding) and the server at the benchmark
+    database. Must run before anything from ``app`` is imported.
+    """
+    workdir.mkdir(parents=True, exist_ok=True)
+    key = ec.generate_private_key(ec.SECP256R1())
+    private_key = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_key = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+
+    database_url = database_url or f"sqlite:///{workdir / 'bench.db'}"
+    env = {
+        "DATABASE_URL": database_url,
+        "REDIS_URL": "memory://",
+        "PRIVY_APP_ID": PRIVY_APP_ID,
+        "PRIVY_VERIFICATION_KEY": public_key,
+        "TELEMETRY_DIR": str(workdir / "telemetry"),
+        "TRAJECTORY_STORE_DIR": str(workdir / "trajectories"),
+        "LEADERBOARD_REBUILD_ON_STARTUP": "false",
+        # A handful of load-generator clients would trip the per-IP/per-user
+        # limits; set RATE_LIMIT_ENABLED=true to benchmark admission control.
+        "RATE_LIMIT_ENABLED": os.environ.get("RATE_LIMIT_ENABLED", "false"),
+    }
+    os.environ.update(env)
+    return BenchEnvironment(workdir=workdir, database_url=database_url, private_key=private_key, env=env)
+
+
+def seed_database(size: SeedSize) -> None:
+    """Recreate all tables and fill them with a synthetic data set."""
+    from app.core.database import SessionLocal, engine
+    from app.models import Base, Task, TaskSession, User
+    from app.models.task_session import OUTCOME_FAILURE, OUTCOME_IN_PROGRESS, OUTCOME_SUCCESS
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    now = datetime.now(timezone.utc)
+    outcomes = (OUTCOME_SUCCESS, OUTCOME_FAILURE, OUTCOME_IN_PROGRESS)
+    with SessionLocal() as db:
+        db.add_all(
+            Task(
+                id=task_id,
+                name=f"Benchmark task {task_id}",
+                description="Synthetic task for load testing.",
+                difficulty=("easy", "medium", "hard")[task_id % 3],
+                task_type=("manipulation", "navigation")[task_id % 2],
+                expected_duration=5 + task_id % 30,
+                success_rate=50.0,
+                thumbnail=f"/thumbnails/{task_id}.png",
+            )
+            for task_id in range(1, size.tasks + 1)
+        )
+        db.add_all(User(id=bench_user_id(index), email=f"bench{index}@example.com") for index in range(size.users))
+        db.flush()
+        for index in range(size.sessions):
+            outcome = outcomes[index % len(outcomes)]
+            db.add(
+                TaskSession(
+                    id=f"bench-{index:08d}",
+                    user_id=bench_user_id(index % size.users),
+                    task_id=index % size.tasks + 1,
+                    started_at=now - timedelta(minutes=index),
+                    completed_at=None if outcome == OUTCOME_IN_PROGRESS else now - timedelta(minutes=index - 5),
+                    outcome=outcome,
+                    contribution=None if outcome == OUTCOME_IN_PROGRESS else index % 100,
+                )
+            )
+        db.commit()
+    engine.dispose()
+
+
+def bench_user_id(index: int) -> str:
+    return f"did:privy:bench-{index}"
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+@contextmanager
+def run_server(bench: BenchEnvironment, workers: int = 1) -> Iterator[str]:
+    """Run the API under uvicorn and yield its base URL once it is healthy."""
+    port = _free_port()
+    command = [
+        sys.executable,
+        "-m",
+        "uvicorn",
+        "app.main:app",
+        "--host",
+        "127.0.0.1",
+        "--port",
+        str(port),
+        "--workers",
+        str(workers),
+        "--log-level",
+        "warning",
+        "--no-access-log",
+    ]
+    with open(bench.workdir / "server.log", "wb") as log:
+        process = subprocess.Popen(
+            command,
+            cwd=BACKEND_ROOT,
+            env={**os.environ, **bench.env},
+            stdout=log,
+            stderr=subprocess.STDOUT,
+        )
+        base_url = f"http://127.0.0.1:{port}"
+        try:
+            _wait_until_healthy(process, base_url)
+            yield base_url
+        finally:
+            process.terminate()
+            try:
+                process.wait(timeout=10)
+            except subprocess.TimeoutExpired:
+                process.kill()
+                process.wait()
+
+
+def _wait_until_healthy(process: subprocess.Popen, base_url: str) -> None:
+    deadline = time.monotonic() + STARTUP_TIMEOUT_SECONDS
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Server exited during startup with code {process.returncode}")
+        try:
+            if httpx.get(f"{base_url}/health", timeout=1.0).status_code == 200:
+                return
+        except httpx.TransportError:
+            pass
+        time.sleep(0.1)
+    raise RuntimeError("Server did not become healthy in time")
@@ -0,0 +1,97 @@
+"""
+Benchmark reports and baseline comparison.
+
+A report is plain JSON: run metadata plus, per scenario, request and error
+counts, throughput and p50/p95/p99 latency in milliseconds. Comparing
+against a saved baseline flags a scenario as regressed when its p95 or p99
+grows, or its throughput drops, by more than the tolerance.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime, timezone
+import math
+import platform
+import subprocess
+from typing import Any
+
+from benchmarks.harness import BACKEND_ROOT
+from benchmarks.scenarios import ScenarioResult
+
+PERCENTILES = (50, 95, 99)
+
+
+def percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of a non-empty ascending list."""
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+def summarize(result: ScenarioResult) -> dict[str, Any]:
+    latencies = sorted(result.latencies)
+    summary: dict[str, Any] = {
+        "requests": len(latencies),
+        "errors": result.errors,
+        "duration_s": round(result.elapsed, 3),
+        "throughput_rps": round(len(latencies) / result.elapsed, 2) if result.elapsed else 0.0,
+        "latency_ms": None,
+    }
+    if latencies:
+        summary["latency_ms"] = {
+            f"p{pct}": round(percentile(latencies, pct) * 1000, 3) for pct in PERCENTILES
+        }
+        summary["latency_ms"]["mean"] = round(sum(latencies) / len(latencies) * 1000, 3)
+        summary["latency_ms"]["max"] = round(latencies[-1] * 1000, 3)
+    return summary
+
+
+def build_report(results: list[ScenarioResult], config: dict[str, Any]) -> dict[str, Any]:
+    return {
+        "meta": {
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            "git_commit": _git_commit(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "config": config,
+        },
+        "scenarios": {result.name: summarize(result) for result in results},
+    }
+
+
+def compare(report: dict[str, Any], baseline: dict[str, Any], tolerance: float) -> dict[str, Any]:
+    """Per-scenario ratios against ``baseline`` and whether any regressed."""
+    scenarios: dict[str, Any] = {}
+    regressed = False
+    for name, current in report["scenarios"].items():
+        previous = baseline.get("scenarios", {}).get(name)
+        if previous is None or not previous["latency_ms"] or not current["latency_ms"]:
+            continue
+        entry: dict[str, Any] = {}
+        for pct in ("p95", "p99"):
+            entry[f"{pct}_ratio"] = _ratio(current["latency_ms"][pct], previous["latency_ms"][pct])
+        entry["throughput_ratio"] = _ratio(current["throughput_rps"], previous["throughput_rps"])
+        entry["regressed"] = (
+            any(entry[f"{pct}_ratio"] > 1 + tolerance for pct in ("p95", "p99"))
+            or entry["throughput_ratio"] < 1 - tolerance
+        )
+        regressed = regressed or entry["regressed"]
+        scenarios[name] = entry
+    return {"tolerance": tolerance, "regressed": regressed, "scenarios": scenarios}
+
+
+def _ratio(current: float, previous: float) -> float:
+    return round(current / previous, 3)
+
+
+def _git_commit() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "HEAD"],
+            cwd=BACKEND_ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
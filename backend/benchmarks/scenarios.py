@@ -0,0 +1,184 @@
+"""
+Load scenarios and the closed-loop driver.
+
+Each scenario builds one request at a time from a shared ``ScenarioContext``.
+``concurrency`` workers issue requests back to back for ``duration``
+seconds, after a short warm-up that is not measured. Non-2xx responses and
+transport errors count as errors and are left out of the latency figures.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable
+from dataclasses import dataclass, field
+from http.cookies import SimpleCookie
+import itertools
+import time
+
+import httpx
+import numpy as np
+
+from benchmarks.harness import BenchEnvironment, SeedSize, bench_user_id
+
+TELEMETRY_STATE_DIM = 14
+TELEMETRY_ACTION_DIM = 7
+TELEMETRY_CHUNKS = 4
+TELEMETRY_CHUNK_FRAMES = 256
+
+
+@dataclass
+class ScenarioContext:
+    bench: BenchEnvironment
+    size: SeedSize
+    telemetry_body: bytes = b""
+    session_cookies: list[str] = field(default_factory=list)
+    task_session_ids: list[str] = field(default_factory=list)
+    _counter: itertools.count = field(default_factory=itertools.count)
+
+    def next_index(self) -> int:
+        return next(self._counter)
+
+
+@dataclass(frozen=True)
+class Request:
+    method: str
+    url: str
+    json: dict | None = None
+    content: bytes | None = None
+    headers: dict[str, str] | None = None
+
+
+@dataclass(frozen=True)
+class Scenario:
+    name: str
+    build: Callable[[ScenarioContext], Request]
+
+
+@dataclass
+class ScenarioResult:
+    name: str
+    latencies: list[float]
+    errors: int
+    elapsed: float
+
+
+def _tasks(ctx: ScenarioContext) -> Request:
+    return Request("GET", "/api/tasks/?limit=20")
+
+
+def _task_detail(ctx: ScenarioContext) -> Request:
+    return Request("GET", f"/api/taskdetail/?id={ctx.next_index() % ctx.size.tasks + 1}")
+
+
+def _database_overview(ctx: ScenarioContext) -> Request:
+    # Uncached: a DB read and a full serialization on every request.
+    return Request("GET", "/api/admin/database-overview")
+
+
+def _privy_exchange(ctx: ScenarioContext) -> Request:
+    index = ctx.next_index() % ctx.size.users
+    token = ctx.bench.privy_token(bench_user_id(index), f"bench-privy-{index}")
+    return Request("POST", "/api/sessions/privy", json={"token": token})
+
+
+def _telemetry_upload(ctx: ScenarioContext) -> Request:
+    index = ctx.next_index()
+    session_id = ctx.task_session_ids[index % len(ctx.task_session_ids)]
+    cookie = ctx.session_cookies[index % len(ctx.session_cookies)]
+    return Request(
+        "POST",
+        f"/api/sessions/{session_id}/telemetry",
+        content=ctx.telemetry_body,
+        headers={"Cookie": cookie, "Content-Type": "application/octet-stream"},
+    )
+
+
+SCENARIOS: dict[str, Scenario] = {
+    scenario.name: scenario
+    for scenario in (
+        Scenario("tasks", _tasks),
+        Scenario("taskdetail", _task_detail),
+        Scenario("database_overview", _database_overview),
+        Scenario("privy_exchange", _privy_exchange),
+        Scenario("telemetry_upload", _telemetry_upload),
+    )
+}
+
+
+def telemetry_body() -> bytes:
+    from app.telemetry.frames import FrameLayout, encode_chunk
+
+    layout = FrameLayout(state_dim=TELEMETRY_STATE_DIM, action_dim=TELEMETRY_ACTION_DIM)
+    rng = np.random.default_rng(0)
+    parts = [layout.pack_header()]
+    for chunk in range(TELEMETRY_CHUNKS):
+        records = np.zeros(TELEMETRY_CHUNK_FRAMES, dtype=layout.dtype)
+        records["t"] = (np.arange(TELEMETRY_CHUNK_FRAMES) + chunk * TELEMETRY_CHUNK_FRAMES) / 100.0
+        records["state"] = rng.standard_normal((TELEMETRY_CHUNK_FRAMES, TELEMETRY_STATE_DIM))
+        records["action"] = rng.standard_normal((TELEMETRY_CHUNK_FRAMES, TELEMETRY_ACTION_DIM))
+        parts.append(encode_chunk(records))
+    return b"".join(parts)
+
+
+async def prepare_context(client: httpx.AsyncClient, ctx: ScenarioContext, logins: int = 8) -> None:
+    """Log a few users in and start task sessions for the upload scenario."""
+    ctx.telemetry_body = telemetry_body()
+    for index in range(min(logins, ctx.size.users)):
+        token = ctx.bench.privy_token(bench_user_id(index), f"bench-upload-{index}")
+        response = await client.post("/api/sessions/privy", json={"token": token})
+        response.raise_for_status()
+        cookie = SimpleCookie(response.headers["set-cookie"])
+        header = "; ".join(f"{name}={morsel.value}" for name, morsel in cookie.items())
+        ctx.session_cookies.append(header)
+        started = await client.post("/api/sessions/", json={"task_id": 1}, headers={"Cookie": header})
+        started.raise_for_status()
+        ctx.task_session_ids.append(started.json()["session_id"])
+
+
+async def _send(client: httpx.AsyncClient, request: Request) -> bool:
+    try:
+        response = await client.request(
+            request.method,
+            request.url,
+            json=request.json,
+            content=request.content,
+            headers=request.headers,
+        )
+    except httpx.TransportError:
+        return False
+    return response.is_success
+
+
+async def run_scenario(
+    client: httpx.AsyncClient,
+    ctx: ScenarioContext,
+    scenario: Scenario,
+    concurrency: int,
+    duration: float,
+    warmup: float,
+) -> ScenarioResult:
+    latencies: list[float] = []
+    errors = 0
+
+    async def worker(deadline: float, record: bool) -> None:
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            request = scenario.build(ctx)
+            start = time.perf_counter()
+            ok = await _send(client, request)
+            if not record:
+                continue
+            if ok:
+                latencies.append(time.perf_counter() - start)
+            else:
+                errors += 1
+
+    if warmup > 0:
+        deadline = time.perf_counter() + warmup
+        await asyncio.gather(*(worker(deadline, record=False) for _ in range(concurrency)))
+
+    start = time.perf_counter()
+    deadline = start + duration
+    await asyncio.gather(*(worker(deadline, record=True) for _ in range(concurrency)))
+    return ScenarioResult(scenario.name, latencies, errors, time.perf_counter() - start)
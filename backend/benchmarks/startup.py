@@ -0,0 +1,87 @@
+"""
+Measure cold-start import time of the API.
+
+Usage: ``python -m benchmarks.startup [--runs N] [--budget S] [--top N]``.
+Imports ``app.main`` in fresh interpreters with ``-X importtime``, prints
+the median import time and the slowest modules (cumulative) as JSON, and
+exits with status 1 when the median is over the budget, which defaults to
+the ``STARTUP_BUDGET_SECONDS`` the app itself checks at startup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from pathlib import Path
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+
+from app.core.config import settings
+from benchmarks.harness import BACKEND_ROOT
+
+_IMPORT_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|(\s*)(\S+)$")
+_PROBE = (
+    "import time; started = time.perf_counter(); import app.main; "
+    "print(time.perf_counter() - started)"
+)
+
+
+def measure_once(env: dict[str, str]) -> tuple[float, dict[str, float]]:
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _PROBE],
+        cwd=BACKEND_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    modules: dict[str, float] = {}
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_LINE.match(line)
+        if match:
+            modules[match.group(4)] = int(match.group(2)) / 1e6
+    return float(completed.stdout.strip().splitlines()[-1]), modules
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.startup", description=__doc__.split("\n\n")[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--budget",
+        type=float,
+        default=settings.startup_budget_seconds,
+        help="Allowed median import seconds (default: STARTUP_BUDGET_SECONDS).",
+    )
+    parser.add_argument("--top", type=int, default=15, help="Slowest modules to list.")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory(prefix="axis-startup-") as tmp:
+        env = {
+            **os.environ,
+            "DATABASE_URL": os.environ.get("DATABASE_URL", f"sqlite:///{Path(tmp) / 'startup.db'}"),
+            "REDIS_URL": os.environ.get("REDIS_URL", "memory://"),
+        }
+        runs = [measure_once(env) for _ in range(args.runs)]
+
+    seconds = [elapsed for elapsed, _ in runs]
+    median = statistics.median(seconds)
+    # Module timings from the run closest to the median.
+    _, modules = min(runs, key=lambda run: abs(run[0] - median))
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)
+    report = {
+        "runs": [round(value, 4) for value in seconds],
+        "median_seconds": round(median, 4),
+        "budget_seconds": args.budget,
+        "within_budget": median <= args.budget,
+        "slowest_modules": {name: round(value, 4) for name, value in slowest[: args.top]},
+    }
+    print(json.dumps(report, indent=2))
+    return 0 if report["within_budget"] else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
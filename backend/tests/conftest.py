@@ -0,0 +1,55 @@
+"""
+Shared test setup.
+
+Settings are read when ``app`` is first imported, so the environment is
+pointed at a throwaway SQLite database and telemetry directories here,
+before any test module imports the app. Tests never need Postgres or Redis.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+from pathlib import Path
+import tempfile
+
+import pytest
+
+_ROOT = Path(tempfile.mkdtemp(prefix="axis-tests-"))
+os.environ.update(
+    DATABASE_URL=f"sqlite:///{_ROOT / 'axis.db'}",
+    REDIS_URL="memory://",
+    TELEMETRY_DIR=str(_ROOT / "telemetry"),
+    TRAJECTORY_STORE_DIR=str(_ROOT / "trajectories"),
+)
+
+
+@pytest.fixture
+def db():
+    """A session on a freshly created schema."""
+    from app.core.database import SessionLocal, engine
+    from app.models import Base
+
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    with SessionLocal() as session:
+        yield session
+
+
+@pytest.fixture
+def run_async():
+    """Run ``query(async_session)`` to completion on a fresh event loop."""
+    from app.core.database import AsyncSessionLocal, async_engine
+
+    def run(query):
+        async def main():
+            try:
+                async with AsyncSessionLocal() as session:
+                    return await query(session)
+            finally:
+                # Pooled connections belong to this loop; drop them with it.
+                await async_engine.dispose()
+
+        return asyncio.run(main())
+
+    return run
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+import pytest
+
+from app.core import admission
+from app.core.admission import ConcurrencyLimit, Limit, LocalBuckets
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Freeze ``time.monotonic`` as seen by the admission module."""
+    now = [1000.0]
+    monkeypatch.setattr(admission.time, "monotonic", lambda: now[0])
+    return now
+
+
+def test_bucket_allows_a_burst_then_reports_the_wait(clock):
+    buckets = LocalBuckets()
+    limit = Limit(rate=2.0, burst=3.0)
+
+    assert [buckets.take("ip", limit) for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert buckets.take("ip", limit) == pytest.approx(0.5)
+
+
+def test_bucket_refills_at_its_rate(clock):
+    buckets = LocalBuckets()
+    limit = Limit(rate=2.0, burst=3.0)
+    for _ in range(3):
+        buckets.take("ip", limit)
+
+    clock[0] += 0.5
+    assert buckets.take("ip", limit) == 0.0
+    clock[0] += 60
+    # Refilled, but never past the burst size.
+    assert [buckets.take("ip", limit) for _ in range(4)][-1] > 0
+
+
+def test_buckets_are_independent_per_key(clock):
+    buckets = LocalBuckets()
+    limit = Limit(rate=1.0, burst=1.0)
+    assert buckets.take("a", limit) == 0.0
+    assert buckets.take("a", limit) > 0
+    assert buckets.take("b", limit) == 0.0
+
+
+def test_least_recently_used_bucket_is_evicted(clock):
+    buckets = LocalBuckets(max_buckets=2)
+    limit = Limit(rate=1.0, burst=1.0)
+    buckets.take("a", limit)
+    buckets.take("b", limit)
+    buckets.take("c", limit)
+    # "a" was evicted, so it starts over with a full bucket.
+    assert buckets.take("a", limit) == 0.0
+    assert buckets.take("c", limit) > 0
+
+
+def test_per_minute_limit_keeps_at_least_one_token():
+    limit = Limit.per_minute(1)
+    assert limit.rate == pytest.approx(1 / 60)
+    assert limit.burst >= 1.0
+
+
+def test_concurrency_limit():
+    limit = ConcurrencyLimit("test", max_in_flight=2)
+    assert limit.try_acquire() and limit.try_acquire()
+    assert not limit.try_acquire()
+    limit.release()
+    assert limit.try_acquire()
+
+
+def test_zero_concurrency_limit_means_unlimited():
+    limit = ConcurrencyLimit("test", max_in_flight=0)
+    assert all(limit.try_acquire() for _ in range(100))
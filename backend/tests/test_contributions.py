@@ -0,0 +1,52 @@
+from __future__ import annotations
+
+from sqlalchemy import func, select
+
+from app.models import ContributionEntry, User, UserContribution
+from app.services.contributions import LEVEL_THRESHOLDS, level_for, record_contribution
+
+
+def test_ledger_folds_amounts_into_totals(db):
+    db.add(User(id="u1"))
+    db.flush()
+
+    first = record_contribution(db, user_id="u1", session_id="s1", amount=40, task_id=1)
+    second = record_contribution(db, user_id="u1", session_id="s2", amount=25, task_id=2)
+    db.commit()
+
+    assert (first.recorded, first.total_contribution, first.sessions_count) == (True, 40, 1)
+    assert (second.recorded, second.total_contribution, second.sessions_count) == (True, 65, 2)
+    totals = db.get(UserContribution, "u1")
+    assert (totals.total_contribution, totals.sessions_count) == (65, 2)
+
+
+def test_recording_a_session_twice_counts_it_once(db):
+    db.add(User(id="u1"))
+    db.flush()
+    record_contribution(db, user_id="u1", session_id="s1", amount=40)
+
+    again = record_contribution(db, user_id="u1", session_id="s1", amount=40)
+    db.commit()
+
+    assert (again.recorded, again.total_contribution, again.sessions_count) == (False, 40, 1)
+    assert db.scalar(select(func.count()).select_from(ContributionEntry)) == 1
+
+
+def test_session_credited_to_another_user_is_a_duplicate(db):
+    db.add_all([User(id="u1"), User(id="u2")])
+    db.flush()
+    record_contribution(db, user_id="u1", session_id="s1", amount=40)
+
+    other = record_contribution(db, user_id="u2", session_id="s1", amount=40)
+    db.commit()
+
+    assert (other.recorded, other.total_contribution, other.sessions_count) == (False, 0, 0)
+    assert db.get(UserContribution, "u2") is None
+
+
+def test_levels():
+    assert level_for(0).level == 1
+    assert level_for(LEVEL_THRESHOLDS[1] - 1).to_next_level == 1
+    assert level_for(LEVEL_THRESHOLDS[1]).level == 2
+    top = level_for(LEVEL_THRESHOLDS[-1] * 10)
+    assert (top.level, top.next_level_at, top.to_next_level) == (len(LEVEL_THRESHOLDS), None, None)
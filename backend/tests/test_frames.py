@@ -0,0 +1,173 @@
+from __future__ import annotations
+
+import numpy as np
+import pytest
+
+from app.telemetry.codec import DeltaCodec
+from app.telemetry.frames import (
+    CHUNK_PREFIX,
+    CODEC_DELTA,
+    STREAM_HEADER,
+    ChunkTooLargeError,
+    FrameLayout,
+    FrameStreamDecoder,
+    TelemetryFormatError,
+    decode_stream,
+    encode_chunk,
+)
+
+MAX_CHUNK_BYTES = 1 << 20
+END = CHUNK_PREFIX.pack(0)
+
+
+def make_records(layout: FrameLayout, frames: int, seed: int = 0, t0: float = 0.0) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    records = np.zeros(frames, dtype=layout.dtype)
+    records["t"] = t0 + np.cumsum(rng.uniform(0.001, 0.05, frames))
+    records["state"] = np.cumsum(rng.normal(0, 0.01, (frames, layout.state_dim)), axis=0)
+    records["action"] = rng.uniform(-1, 1, (frames, layout.action_dim))
+    return records
+
+
+def make_stream(layout: FrameLayout, chunks: list[np.ndarray], end: bool = True) -> bytes:
+    body = layout.pack_header() + b"".join(encode_chunk(chunk, layout) for chunk in chunks)
+    return body + END if end else body
+
+
+@pytest.mark.parametrize(
+    "layout",
+    [FrameLayout(7, 3), FrameLayout(7, 3, codec=CODEC_DELTA, quant_step=0.001)],
+)
+def test_header_round_trip(layout):
+    header = layout.pack_header()
+    assert len(header) == STREAM_HEADER.size
+    assert FrameLayout.unpack_header(header) == layout
+
+
+def test_header_rejects_unknown_magic():
+    header = b"NOPE" + FrameLayout(3, 2).pack_header()[4:]
+    with pytest.raises(TelemetryFormatError):
+        FrameLayout.unpack_header(header)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_raw_stream_decodes_the_same_however_it_is_split(seed):
+    layout = FrameLayout(4, 2)
+    records = make_records(layout, 300, seed)
+    stream = make_stream(layout, np.array_split(records, 7))
+
+    rng = np.random.default_rng(seed)
+    cuts = np.sort(rng.choice(np.arange(1, len(stream)), size=40, replace=False))
+    decoder = FrameStreamDecoder(max_chunk_bytes=MAX_CHUNK_BYTES)
+    decoded = []
+    for piece in np.split(np.frombuffer(stream, dtype=np.uint8), cuts):
+        decoded.extend(chunk.records for chunk in decoder.feed(piece.tobytes()))
+    decoder.close()
+
+    assert decoder.finished
+    assert decoder.frames == len(records)
+    np.testing.assert_array_equal(np.concatenate(decoded), records)
+
+
+def test_decode_stream_without_end_marker():
+    layout = FrameLayout(3, 1)
+    records = make_records(layout, 50)
+    decoded_layout, decoded = decode_stream(make_stream(layout, [records], end=False), MAX_CHUNK_BYTES)
+    assert decoded_layout == layout
+    np.testing.assert_array_equal(decoded, records)
+
+
+@pytest.mark.parametrize("step", [1e-4, 1e-3, 0.05])
+def test_delta_codec_stays_within_its_error_bound(step):
+    layout = FrameLayout(6, 2)
+    records = make_records(layout, 1000, seed=3)
+    codec = DeltaCodec(step=step)
+
+    decoded = codec.decode(codec.encode(records), layout.dtype, MAX_CHUNK_BYTES)
+
+    bound = codec.error_bound
+    assert np.abs(decoded["t"] - records["t"]).max() <= bound.t * (1 + 1e-6)
+    for field in ("state", "action"):
+        # float32 storage adds its own rounding on top of the quantization.
+        tolerance = bound.values + np.abs(records[field]).max() * np.finfo(np.float32).eps
+        assert np.abs(decoded[field].astype(np.float64) - records[field]).max() <= tolerance
+
+
+def test_delta_stream_decodes_to_quantized_records():
+    layout = FrameLayout(5, 2, codec=CODEC_DELTA, quant_step=0.001)
+    records = make_records(layout, 400, seed=1)
+    decoded_layout, decoded = decode_stream(make_stream(layout, np.array_split(records, 4)), MAX_CHUNK_BYTES)
+
+    assert decoded_layout == layout
+    assert decoded.dtype == layout.without_codec().dtype
+    assert np.abs(decoded["state"] - records["state"]).max() <= layout.quant_step
+    np.testing.assert_allclose(decoded["t"], records["t"], atol=1e-6)
+
+
+def test_single_chunk_delta_encoding_is_smaller_than_raw():
+    layout = FrameLayout(12, 6, codec=CODEC_DELTA, quant_step=0.001)
+    records = make_records(layout, 2000)
+    assert len(encode_chunk(records, layout)) < len(encode_chunk(records)) / 2
+
+
+def test_timestamps_must_not_go_backwards_within_a_chunk():
+    layout = FrameLayout(2, 1)
+    records = make_records(layout, 10)
+    records["t"][5] = records["t"][4] - 1
+    with pytest.raises(TelemetryFormatError, match="non-decreasing"):
+        decode_stream(make_stream(layout, [records]), MAX_CHUNK_BYTES)
+
+
+def test_timestamps_must_not_go_backwards_across_chunks():
+    layout = FrameLayout(2, 1)
+    first = make_records(layout, 10, t0=100.0)
+    second = make_records(layout, 10, t0=0.0)
+    with pytest.raises(TelemetryFormatError, match="non-decreasing"):
+        decode_stream(make_stream(layout, [first, second]), MAX_CHUNK_BYTES)
+
+
+def test_last_timestamp_continues_the_ordering_check():
+    layout = FrameLayout(2, 1)
+    decoder = FrameStreamDecoder(max_chunk_bytes=MAX_CHUNK_BYTES, last_timestamp=1000.0)
+    with pytest.raises(TelemetryFormatError, match="non-decreasing"):
+        decoder.feed(make_stream(layout, [make_records(layout, 10)]))
+
+
+def test_oversized_chunk_is_rejected_before_it_is_buffered():
+    layout = FrameLayout(2, 1)
+    stream = layout.pack_header() + CHUNK_PREFIX.pack(MAX_CHUNK_BYTES + 1)
+    with pytest.raises(ChunkTooLargeError):
+        FrameStreamDecoder(max_chunk_bytes=MAX_CHUNK_BYTES).feed(stream)
+
+
+@pytest.mark.parametrize("field", ["t", "state", "action"])
+def test_non_finite_values_are_rejected(field):
+    layout = FrameLayout(2, 1)
+    records = make_records(layout, 10)
+    records[field][3] = np.nan
+    with pytest.raises(TelemetryFormatError, match="non-finite"):
+        decode_stream(make_stream(layout, [records]), MAX_CHUNK_BYTES)
+
+
+def test_partial_record_chunk_is_rejected():
+    layout = FrameLayout(2, 1)
+    payload = make_records(layout, 3).tobytes()[:-1]
+    stream = layout.pack_header() + CHUNK_PREFIX.pack(len(payload)) + payload
+    with pytest.raises(TelemetryFormatError, match="record size"):
+        decode_stream(stream, MAX_CHUNK_BYTES)
+
+
+def test_stream_ending_inside_a_chunk_is_rejected():
+    layout = FrameLayout(2, 1)
+    stream = make_stream(layout, [make_records(layout, 10)], end=False)
+    decoder = FrameStreamDecoder(max_chunk_bytes=MAX_CHUNK_BYTES)
+    decoder.feed(stream[:-5])
+    with pytest.raises(TelemetryFormatError, match="inside a chunk"):
+        decoder.close()
+
+
+def test_data_after_end_marker_is_rejected():
+    layout = FrameLayout(2, 1)
+    stream = make_stream(layout, [make_records(layout, 10)]) + b"\x01"
+    with pytest.raises(TelemetryFormatError, match="end-of-stream"):
+        decode_stream(stream, MAX_CHUNK_BYTES)
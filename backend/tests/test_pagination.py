@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.models import Task, TaskSession, User
+from app.services.history import HistoryQuery, decode_history_cursor, encode_history_cursor, fetch_history_page
+from app.services.task_catalog import (
+    InvalidCursorError,
+    TaskQuery,
+    decode_cursor,
+    encode_cursor,
+    fetch_task_page,
+)
+
+
+@pytest.fixture
+def tasks(db):
+    # Durations repeat so the duration sort has to break ties on id.
+    for task_id in range(1, 24):
+        db.add(
+            Task(
+                id=task_id,
+                name=f"task {task_id}",
+                description="",
+                difficulty="easy" if task_id % 3 else "hard",
+                expected_duration=task_id % 4,
+                success_rate=0.0,
+                thumbnail="",
+            )
+        )
+    db.commit()
+
+
+def walk(run_async, fetch, query_type, **options) -> list[list]:
+    """Follow ``next_cursor`` to the end; returns the pages."""
+    pages, cursor = [], None
+    while True:
+        query = query_type(cursor=cursor, **options)
+        rows, cursor = run_async(lambda session, query=query: fetch(session, query))
+        pages.append(rows)
+        if cursor is None:
+            return pages
+
+
+def test_task_cursor_round_trip():
+    assert decode_cursor(encode_cursor("duration", (30, 7)), "duration") == (30, 7)
+
+
+@pytest.mark.parametrize("cursor", ["%%%", encode_cursor("id", (5,)), encode_cursor("duration", ("x", 1))])
+def test_task_cursor_rejects_malformed_or_foreign_cursors(cursor):
+    with pytest.raises(InvalidCursorError):
+        decode_cursor(cursor, "duration")
+
+
+@pytest.mark.parametrize("sort", ["id", "duration"])
+@pytest.mark.parametrize("limit", [1, 5, 23, 50])
+def test_task_pages_cover_every_task_once_in_order(tasks, run_async, sort, limit):
+    pages = walk(run_async, fetch_task_page, TaskQuery, sort=sort, limit=limit)
+
+    rows = [task for page in pages for task in page]
+    assert all(len(page) <= limit for page in pages)
+    key = (lambda task: task.id) if sort == "id" else (lambda task: (task.expected_duration, task.id))
+    assert [task.id for task in rows] == [task.id for task in sorted(rows, key=key)]
+    assert sorted(task.id for task in rows) == list(range(1, 24))
+
+
+def test_task_pages_apply_filters(tasks, run_async):
+    pages = walk(run_async, fetch_task_page, TaskQuery, difficulty=("hard",), min_duration=1, limit=2)
+    ids = [task.id for page in pages for task in page]
+    assert ids == [task_id for task_id in range(1, 24) if task_id % 3 == 0 and task_id % 4 >= 1]
+
+
+def test_history_cursor_round_trip():
+    started_at = datetime(2026, 1, 2, 3, 4, 5, 678, tzinfo=timezone.utc)
+    assert decode_history_cursor(encode_history_cursor(started_at, "abc")) == (started_at, "abc")
+
+
+def test_history_pages_are_newest_first_and_per_user(tasks, db, run_async):
+    db.add_all([User(id="me"), User(id="other")])
+    base = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    for index in range(17):
+        # Pairs share a start time, so ties are broken on the session id.
+        started_at = base + timedelta(minutes=index // 2)
+        db.add(TaskSession(id=f"s{index:02d}", user_id="me", task_id=1, started_at=started_at))
+    db.add(TaskSession(id="theirs", user_id="other", task_id=1, started_at=base))
+    db.commit()
+
+    pages, cursor = [], None
+    while True:
+        query = HistoryQuery(limit=4, cursor=cursor)
+        rows, cursor = run_async(lambda session, query=query: fetch_history_page(session, "me", query))
+        pages.append(rows)
+        if cursor is None:
+            break
+
+    ids = [row.id for page in pages for row in page]
+    assert ids == [f"s{index:02d}" for index in reversed(range(17))]
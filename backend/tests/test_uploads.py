@@ -0,0 +1,145 @@
+from __future__ import annotations
+
+import asyncio
+import uuid
+
+import numpy as np
+import pytest
+
+from app.telemetry.frames import CHUNK_PREFIX, STREAM_HEADER, FrameLayout, encode_chunk
+from app.telemetry.ingest import ingest_resumable
+from app.telemetry.segments import list_segments, load_session_records, session_directory
+from app.telemetry.uploads import (
+    PART_NAME,
+    ResumableUpload,
+    UnknownUploadError,
+    UploadBusyError,
+    UploadConflictError,
+    read_status,
+)
+
+from tests.test_frames import make_records
+
+END = CHUNK_PREFIX.pack(0)
+LAYOUT = FrameLayout(4, 2)
+
+
+@pytest.fixture
+def session_id() -> str:
+    return uuid.uuid4().hex
+
+
+@pytest.fixture
+def chunks() -> list[np.ndarray]:
+    return np.array_split(make_records(LAYOUT, 600, seed=7), 6)
+
+
+def encoded(chunks: list[np.ndarray]) -> list[bytes]:
+    return [encode_chunk(chunk) for chunk in chunks]
+
+
+def send(session_id: str, body: bytes, first_seq: int = 0, first_offset: int | None = None, upload_id="up"):
+    async def pieces():
+        # Uneven pieces, so chunks straddle reads the way network reads do.
+        for start in range(0, len(body), 997):
+            yield body[start : start + 997]
+
+    return asyncio.run(ingest_resumable(session_id, upload_id, pieces(), first_seq, first_offset))
+
+
+def test_resume_after_interruption(session_id, chunks):
+    wire = encoded(chunks)
+    header = LAYOUT.pack_header()
+
+    first = send(session_id, header + b"".join(wire[:3]))
+    assert (first.chunks, first.status.next_seq, first.status.complete) == (3, 3, False)
+    status = read_status(session_directory(session_id), "up")
+    assert status.offset == STREAM_HEADER.size + sum(len(piece) for piece in wire[:3])
+    assert status.frames == sum(len(chunk) for chunk in chunks[:3])
+
+    rest = send(session_id, header + b"".join(wire[3:]) + END, first_seq=3, first_offset=status.offset)
+    assert (rest.chunks, rest.duplicates, rest.status.complete) == (3, 0, True)
+
+    np.testing.assert_array_equal(load_session_records(session_id), np.concatenate(chunks))
+
+
+def test_resent_chunks_are_skipped(session_id, chunks):
+    wire = encoded(chunks)
+    header = LAYOUT.pack_header()
+    send(session_id, header + b"".join(wire[:4]))
+
+    again = send(session_id, header + b"".join(wire) + END)
+
+    assert (again.duplicates, again.chunks, again.status.next_seq) == (4, 2, 6)
+    np.testing.assert_array_equal(load_session_records(session_id), np.concatenate(chunks))
+
+
+def test_completed_upload_accepts_a_full_resend(session_id, chunks):
+    body = LAYOUT.pack_header() + b"".join(encoded(chunks)) + END
+    first = send(session_id, body)
+    again = send(session_id, body)
+
+    assert again.duplicates == len(chunks) and again.chunks == 0
+    assert again.status.segment == first.status.segment
+    assert len(list_segments(session_directory(session_id))) == 1
+
+
+def test_changed_chunk_conflicts(session_id, chunks):
+    wire = encoded(chunks)
+    header = LAYOUT.pack_header()
+    send(session_id, header + b"".join(wire[:3]))
+
+    changed = chunks[1].copy()
+    changed["action"] += 1
+    with pytest.raises(UploadConflictError, match="differs"):
+        send(session_id, header + wire[0] + encode_chunk(changed), first_seq=0)
+
+
+def test_gap_is_rejected(session_id, chunks):
+    wire = encoded(chunks)
+    header = LAYOUT.pack_header()
+    send(session_id, header + wire[0])
+    with pytest.raises(UploadConflictError, match="Expected chunk 1"):
+        send(session_id, header + wire[2], first_seq=2)
+
+
+def test_wrong_offset_is_rejected(session_id, chunks):
+    wire = encoded(chunks)
+    header = LAYOUT.pack_header()
+    send(session_id, header + wire[0])
+    with pytest.raises(UploadConflictError, match="offset"):
+        send(session_id, header + wire[1], first_seq=1, first_offset=STREAM_HEADER.size)
+
+
+def test_torn_write_is_cut_back_on_open(session_id, chunks):
+    send(session_id, LAYOUT.pack_header() + b"".join(encoded(chunks[:2])))
+    directory = session_directory(session_id)
+    before = read_status(directory, "up")
+    # A crash after writing records but before their index entry.
+    with (directory / ".uploads" / "up" / PART_NAME).open("ab") as fh:
+        fh.write(b"\x00" * 100)
+
+    upload = ResumableUpload.open(directory, "up")
+    try:
+        assert upload.status() == before
+    finally:
+        upload.close()
+    assert (directory / ".uploads" / "up" / PART_NAME).stat().st_size == STREAM_HEADER.size + sum(
+        chunk.nbytes for chunk in chunks[:2]
+    )
+
+
+def test_concurrent_requests_for_one_upload_are_refused(session_id):
+    directory = session_directory(session_id)
+    directory.mkdir(parents=True)
+    upload = ResumableUpload.open(directory, "up")
+    try:
+        with pytest.raises(UploadBusyError):
+            ResumableUpload.open(directory, "up")
+    finally:
+        upload.close()
+
+
+def test_status_of_unknown_upload(session_id):
+    with pytest.raises(UnknownUploadError):
+        read_status(session_directory(session_id), "never-started")
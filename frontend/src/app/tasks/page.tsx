@@ -13,6 +13,14 @@ type Task = {
   thumbnail: string;
 };
 
+type TaskPage = {
+  tasks: Task[];
+  next_cursor: string | null;
+};
+
+// Largest page the API serves (MAX_PAGE_SIZE in the backend).
+const TASK_PAGE_SIZE = 100;
+
 async function fetchTasks(): Promise<Task[]> {
   const endpoint = `${API_BASE}/tasks`;
   // eslint-disable-next-line no-console
@@ -23,31 +31,42 @@ async function fetchTasks(): Promise<Task[]> {
   console.log("[Axis] process.env.NEXT_PUBLIC_API_BASE:", process.env.NEXT_PUBLIC_API_BASE);
   
   try {
-    const response = await fetch(endpoint, {
-      cache: "no-store",
-    });
-    
-    // eslint-disable-next-line no-console
-    console.log("[Axis] Fetch response status:", response.status, response.statusText);
-    // eslint-disable-next-line no-console
-    console.log("[Axis] Fetch response URL:", response.url);
-
-    if (!response.ok) {
-      const errorText = await response.text().catch(() => "Unable to read error response");
-      console.error(
-        "[Axis] Failed tasks fetch",
-        response.status,
-        response.statusText,
-        "Error body:",
-        errorText,
-      );
-      throw new Error(`无法获取任务列表: ${response.status} ${response.statusText}`);
-    }
+    // The list is paginated; follow next_cursor until the last page.
+    const tasks: Task[] = [];
+    let cursor: string | null = null;
+    do {
+      const params = new URLSearchParams({ limit: String(TASK_PAGE_SIZE) });
+      if (cursor) {
+        params.set("cursor", cursor);
+      }
+      const response = await fetch(`${endpoint}?${params}`, {
+        cache: "no-store",
+      });
+      
+      // eslint-disable-next-line no-console
+      console.log("[Axis] Fetch response status:", response.status, response.statusText);
+      // eslint-disable-next-line no-console
+      console.log("[Axis] Fetch response URL:", response.url);
+
+      if (!response.ok) {
+        const errorText = await response.text().catch(() => "Unable to read error response");
+        console.error(
+          "[Axis] Failed tasks fetch",
+          response.status,
+          response.statusText,
+          "Error body:",
+          errorText,
+        );
+        throw new Error(`无法获取任务列表: ${response.status} ${response.statusText}`);
+      }
 
-    const data = (await response.json()) as { tasks: Task[] };
+      const data = (await response.json()) as TaskPage;
+      tasks.push(...data.tasks);
+      cursor = data.next_cursor;
+    } while (cursor);
     // eslint-disable-next-line no-console
-    console.log("[Axis] Tasks fetch ok, count:", data.tasks.length);
-    return data.tasks;
+    console.log("[Axis] Tasks fetch ok, count:", tasks.length);
+    return tasks;
   } catch (error) {
     console.error("[Axis] Exception during tasks fetch:", error);
     if (error instanceof Error) {